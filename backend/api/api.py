@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from api.endpoints.audit import router as audit_router
 from api.endpoints.auth import router as auth_router
 from api.endpoints.clients import router as clients_router
 from api.endpoints.dashboard import router as dashboard_router
+from api.endpoints.metrics import router as metrics_router
 from api.endpoints.reservas import router as reservas_router
 from api.endpoints.quartos import router as quartos_router
 
@@ -16,6 +18,13 @@ api_router.include_router(
     tags=["auth"]
 )
 
+# Incluir rotas de auditoria
+api_router.include_router(
+    audit_router,
+    prefix="/audit",
+    tags=["audit"],
+)
+
 # Incluir rotas de clientes
 api_router.include_router(
     clients_router,
@@ -30,6 +39,13 @@ api_router.include_router(
     tags=["dashboard"],
 )
 
+# Incluir rotas de métricas de execução
+api_router.include_router(
+    metrics_router,
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
 # Incluir rotas de reservas
 api_router.include_router(
     reservas_router,
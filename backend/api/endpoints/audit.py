@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from core.database import get_db
+from dependencies.permissions import require_admin
+from services.principal_cache import Principal
+from schemas.audit import AuditLogEntry
+from schemas.pagination import Page
+from services.audit_archive import consultar_auditoria, utc_sem_fuso
+from utils.pagination import decode_cursor, next_cursor
+
+router = APIRouter()
+
+
+@router.get("/", response_model=Page[AuditLogEntry])
+def search_audit_logs(
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    resource_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    client_id: Optional[int] = None,
+    quarto_id: Optional[int] = None,
+    reason: Optional[str] = None,
+    inicio: Optional[datetime] = Query(
+        default=None, description="Início do período (inclusivo, UTC)"
+    ),
+    fim: Optional[datetime] = Query(
+        default=None, description="Fim do período (exclusivo, UTC)"
+    ),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor retornado em next_cursor"
+    ),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """Busca registros de auditoria, do mais recente ao mais antigo.
+
+    Os filtros são combinados com E e usam os índices compostos de
+    audit_logs; a paginação usa a chave (timestamp, id). Meses já
+    arquivados pela retenção também são consultados. Datas com fuso
+    horário são convertidas para UTC; sem fuso, já são UTC.
+    """
+    inicio, fim = utc_sem_fuso(inicio), utc_sem_fuso(fim)
+    if inicio and fim and inicio >= fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'inicio' deve ser anterior a 'fim'.",
+        )
+
+    antes = decode_cursor(cursor, (datetime, int)) if cursor else None
+    items = consultar_auditoria(
+        db,
+        inicio=inicio,
+        fim=fim,
+        limit=limit + 1,
+        antes=antes,
+        user_id=user_id,
+        action=action,
+        resource=resource,
+        resource_id=resource_id,
+        ip_address=ip_address,
+        client_id=client_id,
+        quarto_id=quarto_id,
+        reason=reason,
+    )
+    cursor_seguinte = next_cursor(items, limit, lambda r: (r["timestamp"], r["id"]))
+    return Page[AuditLogEntry](items=items, next_cursor=cursor_seguinte)
@@ -1,36 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
-from core.database import get_db
-from models.user_model import User, UserRole
+from core.database import get_db, get_route_db
+from models.user_model import User
+from services.principal_cache import Principal, principal_cache
+from services.token_decoder import token_decoder
 from schemas.user_schema import UserCreate, User as UserSchema, Token
+from dependencies.permissions import require_admin
+from services import user_service
 from services.auth_service import (
-    get_password_hash, 
-    verify_password,
     validate_password_strength,
-    is_account_locked,
-    calculate_lockout_time,
     create_access_token,
+    needs_rehash,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from services.audit_service import AuditService
+from services.password_hasher import (
+    PasswordHasherBusy,
+    password_hasher,
+    rehash_password,
+)
+from services.service_runner import run_service
 from utils.request_utils import get_client_info
 
 # Criar o router para autenticação
 router = APIRouter(tags=["authentication"])
 
 
+async def _aguardar_hash(chamada):
+    """Aguarda o pool de hash; com a fila cheia responde 503."""
+    try:
+        return await chamada
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Muitas autenticações simultâneas. Tente novamente.",
+            headers={"Retry-After": "1"},
+        )
+
+
 @router.post(
     "/register",
     response_model=UserSchema,
     status_code=status.HTTP_201_CREATED
 )
-def register_user(
+async def register_user(
     user_data: UserCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_route_db)
 ):
     """
     Registrar um novo usuário no sistema.
@@ -45,25 +67,17 @@ def register_user(
 
     Raises:
         HTTPException: 400 se o username já existir ou senha fraca
+        HTTPException: 503 se o pool de hash de senhas estiver cheio
     """
 
-    # Verificar se o usuário já existe
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # Verificar se o email já existe (se fornecido)
-    if hasattr(user_data, 'email') and user_data.email:
-        existing_email = db.query(User).filter(User.email == user_data.email).first()
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-    
+    # Verificar se o username ou o email já existem
+    await run_service(
+        db,
+        user_service.verificar_cadastro,
+        user_data.username,
+        getattr(user_data, "email", None),
+    )
+
     # Validar força da senha
     is_valid, message = validate_password_strength(user_data.password)
     if not is_valid:
@@ -73,42 +87,24 @@ def register_user(
         )
 
     # Criar hash da senha
-    hashed_password = get_password_hash(user_data.password)
-
-    # Criar novo usuário com role padrão VIEWER
-    db_user = User(
-        username=user_data.username,
-        email=user_data.email if hasattr(user_data, 'email') else None,
-        hashed_password=hashed_password,
-        role=UserRole.VIEWER,  # Novos usuários começam como VIEWER
-        is_active=True
-    )
+    hashed_password = await _aguardar_hash(password_hasher.hash(user_data.password))
 
-    # Salvar no banco de dados
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    # Registrar auditoria
-    client_info = get_client_info(request)
-    AuditService.log_action(
-        db=db,
-        user_id=db_user.id,
-        action="USER_CREATED",
-        resource="USER",
-        resource_id=db_user.id,
-        ip_address=client_info["ip_address"],
-        user_agent=client_info["user_agent"]
+    # Salvar o usuário (role VIEWER) e registrar auditoria
+    return await run_service(
+        db,
+        user_service.criar_usuario,
+        user_data,
+        hashed_password,
+        get_client_info(request),
     )
 
-    return db_user
-
 
 @router.post("/token", response_model=Token)
-def login_user(
+async def login_user(
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     request: Request = None,
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_route_db)
 ):
     """
     Autenticar usuário e retornar token JWT.
@@ -119,6 +115,10 @@ def login_user(
     - Bloqueio progressivo após múltiplas falhas
     - Registro de auditoria
     - Atualização de last_login
+    - Novo hash da senha, em segundo plano, se o custo do bcrypt mudou
+
+    As consultas e gravações rodam em ``services.user_service`` via
+    ``run_service``; no event loop fica apenas a espera pelo bcrypt.
 
     Args:
         form_data (OAuth2PasswordRequestForm): Dados de login (username e password)
@@ -131,78 +131,24 @@ def login_user(
     Raises:
         HTTPException: 401 se as credenciais forem inválidas
         HTTPException: 403 se a conta estiver bloqueada
+        HTTPException: 503 se o pool de hash de senhas estiver cheio
     """
     
     # Obter informações do cliente
     client_info = get_client_info(request) if request else {"ip_address": None, "user_agent": None}
 
-    # Buscar usuário no banco de dados
-    user = db.query(User).filter(User.username == form_data.username).first()
-
-    # Se usuário não existe, retorna erro genérico (não revela se username existe)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Credenciais inválidas",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Verificar se a conta está bloqueada
-    if is_account_locked(user.failed_login_attempts, user.locked_until):
-        # Registrar tentativa de login em conta bloqueada
-        AuditService.log_login(
-            db=db,
-            user_id=user.id,
-            success=False,
-            ip_address=client_info["ip_address"],
-            user_agent=client_info["user_agent"],
-            details={"reason": "account_locked"}
-        )
-        
-        lockout_message = "Conta bloqueada devido a múltiplas tentativas de login falhadas."
-        if user.locked_until:
-            lockout_message += f" Tente novamente após {user.locked_until.strftime('%d/%m/%Y %H:%M:%S')}"
-        
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=lockout_message,
-        )
-    
-    # Verificar se o usuário está ativo
-    if not user.is_active:
-        AuditService.log_login(
-            db=db,
-            user_id=user.id,
-            success=False,
-            ip_address=client_info["ip_address"],
-            user_agent=client_info["user_agent"],
-            details={"reason": "account_inactive"}
-        )
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Conta inativa. Contate o administrador.",
-        )
+    # Buscar usuário (401 se não existir, 403 se bloqueado ou inativo)
+    user = await run_service(
+        db, user_service.buscar_para_login, form_data.username, client_info
+    )
 
     # Verificar senha
-    if not verify_password(form_data.password, user.hashed_password):
-        # Incrementar contador de tentativas falhadas
-        user.failed_login_attempts += 1
-        user.locked_until = calculate_lockout_time(user.failed_login_attempts)
-        db.commit()
-        
-        # Registrar tentativa falhada
-        AuditService.log_login(
-            db=db,
-            user_id=user.id,
-            success=False,
-            ip_address=client_info["ip_address"],
-            user_agent=client_info["user_agent"],
-            details={
-                "reason": "invalid_password",
-                "failed_attempts": user.failed_login_attempts
-            }
-        )
-        
+    senha_valida = await _aguardar_hash(
+        password_hasher.verify(form_data.password, user.hashed_password)
+    )
+    if not senha_valida:
+        # Incrementa o contador de falhas e audita
+        await run_service(db, user_service.registrar_falha_login, user, client_info)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas",
@@ -210,25 +156,22 @@ def login_user(
         )
 
     # Login bem-sucedido - resetar contador de falhas
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    user.last_login = datetime.utcnow()
-    user.last_login_ip = client_info["ip_address"]
-    db.commit()
-    
-    # Registrar login bem-sucedido
-    AuditService.log_login(
-        db=db,
-        user_id=user.id,
-        success=True,
-        ip_address=client_info["ip_address"],
-        user_agent=client_info["user_agent"]
-    )
+    login = await run_service(db, user_service.registrar_login, user, client_info)
+
+    # Refazer o hash com o custo configurado, após enviar a resposta
+    if needs_rehash(login.hashed_password):
+        background_tasks.add_task(
+            rehash_password,
+            login.bind,
+            login.user_id,
+            form_data.password,
+            login.hashed_password,
+        )
 
     # Criar token de acesso
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username},
+        data={"sub": login.username, "ver": login.token_version},
         expires_delta=access_token_expires
     )
 
@@ -301,11 +244,11 @@ def forgot_password(
 
 
 @router.post("/reset-password")
-def reset_password(
+async def reset_password(
     token: str,
     new_password: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: Union[AsyncSession, Session] = Depends(get_route_db)
 ):
     """
     Reseta a senha usando o token de reset.
@@ -322,24 +265,9 @@ def reset_password(
     Raises:
         HTTPException: 400 se token inválido ou expirado, ou senha fraca
     """
-    from services.auth_service import validate_password_strength
-    
-    # Buscar usuário com o token
-    user = db.query(User).filter(User.reset_token == token).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Token de reset inválido"
-        )
-    
-    # Verificar se o token expirou
-    if not user.reset_token_expires or user.reset_token_expires < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Token de reset expirado. Solicite um novo token."
-        )
-    
+    # Buscar usuário com o token (400 se inválido ou expirado)
+    user = await run_service(db, user_service.buscar_por_token_reset, token)
+
     # Validar força da nova senha
     is_valid, message = validate_password_strength(new_password)
     if not is_valid:
@@ -348,25 +276,40 @@ def reset_password(
             detail=message
         )
     
-    # Atualizar senha
-    user.hashed_password = get_password_hash(new_password)
-    user.reset_token = None
-    user.reset_token_expires = None
-    user.failed_login_attempts = 0  # Resetar contador de falhas
-    user.locked_until = None  # Desbloquear conta se estiver bloqueada
-    db.commit()
-    
-    # Obter informações do cliente
-    client_info = get_client_info(request)
-    
-    # Registrar auditoria
-    AuditService.log_password_reset_complete(
-        db=db,
-        user_id=user.id,
-        ip_address=client_info["ip_address"],
-        user_agent=client_info["user_agent"]
+    # Atualizar senha, revogar os tokens emitidos e registrar auditoria
+    hashed_password = await _aguardar_hash(password_hasher.hash(new_password))
+    await run_service(
+        db,
+        user_service.concluir_reset,
+        user,
+        hashed_password,
+        get_client_info(request),
     )
     
     return {
         "message": "Senha resetada com sucesso. Você já pode fazer login com a nova senha."
     }
+
+
+@router.get("/hash-pool")
+def get_hash_pool_stats(
+    current_user: Principal = Depends(require_admin)
+):
+    """Retorna ocupação, fila e tempos do pool de hash de senhas."""
+    return password_hasher.stats()
+
+
+@router.get("/principal-cache")
+def get_principal_cache_stats(
+    current_user: Principal = Depends(require_admin)
+):
+    """Retorna acertos, falhas e invalidações do cache de usuários autenticados."""
+    return principal_cache.stats()
+
+
+@router.get("/token-cache")
+def get_token_cache_stats(
+    current_user: Principal = Depends(require_admin)
+):
+    """Retorna acertos do cache de tokens verificados e o tempo economizado."""
+    return token_decoder.stats()
@@ -2,20 +2,24 @@
 Endpoints da API para gerenciamento de Clientes
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_route_db
 from dependencies.auth import get_current_user
-from models.user_model import User
+from services.principal_cache import Principal
 from schemas.client_schemas import (
     ClientCreate,
     ClientUpdate,
     ClientResponse
 )
+from schemas.pagination import Page
 from services.client_service import ClientService
 from services.audit_service import AuditService
+from services.service_runner import run_service
+from utils.pagination import MAX_LIMIT
 from utils.request_utils import get_client_info
 
 # Router para clientes
@@ -31,27 +35,28 @@ router = APIRouter(
 async def create_client(
     client_data: ClientCreate,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Cria um novo cliente
     """
     try:
-        client = ClientService.create_client(db, client_data)
+        client = await run_service(db, ClientService.create_client, client_data)
         
         # Registrar auditoria
         try:
             client_info = get_client_info(request)
-            AuditService.log_action(
-                db=db,
+            await run_service(
+                db,
+                AuditService.log_action,
                 user_id=current_user.id,
                 action="CREATE_CLIENT",
                 resource="CLIENT",
                 resource_id=client.id,
                 ip_address=client_info["ip_address"],
                 user_agent=client_info["user_agent"],
-                details={"client_name": client.nome}
+                details={"client_name": client.name}
             )
         except Exception as e:
             # Log de auditoria falhou, mas não impede a criação do cliente
@@ -65,45 +70,65 @@ async def create_client(
         )
 
 
-@router.get("/", response_model=List[ClientResponse])
+@router.get("/", response_model=Union[List[ClientResponse], Page[ClientResponse]])
 async def list_clients(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=MAX_LIMIT),
+    paginacao: Literal["offset", "cursor"] = Query(
+        default="offset",
+        description="Use 'cursor' para receber {items, next_cursor}"
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor retornado em next_cursor"
+    ),
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Lista todos os clientes com paginação
+
+    Por padrão pagina com skip/limit. Com paginacao=cursor (ou ao informar
+    cursor) a paginação usa a chave (id).
     """
-    clients = ClientService.get_clients(db, skip=skip, limit=limit)
+    if paginacao == "cursor" or cursor:
+        items, next_cursor = await run_service(
+            db, ClientService.get_clients_page, limit=limit, cursor=cursor
+        )
+        return Page[ClientResponse](items=items, next_cursor=next_cursor)
+
+    clients = await run_service(
+        db, ClientService.get_clients, skip=skip, limit=limit
+    )
     return clients
 
 
 @router.get("/search", response_model=List[ClientResponse])
 async def search_clients(
     q: str,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=MAX_LIMIT),
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Busca clientes por nome ou email
     """
-    clients = ClientService.search_clients(db, q, skip=skip, limit=limit)
+    clients = await run_service(
+        db, ClientService.search_clients, q, skip=skip, limit=limit
+    )
     return clients
 
 
 @router.get("/{client_id}", response_model=ClientResponse)
 async def get_client(
     client_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Busca um cliente específico por ID
     """
-    client = ClientService.get_client(db, client_id)
+    client = await run_service(db, ClientService.get_client, client_id)
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,14 +142,16 @@ async def update_client(
     client_id: int,
     client_data: ClientUpdate,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Atualiza um cliente existente
     """
     try:
-        client = ClientService.update_client(db, client_id, client_data)
+        client = await run_service(
+            db, ClientService.update_client, client_id, client_data
+        )
         if not client:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -134,15 +161,16 @@ async def update_client(
         # Registrar auditoria
         try:
             client_info = get_client_info(request)
-            AuditService.log_action(
-                db=db,
+            await run_service(
+                db,
+                AuditService.log_action,
                 user_id=current_user.id,
                 action="UPDATE_CLIENT",
                 resource="CLIENT",
                 resource_id=client.id,
                 ip_address=client_info["ip_address"],
                 user_agent=client_info["user_agent"],
-                details={"client_name": client.nome}
+                details={"client_name": client.name}
             )
         except Exception as e:
             # Log de auditoria falhou, mas não impede a atualização
@@ -159,13 +187,13 @@ async def update_client(
 @router.delete("/{client_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_client(
     client_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Union[AsyncSession, Session] = Depends(get_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Remove um cliente
     """
-    success = ClientService.delete_client(db, client_id)
+    success = await run_service(db, ClientService.delete_client, client_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
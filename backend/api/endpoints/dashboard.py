@@ -1,66 +1,44 @@
+from typing import Union
+
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from core.database import get_db
-from models.audit_log import AuditLog
-from models.user_model import User
-from models.client_model import Client
-from models.reserva import Reserva
-from models.quarto import Quarto
+from core.database import get_read_db, get_read_route_db
+from services.principal_cache import Principal
+from schemas.dashboard import DashboardResponse
+from services import dashboard_service
 from dependencies.auth import get_current_user
+from dependencies.permissions import require_admin
+from services.dashboard_cache import dashboard_cache
+from services.service_runner import run_service
 
 router = APIRouter()
 
-@router.get("/")
-async def get_dashboard_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/", response_model=DashboardResponse)
+def get_dashboard_summary(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Retorna estatísticas do dashboard."""
-    
-    # Contar registros
-    total_clients = db.query(Client).count()
-    total_quartos = db.query(Quarto).count()
-    total_reservas = db.query(Reserva).count()
-    
-    # Quartos ocupados (reservas ativas)
-    occupied_rooms = db.query(Reserva).filter(Reserva.status == 'CONFIRMADA').count()
-    
-    return {
-        "stats": {
-            "total_clients": total_clients,
-            "active_reservas": total_reservas,
-            "occupied_rooms": occupied_rooms,
-            "total_rooms": total_quartos,
-            "monthly_revenue": 0.0
-        },
-        "recent_activities": []
-    }
+    """Retorna estatísticas e reservas recentes do dashboard.
+
+    Os totais vêm dos contadores mantidos pelos serviços e o resumo fica
+    alguns segundos em cache (ver services/dashboard_service.py).
+    """
+    return dashboard_service.get_dashboard_summary(db)
 
 @router.get("/activities")
 async def get_recent_activities(
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Union[AsyncSession, Session] = Depends(get_read_route_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Retorna as últimas atividades do sistema."""
-    
-    # Buscar últimas atividades
-    activities = db.query(AuditLog)\
-        .order_by(AuditLog.timestamp.desc())\
-        .limit(limit)\
-        .all()
-    
-    # Formatar resposta
-    return [
-        {
-            "id": activity.id,
-            "action": activity.action,
-            "user_id": activity.user_id,
-            "resource": activity.resource,
-            "timestamp": activity.timestamp.isoformat(),
-            "ip_address": activity.ip_address,
-            "details": activity.details
-        }
-        for activity in activities
-    ]
+    return await run_service(db, dashboard_service.get_recent_activities, limit)
+
+
+@router.get("/cache")
+def get_dashboard_cache_stats(
+    current_user: Principal = Depends(require_admin)
+):
+    """Retorna acertos e falhas do cache do resumo do dashboard."""
+    return dashboard_cache.stats()
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+
+from core.database import (
+    async_pool_metrics,
+    pool_metrics,
+    pool_settings,
+    replica_router,
+)
+from dependencies.permissions import require_admin
+from services.loop_monitor import loop_monitor
+from services.principal_cache import Principal
+from services.service_runner import service_executor
+
+router = APIRouter()
+
+
+@router.get("/event-loop")
+def get_event_loop_metrics(
+    current_user: Principal = Depends(require_admin),
+):
+    """Retorna os atrasos do event loop e a fila do executor de serviços."""
+    return {
+        "loop": loop_monitor.stats(),
+        "service_executor": service_executor.stats(),
+    }
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics(
+    current_user: Principal = Depends(require_admin),
+):
+    """Retorna a configuração e o uso dos pools de conexão (sync e async)."""
+    return {
+        "settings": pool_settings(),
+        "sync": pool_metrics.stats(),
+        "async": async_pool_metrics.stats() if async_pool_metrics else None,
+    }
+
+
+@router.get("/replicas")
+def get_replica_metrics(
+    current_user: Principal = Depends(require_admin),
+):
+    """Retorna a saúde das réplicas de leitura e o uso de cada uma."""
+    return {"enabled": replica_router.enabled, **replica_router.stats()}
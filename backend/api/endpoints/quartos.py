@@ -1,22 +1,25 @@
 """Endpoints da API para gerenciamento de quartos."""
 
 from datetime import date
-from typing import List
+from typing import List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
 from sqlalchemy.orm import Session
 
-from core.database import get_db
+from core.database import get_db, get_read_db
 from dependencies.auth import get_current_active_user
-from models.user_model import User
+from services.principal_cache import Principal
+from schemas.pagination import Page
 from schemas.quarto import (
     Quarto,
     QuartoCalendar,
+    QuartoCalendarCompacto,
     QuartoCreate,
     QuartoUpdate,
 )
 from services import quarto_service
 from services.audit_service import AuditService
+from utils.pagination import MAX_LIMIT
 from utils.request_utils import get_client_info
 
 router = APIRouter()
@@ -27,7 +30,7 @@ def create_quarto(
     quarto: QuartoCreate,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Quarto:
     """Cria um novo quarto."""
     new_quarto = quarto_service.create_quarto(db=db, quarto_data=quarto)
@@ -52,18 +55,38 @@ def create_quarto(
     return new_quarto
 
 
-@router.get("/", response_model=List[Quarto])
+@router.get("/", response_model=Union[List[Quarto], Page[Quarto]])
 def list_quartos(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=MAX_LIMIT),
+    paginacao: Literal["offset", "cursor"] = Query(
+        default="offset",
+        description="Use 'cursor' para receber {items, next_cursor}",
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor retornado em next_cursor"
+    ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> List[Quarto]:
-    """Lista quartos cadastrados."""
+    current_user: Principal = Depends(get_current_active_user),
+) -> Union[List[Quarto], Page[Quarto]]:
+    """Lista quartos cadastrados.
+
+    Por padrão pagina com skip/limit. Com ``paginacao=cursor`` (ou ao
+    informar ``cursor``) a paginação usa a chave (numero, id).
+    """
+    if paginacao == "cursor" or cursor:
+        items, next_cursor = quarto_service.get_quartos_page(
+            db=db, limit=limit, cursor=cursor
+        )
+        return Page[Quarto](items=items, next_cursor=next_cursor)
+
     return quarto_service.get_quartos(db=db, skip=skip, limit=limit)
 
 
-@router.get("/calendario", response_model=List[QuartoCalendar])
+@router.get(
+    "/calendario",
+    response_model=Union[List[QuartoCalendar], List[QuartoCalendarCompacto]],
+)
 def get_calendario(
     data_inicio: date = Query(
         ..., description="Data inicial no formato YYYY-MM-DD"
@@ -71,14 +94,52 @@ def get_calendario(
     data_fim: date = Query(
         ..., description="Data final no formato YYYY-MM-DD"
     ),
+    formato: Literal["completo", "compacto"] = Query(
+        default="completo",
+        description="'completo' lista cada dia; 'compacto' agrupa dias "
+        "consecutivos em segmentos [inicio, fim, status, reserva_id]",
+    ),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Response:
+    """Retorna a ocupação dos quartos em um intervalo de datas.
+
+    O corpo já sai serializado pelo motor do calendário; ``response_model``
+    documenta o formato sem validar cada dia novamente.
+    """
+    content = quarto_service.get_calendario_ocupacao_json(
+        db=db,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        formato=formato,
+    )
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/disponiveis", response_model=List[Quarto])
+def list_quartos_disponiveis(
+    data_inicio: date = Query(
+        ..., description="Data de check-in no formato YYYY-MM-DD"
+    ),
+    data_fim: date = Query(
+        ..., description="Data de check-out no formato YYYY-MM-DD"
+    ),
+    tipo: Optional[Literal["standard", "deluxe", "suite"]] = Query(
+        default=None, description="Filtra pelo tipo do quarto"
+    ),
+    capacidade: Optional[int] = Query(
+        default=None, ge=1, description="Capacidade mínima de hóspedes"
+    ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> List[QuartoCalendar]:
-    """Retorna a ocupação dos quartos em um intervalo de datas."""
-    return quarto_service.get_calendario_ocupacao(
+    current_user: Principal = Depends(get_current_active_user),
+) -> List[Quarto]:
+    """Lista os quartos livres para todo o período informado."""
+    return quarto_service.get_quartos_disponiveis(
         db=db,
         data_inicio=data_inicio,
         data_fim=data_fim,
+        tipo=tipo,
+        capacidade=capacidade,
     )
 
 
@@ -86,7 +147,7 @@ def get_calendario(
 def get_quarto(
     quarto_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Quarto:
     """Retorna um quarto específico."""
     db_quarto = quarto_service.get_quarto(db=db, quarto_id=quarto_id)
@@ -104,7 +165,7 @@ def update_quarto(
     quarto_update: QuartoUpdate,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ) -> Quarto:
     """Atualiza os dados de um quarto."""
     db_quarto = quarto_service.update_quarto(
@@ -141,7 +202,7 @@ def update_quarto(
 def delete_quarto(
     quarto_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> None:
     """Remove um quarto sem reservas ativas."""
     deleted = quarto_service.delete_quarto(db=db, quarto_id=quarto_id)
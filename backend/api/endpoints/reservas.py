@@ -1,14 +1,29 @@
-from typing import List, Optional
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator, List, Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from dependencies.auth import get_current_active_user
-from models.user_model import User
-from schemas.reserva import Reserva, ReservaCreate, ReservaUpdate
+from dependencies.permissions import require_admin
+from services.principal_cache import Principal
+from schemas.pagination import Page
+from schemas.reserva import (
+    Reserva,
+    ReservaCreate,
+    ReservaLoteCreate,
+    ReservaLoteResultado,
+    ReservaUpdate,
+)
 from services import reserva_service
 from services.audit_service import AuditService
+from services.availability_index import availability_index
+from utils.pagination import MAX_LIMIT
 from utils.request_utils import get_client_info
 
 
@@ -20,7 +35,7 @@ def create_reserva(
     reserva: ReservaCreate,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Cria uma nova reserva."""
     new_reserva = reserva_service.create_reserva(db=db, reserva=reserva)
@@ -36,7 +51,7 @@ def create_reserva(
             resource_id=new_reserva.id,
             ip_address=client_info["ip_address"],
             user_agent=client_info["user_agent"],
-            details={"client_id": new_reserva.cliente_id, "quarto_id": new_reserva.quarto_id}
+            details={"client_id": new_reserva.client_id, "quarto_id": new_reserva.quarto_id}
         )
     except Exception as e:
         print(f"Erro ao registrar auditoria: {e}")
@@ -44,19 +59,85 @@ def create_reserva(
     return new_reserva
 
 
-@router.get("/", response_model=List[Reserva])
+@router.post(
+    "/lote",
+    response_model=ReservaLoteResultado,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_reservas_lote(
+    lote: ReservaLoteCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """Cria um bloco de reservas (grupos) em uma única transação.
+
+    Com ``parcial=false`` (padrão) o bloco é tudo ou nada; com
+    ``parcial=true`` os itens válidos são criados e as falhas retornadas.
+    Se nenhum item for criado, a resposta é um erro com o código da
+    primeira falha (por exemplo 409), também no modo parcial.
+    """
+    criadas, falhas = reserva_service.create_reservas_lote(
+        db=db, reservas=lote.reservas, parcial=lote.parcial
+    )
+
+    # Registrar auditoria (uma entrada para o bloco inteiro)
+    if criadas:
+        try:
+            client_info = get_client_info(request)
+            AuditService.log_action(
+                db=db,
+                user_id=current_user.id,
+                action="CREATE_RESERVATION_BATCH",
+                resource="RESERVATION",
+                ip_address=client_info["ip_address"],
+                user_agent=client_info["user_agent"],
+                details={
+                    "reserva_ids": [reserva.id for reserva in criadas],
+                    "quarto_ids": [reserva.quarto_id for reserva in criadas],
+                    "falhas": len(falhas),
+                }
+            )
+        except Exception as e:
+            print(f"Erro ao registrar auditoria: {e}")
+
+    return ReservaLoteResultado(criadas=criadas, falhas=falhas)
+
+
+@router.get("/", response_model=Union[List[Reserva], Page[Reserva]])
 def read_reservas(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=MAX_LIMIT),
     status: Optional[str] = Query(default=None, description="Filtra reservas por status"),
     mes: Optional[str] = Query(
         default=None,
         description="Filtra reservas pelo mês de check-in no formato YYYY-MM",
     ),
+    paginacao: Literal["offset", "cursor"] = Query(
+        default="offset",
+        description="Use 'cursor' para receber {items, next_cursor}",
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor retornado em next_cursor"
+    ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
-    """Lista reservas com filtros opcionais de status e mês."""
+    """Lista reservas com filtros opcionais de status e mês.
+
+    Por padrão pagina com skip/limit. Com ``paginacao=cursor`` (ou ao
+    informar ``cursor``) a paginação usa a chave (data_checkin, id).
+    """
+    if paginacao == "cursor" or cursor:
+        items, next_cursor = reserva_service.get_reservas_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            status_filter=status,
+            mes=mes,
+        )
+        return Page[Reserva](items=items, next_cursor=next_cursor)
+
     reservas = reserva_service.get_reservas(
         db,
         skip=skip,
@@ -67,11 +148,81 @@ def read_reservas(
     return reservas
 
 
+def _export_csv(batches) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in reserva_service.EXPORT_COLUMNS])
+    for rows in batches:
+        writer.writerows(row.values() for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson(batches) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(row), default=str, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+@router.get("/export")
+def export_reservas(
+    formato: Literal["csv", "ndjson"] = Query(
+        default="csv", description="Formato do arquivo exportado"
+    ),
+    desde: Optional[date] = Query(
+        default=None, description="Check-in a partir de (YYYY-MM-DD)"
+    ),
+    ate: Optional[date] = Query(
+        default=None, description="Check-in até (YYYY-MM-DD)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+):
+    """Exporta reservas em CSV ou NDJSON, transmitindo as linhas em lotes."""
+    batches = reserva_service.iter_reservas_export(db, desde=desde, ate=ate)
+    if formato == "ndjson":
+        content, media_type = _export_ndjson(batches), "application/x-ndjson"
+    else:
+        content, media_type = _export_csv(batches), "text/csv; charset=utf-8"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="reservas.{formato}"'
+        },
+    )
+
+
+@router.get("/indice/consistencia")
+def check_availability_index(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """Compara o índice de disponibilidade em memória com a tabela de reservas."""
+    stats = availability_index.stats()
+    if not availability_index.is_ready(db):
+        return {**stats, "consistent": None}
+
+    diff = availability_index.diff(db)
+    return {
+        **stats,
+        "consistent": diff.consistent,
+        "missing": diff.missing,
+        "unexpected": diff.unexpected,
+        "mismatched": diff.mismatched,
+    }
+
+
 @router.get("/{reserva_id}", response_model=Reserva)
 def read_reserva(
     reserva_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ):
     """Busca uma reserva específica."""
     db_reserva = reserva_service.get_reserva(db, reserva_id=reserva_id)
@@ -86,7 +237,7 @@ def update_reserva(
     reserva: ReservaUpdate,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Atualiza uma reserva."""
     db_reserva = reserva_service.update_reserva(
@@ -120,7 +271,7 @@ def delete_reserva(
     reserva_id: int,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Cancela uma reserva (altera o status para 'cancelada')."""
     db_reserva = reserva_service.delete_reserva(db, reserva_id=reserva_id)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Script de retenção da tabela audit_logs.
+
+Move os meses anteriores aos AUDIT_RETENTION_MONTHS mais recentes para
+arquivos JSONL compactados em AUDIT_ARCHIVE_DIR (um por mês) e os remove da
+tabela. No MySQL particionado (migrations/partition_audit_logs.py) também
+cria as partições dos próximos meses. Agende a execução mensal (cron).
+
+Uso:
+    python archive_audit_logs.py [meses_mantidos]
+"""
+import sys
+
+from core.config import AUDIT_ARCHIVE_DIR, AUDIT_RETENTION_MONTHS
+from core.database import SessionLocal, create_tables
+from services.audit_archive import aplicar_retencao, meses_arquivados
+
+
+def main(meses: int = AUDIT_RETENTION_MONTHS) -> bool:
+    """Arquiva os meses antigos da auditoria."""
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        print(f"⏳ Arquivando auditoria (mantendo os últimos {meses} meses)...")
+        arquivados = aplicar_retencao(db, meses=meses)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Falha na retenção: {e}")
+        return False
+    finally:
+        db.close()
+
+    if not arquivados:
+        print("✅ Nenhum mês a arquivar.")
+    for mes, total in arquivados:
+        print(f"   - {mes}: {total} registro(s) movido(s)")
+    print(f"📦 Meses em '{AUDIT_ARCHIVE_DIR}': {', '.join(meses_arquivados()) or '-'}")
+    return True
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    sys.exit(0 if main(int(argumentos[0]) if argumentos else AUDIT_RETENTION_MONTHS) else 1)
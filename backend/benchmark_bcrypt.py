@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""Benchmark do custo do bcrypt neste servidor.
+
+Mede o tempo de ``get_password_hash`` para cada custo (BCRYPT_ROUNDS) e
+recomenda o maior custo cujo p99 cabe no orçamento de latência do login.
+O login faz uma verificação (mesmo custo do hash); some a espera na fila do
+pool de hash (GET /api/v1/auth/hash-pool) ao avaliar picos de acesso.
+
+Uso:
+    python benchmark_bcrypt.py [orcamento_ms] [amostras]
+
+    python benchmark_bcrypt.py              # orçamento de 100 ms, 20 amostras
+    python benchmark_bcrypt.py 250 50
+"""
+import statistics
+import sys
+import time
+
+from core.config import BCRYPT_ROUNDS
+from services.auth_service import get_password_hash
+
+ORCAMENTO_PADRAO_MS = 100.0
+AMOSTRAS_PADRAO = 20
+CUSTO_MINIMO = 8
+CUSTO_MAXIMO = 16
+SENHA = "Benchmark#2024"
+
+
+def medir(custo: int, amostras: int) -> tuple:
+    """Retorna (p50, p99) em ms para gerar hashes com ``custo``."""
+    tempos = []
+    for _ in range(amostras):
+        inicio = time.perf_counter()
+        get_password_hash(SENHA, rounds=custo)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    p99 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.99))]
+    return statistics.median(tempos), p99
+
+
+def main(orcamento_ms: float, amostras: int) -> int:
+    print(f"⏳ Orçamento: {orcamento_ms:.0f} ms (p99) | custo atual: {BCRYPT_ROUNDS}\n")
+    print("custo        p50         p99")
+    recomendado = None
+    for custo in range(CUSTO_MINIMO, CUSTO_MAXIMO + 1):
+        # Cada custo dobra o tempo; custos altos usam menos amostras
+        p50, p99 = medir(custo, max(3, amostras >> max(0, custo - 12)))
+        marca = "✓" if p99 <= orcamento_ms else " "
+        print(f"{custo:>5} {p50:>9.1f} ms {p99:>9.1f} ms  {marca}")
+        if p99 <= orcamento_ms:
+            recomendado = custo
+        elif p50 > orcamento_ms * 2:
+            break
+
+    print()
+    if recomendado is None:
+        print(f"❌ Nenhum custo a partir de {CUSTO_MINIMO} cabe no orçamento.")
+        return 1
+    print(f"✅ Recomendado: BCRYPT_ROUNDS={recomendado}")
+    if recomendado != BCRYPT_ROUNDS:
+        print("   Hashes existentes são refeitos no próximo login de cada usuário.")
+    return 0
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    orcamento = float(argumentos[0]) if argumentos else ORCAMENTO_PADRAO_MS
+    amostras = int(argumentos[1]) if len(argumentos) > 1 else AMOSTRAS_PADRAO
+    sys.exit(main(orcamento, amostras))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""Benchmark do resumo do dashboard em bases de tamanhos crescentes.
+
+Para cada tamanho, cria um banco SQLite temporário com quartos, clientes,
+reservas e as tabelas derivadas (ocupacao_diaria e dashboard_counters) e
+mede a latência de:
+
+- ``resumo``: get_dashboard_summary com o cache invalidado a cada chamada
+  (contadores + atividades recentes, como no GET /dashboard);
+- ``cache``: get_dashboard_summary servido do cache;
+- ``legado``: as contagens completas do endpoint antigo (``.count()`` em
+  clientes, quartos e reservas);
+- ``recontagem``: a reconciliação completa dos contadores, para referência.
+
+Uso:
+    python benchmark_dashboard.py [tamanho ...]
+
+    python benchmark_dashboard.py                      # 10k, 100k e 1M
+    python benchmark_dashboard.py 10000 100000
+"""
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.client_model import Client
+from models.ocupacao_diaria import OcupacaoDiaria
+from models.quarto import Quarto
+from models.reserva import Reserva
+from services.dashboard_cache import dashboard_cache
+from services.dashboard_counters import reconciliar_contadores
+from services.dashboard_service import get_dashboard_summary
+
+TAMANHOS_PADRAO = (10_000, 100_000, 1_000_000)
+TOTAL_QUARTOS = 300
+TOTAL_CLIENTES = 5_000
+LOTE = 50_000
+REPETICOES = 50
+
+
+def popular(db, total_reservas: int) -> None:
+    """Gera reservas sem sobreposição, terminando perto de hoje."""
+    rnd = random.Random(42)
+    db.execute(
+        insert(Quarto),
+        [
+            {
+                "numero": str(1000 + i),
+                "tipo": "standard",
+                "valor_diaria": 150.0,
+                "capacidade": 2,
+                "status": "livre",
+            }
+            for i in range(TOTAL_QUARTOS)
+        ],
+    )
+    db.execute(
+        insert(Client),
+        [
+            {
+                "name": f"Cliente {i}",
+                "email": f"cliente{i}@example.com",
+                "phone": "000",
+                "document": str(i),
+            }
+            for i in range(TOTAL_CLIENTES)
+        ],
+    )
+
+    por_quarto = total_reservas // TOTAL_QUARTOS
+    # Cada reserva ocupa em média 3,5 dias (noites + intervalo livre)
+    inicio = date.today() - timedelta(days=int(por_quarto * 3.5) - 60)
+    reservas, noites = [], []
+    reserva_id = 0
+    for quarto_id in range(1, TOTAL_QUARTOS + 1):
+        dia = inicio
+        for _ in range(por_quarto):
+            dia += timedelta(days=rnd.randint(0, 2))
+            duracao = rnd.randint(1, 4)
+            reserva_id += 1
+            status = "cancelada" if rnd.random() < 0.1 else "pendente"
+            reservas.append(
+                {
+                    "id": reserva_id,
+                    "quarto_id": quarto_id,
+                    "client_id": rnd.randint(1, TOTAL_CLIENTES),
+                    "data_checkin": dia,
+                    "data_checkout": dia + timedelta(days=duracao),
+                    "valor_total": 150.0 * duracao,
+                    "status": status,
+                }
+            )
+            if status != "cancelada":
+                noites.extend(
+                    {
+                        "quarto_id": quarto_id,
+                        "noite": dia + timedelta(days=n),
+                        "reserva_id": reserva_id,
+                        "status": status,
+                    }
+                    for n in range(duracao)
+                )
+            dia += timedelta(days=duracao)
+
+            if len(reservas) >= LOTE:
+                db.execute(insert(Reserva), reservas)
+                db.execute(insert(OcupacaoDiaria), noites)
+                reservas, noites = [], []
+    if reservas:
+        db.execute(insert(Reserva), reservas)
+        db.execute(insert(OcupacaoDiaria), noites)
+    db.commit()
+
+
+def legado(db) -> dict:
+    """Contagens feitas pelo endpoint antes dos contadores."""
+    return {
+        "total_clients": db.query(Client).count(),
+        "total_rooms": db.query(Quarto).count(),
+        "active_reservas": db.query(Reserva).count(),
+        "occupied_rooms": db.query(Reserva).filter(Reserva.status == "CONFIRMADA").count(),
+    }
+
+
+def medir(funcao, repeticoes: int = REPETICOES) -> str:
+    amostras = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        amostras.append((time.perf_counter() - inicio) * 1000)
+    amostras.sort()
+    p95 = amostras[int(len(amostras) * 0.95) - 1]
+    return f"p50 {statistics.median(amostras):8.2f} ms | p95 {p95:8.2f} ms"
+
+
+def executar(total_reservas: int, diretorio: Path) -> None:
+    caminho = diretorio / f"dashboard_{total_reservas}.db"
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        print(f"\n=== {total_reservas:,} reservas ===".replace(",", "."))
+        inicio = time.perf_counter()
+        popular(db, total_reservas)
+        print(f"⏳ Base gerada em {time.perf_counter() - inicio:.1f} s")
+
+        inicio = time.perf_counter()
+        reconciliar_contadores(db, corrigir=True)
+        recontagem = (time.perf_counter() - inicio) * 1000
+        total = db.query(func.count(Reserva.id)).scalar()
+
+        def resumo():
+            dashboard_cache.invalidate()
+            return get_dashboard_summary(db)
+
+        print(f"📋 Reservas na base: {total}")
+        print(f"resumo      {medir(resumo)}")
+        get_dashboard_summary(db)
+        print(f"cache       {medir(lambda: get_dashboard_summary(db))}")
+        print(f"legado      {medir(lambda: legado(db), repeticoes=10)}")
+        print(f"recontagem  {recontagem:8.2f} ms (uma execução)")
+    finally:
+        db.close()
+        engine.dispose()
+        dashboard_cache.invalidate()
+
+
+if __name__ == "__main__":
+    tamanhos = [int(arg) for arg in sys.argv[1:]] or list(TAMANHOS_PADRAO)
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho in tamanhos:
+            executar(tamanho, Path(diretorio))
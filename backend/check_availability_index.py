@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Script para verificar a consistência do índice de disponibilidade.
+
+Consulta a API em execução, que compara o índice em memória do processo com
+a tabela ``reservas``. Requer credenciais de um usuário ADMIN.
+
+Uso:
+    python check_availability_index.py <username> <password> [base_url]
+"""
+import sys
+
+import requests
+
+# URL base da API
+BASE_URL = "http://localhost:8000"
+
+
+def check_availability_index(username: str, password: str, base_url: str = BASE_URL) -> bool:
+    """Autentica na API e exibe as divergências encontradas no índice."""
+    response = requests.post(
+        f"{base_url}/api/v1/auth/token",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    if response.status_code != 200:
+        print(f"❌ Falha no login: {response.text}")
+        return False
+
+    token = response.json()["access_token"]
+    response = requests.get(
+        f"{base_url}/api/v1/reservas/indice/consistencia",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    if response.status_code != 200:
+        print(f"❌ Erro ao consultar o índice: {response.status_code} {response.text}")
+        return False
+
+    report = response.json()
+    print(f"📊 Quartos indexados: {report['rooms']}")
+    print(f"📋 Reservas indexadas: {report['reservas']}")
+
+    if report["consistent"] is None:
+        print("⚠️  Índice frio: as consultas estão usando o SQL.")
+        return True
+
+    if report["consistent"]:
+        print("✅ Índice consistente com a tabela 'reservas'.")
+        return True
+
+    print("❌ Índice divergente da tabela 'reservas':")
+    print(f"   - ausentes no índice: {report['missing']}")
+    print(f"   - inexistentes no banco: {report['unexpected']}")
+    print(f"   - com datas/quarto diferentes: {report['mismatched']}")
+    return False
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+
+    url = sys.argv[3] if len(sys.argv) > 3 else BASE_URL
+    ok = check_availability_index(sys.argv[1], sys.argv[2], url)
+    sys.exit(0 if ok else 1)
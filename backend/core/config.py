@@ -27,3 +27,60 @@ ALLOWED_ORIGINS = os.getenv(
     "ALLOWED_ORIGINS",
     "http://localhost:3000,http://localhost:8000"
 ).split(",")
+
+# Índice de disponibilidade em memória
+AVAILABILITY_INDEX_ENABLED = (
+    os.getenv("AVAILABILITY_INDEX_ENABLED", "true").lower() == "true"
+)
+AVAILABILITY_INDEX_MAX_AGE_SECONDS = float(
+    os.getenv("AVAILABILITY_INDEX_MAX_AGE_SECONDS", "300")
+)
+
+# Cache do resumo do dashboard (0 desativa)
+DASHBOARD_CACHE_TTL_SECONDS = float(
+    os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "10")
+)
+
+# Gravação assíncrona da auditoria
+AUDIT_ASYNC_ENABLED = os.getenv("AUDIT_ASYNC_ENABLED", "true").lower() == "true"
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+AUDIT_FLUSH_INTERVAL_MS = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+AUDIT_QUEUE_MAX_SIZE = int(os.getenv("AUDIT_QUEUE_MAX_SIZE", "10000"))
+AUDIT_SPILL_PATH = os.getenv("AUDIT_SPILL_PATH", "audit_spill.jsonl")
+
+# Retenção da auditoria: meses mantidos na tabela e pasta dos arquivos
+AUDIT_RETENTION_MONTHS = max(1, int(os.getenv("AUDIT_RETENTION_MONTHS", "3")))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "audit_archive")
+
+# Pool de processos para hash de senhas (bcrypt); 0 usa threads
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "100"))
+
+# Custo do bcrypt (2^N iterações); hashes com outro custo são refeitos no login
+BCRYPT_ROUNDS = min(31, max(4, int(os.getenv("BCRYPT_ROUNDS", "12"))))
+
+# Cache dos usuários autenticados (evita consultar users a cada requisição)
+AUTH_PRINCIPAL_CACHE_SIZE = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "1000"))
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS = float(
+    os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30")
+)
+
+# Cache de tokens JWT já verificados (0 desativa) e decodificador usado
+JWT_DECODE_CACHE_SIZE = int(os.getenv("JWT_DECODE_CACHE_SIZE", "4096"))
+JWT_DECODER = os.getenv("JWT_DECODER", "jose")
+
+# Threads para os serviços síncronos chamados pelas rotas async
+SERVICE_EXECUTOR_WORKERS = max(1, int(os.getenv("SERVICE_EXECUTOR_WORKERS", "16")))
+
+# Monitor de bloqueios do event loop (registra callbacks acima do limite)
+LOOP_LAG_MONITOR_ENABLED = (
+    os.getenv("LOOP_LAG_MONITOR_ENABLED", "true").lower() == "true"
+)
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+
+# Contagem de consultas SQL por requisição (header Server-Timing) e alerta
+# de N+1 quando a mesma consulta se repete mais que o limite
+QUERY_COUNTER_ENABLED = os.getenv("QUERY_COUNTER_ENABLED", "true").lower() == "true"
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
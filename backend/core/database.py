@@ -1,10 +1,24 @@
 import os
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional, Union
 from dotenv import load_dotenv
 
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
+from core.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+)
+from core.replicas import Replica, ReplicaRouter, RoutingSession
 from models.base import Base
 
 # Carregar variáveis do arquivo .env
@@ -20,6 +34,15 @@ if not DATABASE_URL:
     )
 
 
+# Pool de conexões (DB_POOL_RECYCLE=-1 desativa a reciclagem)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_USE_LIFO = os.getenv("DB_POOL_USE_LIFO", "true").lower() == "true"
+DB_POOL_WARMUP = os.getenv("DB_POOL_WARMUP", "true").lower() == "true"
+
+
 # Opções de conexão com base no tipo de banco
 def _engine_options(url: str) -> dict:
     if url and url.startswith("sqlite"):
@@ -27,13 +50,48 @@ def _engine_options(url: str) -> dict:
     return {"pool_pre_ping": True}
 
 
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:")
+        or parsed.query.get("mode") == "memory"
+    )
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    # SQLite em memória usa uma única conexão, sem tamanho nem overflow
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        # LIFO reaproveita as conexões mais recentes; as ociosas expiram
+        "pool_use_lifo": DB_POOL_USE_LIFO,
+    }
+
+
+def pool_settings() -> dict:
+    """Configuração do pool, para o endpoint de métricas."""
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout_s": DB_POOL_TIMEOUT,
+        "recycle_s": DB_POOL_RECYCLE,
+        "use_lifo": DB_POOL_USE_LIFO,
+        "warmup": DB_POOL_WARMUP,
+    }
+
+
 # Configuração do banco de dados
 engine = create_engine(
     DATABASE_URL,
-    pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
-    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
     **_engine_options(DATABASE_URL),
+    **_pool_options(DATABASE_URL, InstrumentedQueuePool),
 )
+pool_metrics = PoolMetrics("sync").instrument(engine)
 
 # Criar SessionLocal para criar sessões do banco de dados
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -53,6 +111,232 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# Drivers assíncronos equivalentes aos drivers síncronos suportados
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+# Rotas async usam o driver assíncrono; com "false" voltam à sessão síncrona
+DB_ASYNC_ENABLED = os.getenv("DB_ASYNC_ENABLED", "true").lower() == "true"
+
+
+def async_database_url(url: str) -> str:
+    """Converte DATABASE_URL para o driver assíncrono correspondente."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername)
+    if driver is None:
+        raise ValueError(
+            f"Sem driver assíncrono conhecido para {parsed.drivername}; "
+            "defina DB_ASYNC_ENABLED=false"
+        )
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str) -> AsyncEngine:
+    """Cria o engine assíncrono com o mesmo pool configurado para ``engine``."""
+    return create_async_engine(
+        async_database_url(url),
+        **_engine_options(url),
+        **_pool_options(url, InstrumentedAsyncQueuePool),
+    )
+
+
+async_engine: Optional[AsyncEngine] = (
+    create_async_db_engine(DATABASE_URL) if DB_ASYNC_ENABLED else None
+)
+async_pool_metrics: Optional[PoolMetrics] = (
+    PoolMetrics("async").instrument(async_engine.sync_engine)
+    if async_engine is not None
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Engines que apontam para o mesmo banco que outro engine síncrono. Sessões
+# do engine assíncrono (em ``run_sync``) expõem ``async_engine.sync_engine``
+# como bind; o índice de disponibilidade e a fila de auditoria comparam o
+# bind por identidade e precisam reconhecê-lo como ``engine``.
+_bind_aliases: dict = {}
+
+
+def register_bind_alias(alias, target) -> None:
+    """Registra ``alias`` como equivalente ao engine ``target``."""
+    _bind_aliases[id(alias)] = (alias, target)
+
+
+def canonical_bind(bind):
+    """Engine síncrono registrado para ``bind`` (ou o próprio ``bind``)."""
+    entry = _bind_aliases.get(id(bind))
+    if entry is not None and entry[0] is bind:
+        return entry[1]
+    return bind
+
+
+if async_engine is not None:
+    register_bind_alias(async_engine.sync_engine, engine)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependência com uma sessão assíncrona (aiomysql/aiosqlite).
+
+    Yields:
+        AsyncSession: Sessão assíncrona do banco de dados
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_route_db() -> AsyncGenerator[Union[AsyncSession, Session], None]:
+    """
+    Dependência das rotas ``async def``.
+
+    Com DB_ASYNC_ENABLED fornece uma sessão assíncrona; senão, a sessão
+    síncrona de sempre. Nos dois casos as rotas chamam os serviços por
+    ``services.service_runner.run_service``.
+    """
+    if DB_ASYNC_ENABLED:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+# Réplicas de leitura (URLs separadas por vírgula; vazio desativa)
+READ_DATABASE_URLS = [
+    url.strip()
+    for url in (
+        os.getenv("READ_DATABASE_URLS") or os.getenv("READ_DATABASE_URL") or ""
+    ).split(",")
+    if url.strip()
+]
+
+
+def _create_replica(indice: int, url: str) -> Replica:
+    replica_engine = create_engine(
+        url, **_engine_options(url), **_pool_options(url, InstrumentedQueuePool)
+    )
+    return Replica(
+        nome=replica_engine.url.render_as_string(hide_password=True),
+        engine=replica_engine,
+        async_engine=create_async_db_engine(url) if DB_ASYNC_ENABLED else None,
+        metrics=PoolMetrics(f"replica-{indice}").instrument(replica_engine),
+    )
+
+
+replica_router = ReplicaRouter(
+    [_create_replica(i, url) for i, url in enumerate(READ_DATABASE_URLS)],
+    check_interval=float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5")),
+    max_lag_seconds=float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30")),
+    sticky_seconds=float(os.getenv("REPLICA_STICKY_SECONDS", "5")),
+)
+
+
+def read_routing_key(request: Request) -> bytes:
+    """Identifica quem fez a requisição (token, ou IP sem token)."""
+    identificacao = request.headers.get("authorization") or (
+        request.client.host if request.client else ""
+    )
+    return replica_router.chave(identificacao)
+
+
+def get_read_db(
+    request: Request, db: Session = Depends(get_db)
+) -> Generator[Session, None, None]:
+    """
+    Variante de ``get_db`` para rotas somente leitura.
+
+    Com réplicas configuradas, fornece uma ``RoutingSession`` que consulta
+    uma réplica e passa ao primário se a rota escrever. Sem réplica
+    saudável, ou logo após uma escrita do mesmo usuário, usa a sessão de
+    ``get_db``.
+
+    Yields:
+        Session: Sessão do banco de dados SQLAlchemy
+    """
+    replica = replica_router.escolher(read_routing_key(request))
+    if replica is None:
+        yield db
+        return
+    sessao = RoutingSession(
+        primario=db.get_bind(), replica=replica.engine, autoflush=False
+    )
+    try:
+        yield sessao
+    finally:
+        sessao.close()
+
+
+async def get_read_route_db(
+    request: Request, db: Union[AsyncSession, Session] = Depends(get_route_db)
+) -> AsyncGenerator[Union[AsyncSession, Session], None]:
+    """Variante de ``get_route_db`` para rotas ``async def`` somente leitura."""
+    replica = replica_router.escolher(read_routing_key(request))
+    if replica is None:
+        yield db
+    elif isinstance(db, AsyncSession) and replica.async_engine is not None:
+        async with AsyncSession(
+            sync_session_class=RoutingSession,
+            primario=db.sync_session.get_bind(),
+            replica=replica.async_engine.sync_engine,
+            autoflush=False,
+            expire_on_commit=False,
+        ) as sessao:
+            yield sessao
+    else:
+        sessao = RoutingSession(
+            primario=db.get_bind(), replica=replica.engine, autoflush=False
+        )
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+
+def warm_up_pool(bind: Engine, conexoes: int = DB_POOL_SIZE) -> int:
+    """
+    Abre ``conexoes`` conexões de uma vez e as devolve ao pool.
+
+    Executado na inicialização, evita que as primeiras requisições paguem a
+    abertura das conexões.
+
+    Returns:
+        int: Conexões abertas (0 para SQLite em memória)
+    """
+    if _is_memory_sqlite(str(bind.url)):
+        return 0
+    abertas = []
+    try:
+        for _ in range(conexoes):
+            abertas.append(bind.connect())
+    finally:
+        for conexao in abertas:
+            conexao.close()
+    return len(abertas)
+
+
+async def warm_up_async_pool(bind: AsyncEngine, conexoes: int = DB_POOL_SIZE) -> int:
+    """Equivalente de ``warm_up_pool`` para o engine assíncrono."""
+    if _is_memory_sqlite(str(bind.url)):
+        return 0
+    abertas = []
+    try:
+        for _ in range(conexoes):
+            abertas.append(await bind.connect())
+    finally:
+        for conexao in abertas:
+            await conexao.close()
+    return len(abertas)
+
+
 def create_tables():
     """
     Criar todas as tabelas no banco de dados configurado.
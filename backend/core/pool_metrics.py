@@ -0,0 +1,208 @@
+"""Métricas do pool de conexões do SQLAlchemy.
+
+Sem elas não há como saber se erros em horários de pico vêm do pool
+esgotado. ``PoolMetrics`` escuta os eventos ``connect``, ``checkout``,
+``checkin`` e ``close`` do pool e mantém:
+
+- histograma do tempo de espera no checkout (e quantos estouraram
+  ``DB_POOL_TIMEOUT``);
+- conexões em uso, pico de uso e uso do overflow além de ``pool_size``;
+- tempo em que cada conexão ficou emprestada;
+- idade das conexões abertas (comparar com ``DB_POOL_RECYCLE``).
+
+Não há evento para o início do checkout. Por isso a espera é medida pelos
+pools ``InstrumentedQueuePool`` e ``InstrumentedAsyncQueuePool``, que
+cronometram ``connect()``: fila do pool mais a abertura de uma conexão
+nova, quando necessária.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Limites superiores (ms) das faixas do histograma de espera
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Contadores de um pool, alimentados pelos eventos do SQLAlchemy."""
+
+    def __init__(self, nome: str) -> None:
+        self.nome = nome
+        self.pool = None
+        self._lock = threading.Lock()
+        self._abertas: Dict[int, float] = {}
+        self.reset_stats()
+
+    def instrument(self, engine: Engine) -> "PoolMetrics":
+        """Registra os eventos no pool de ``engine`` (síncrono)."""
+        self.pool = engine.pool
+        if isinstance(engine.pool, _TempoDeEspera):
+            engine.pool._metrics = self
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "close_detached", self._on_close_detached)
+        return self
+
+    def observe_wait(self, segundos: float, timeout: bool = False) -> None:
+        ms = segundos * 1000
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+                return
+            self.waits += 1
+            self._espera_total += segundos
+            self.max_wait = max(self.max_wait, segundos)
+            for i, limite in enumerate(WAIT_BUCKETS_MS):
+                if ms <= limite:
+                    self._faixas[i] += 1
+                    break
+            else:
+                self._faixas[-1] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        agora = time.monotonic()
+        connection_record.info["pool_created_at"] = agora
+        with self._lock:
+            self.connects += 1
+            self._abertas[id(connection_record)] = agora
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["pool_checkout_at"] = time.monotonic()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            tamanho = self._pool_size()
+            if tamanho is not None and self.in_use > tamanho:
+                self.overflow_checkouts += 1
+                self.peak_overflow = max(self.peak_overflow, self.in_use - tamanho)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        inicio = connection_record.info.pop("pool_checkout_at", None)
+        with self._lock:
+            if inicio is None:
+                return
+            self.in_use -= 1
+            emprestada = time.monotonic() - inicio
+            self.checkins += 1
+            self._emprestimo_total += emprestada
+            self.max_hold = max(self.max_hold, emprestada)
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.closes += 1
+            self._abertas.pop(id(connection_record), None)
+
+    def _on_close_detached(self, dbapi_connection) -> None:
+        with self._lock:
+            self.closes += 1
+
+    def _pool_size(self) -> Optional[int]:
+        tamanho = getattr(self.pool, "size", None)
+        return tamanho() if callable(tamanho) else None
+
+    def stats(self) -> dict:
+        agora = time.monotonic()
+        tamanho = self._pool_size()
+        with self._lock:
+            idades = [agora - criada for criada in self._abertas.values()]
+            faixas = [
+                {"le_ms": limite, "count": n}
+                for limite, n in zip(WAIT_BUCKETS_MS, self._faixas)
+            ]
+            faixas.append({"le_ms": None, "count": self._faixas[-1]})
+            return {
+                "pool": type(self.pool).__name__ if self.pool else None,
+                "pool_size": tamanho,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "overflow_in_use": (
+                    max(0, self.in_use - tamanho) if tamanho is not None else None
+                ),
+                "peak_overflow": self.peak_overflow,
+                "overflow_checkouts": self.overflow_checkouts,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "closes": self.closes,
+                "timeouts": self.timeouts,
+                "wait_histogram": faixas,
+                "avg_wait_ms": self.waits and self._espera_total / self.waits * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_hold_ms": (
+                    self.checkins and self._emprestimo_total / self.checkins * 1000
+                ),
+                "max_hold_ms": self.max_hold * 1000,
+                "open_connections": len(idades),
+                "oldest_connection_s": max(idades) if idades else None,
+                "avg_connection_age_s": sum(idades) / len(idades) if idades else None,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.closes = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.overflow_checkouts = 0
+            self.in_use = getattr(self, "in_use", 0)
+            self.peak_in_use = self.in_use
+            self.peak_overflow = 0
+            self.max_wait = 0.0
+            self.max_hold = 0.0
+            self._espera_total = 0.0
+            self._emprestimo_total = 0.0
+            self._faixas = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+
+class _TempoDeEspera:
+    """Cronometra a obtenção de conexões do pool."""
+
+    _metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super().connect()
+        except exc.TimeoutError:
+            if self._metrics is not None:
+                self._metrics.observe_wait(time.perf_counter() - inicio, timeout=True)
+            raise
+        if self._metrics is not None:
+            self._metrics.observe_wait(time.perf_counter() - inicio)
+        return conexao
+
+    def recreate(self):
+        # engine.dispose() recria o pool; as métricas continuam as mesmas
+        novo = super().recreate()
+        novo._metrics = self._metrics
+        if self._metrics is not None:
+            self._metrics.pool = novo
+        return novo
+
+
+class InstrumentedQueuePool(_TempoDeEspera, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TempoDeEspera, AsyncAdaptedQueuePool):
+    pass
+
+
+__all__ = [
+    "InstrumentedAsyncQueuePool",
+    "InstrumentedQueuePool",
+    "PoolMetrics",
+    "WAIT_BUCKETS_MS",
+]
@@ -0,0 +1,186 @@
+"""Contagem das consultas SQL de cada requisição.
+
+``install()`` registra ``before_cursor_execute`` e ``after_cursor_execute``
+em todos os engines (inclusive o ``sync_engine`` dos engines assíncronos e
+os das réplicas). Cada execução é somada ao ``QueryStats`` da requisição
+atual, guardado em uma ``ContextVar``; o contexto acompanha a requisição
+no threadpool, no executor de serviços e no ``run_sync``. Execuções fora
+de uma requisição (fila de auditoria, scripts) não são contadas.
+
+``QueryCounterMiddleware`` cria o ``QueryStats`` da requisição, informa o
+total no header ``Server-Timing`` (``db;dur=<ms>;desc="<n> queries"``) e
+registra um aviso quando o mesmo formato de consulta se repete mais que
+``QUERY_REPEAT_THRESHOLD`` vezes, sinal típico de N+1. Observadores
+(``add_observer``) recebem os números de cada requisição; o plugin de
+testes ``tests/query_budget.py`` os usa para aplicar orçamentos de
+consultas por rota.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from core.config import QUERY_REPEAT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Listas de parâmetros (IN (?, ?, ?)) viram um único marcador
+_LISTA_DE_PARAMETROS = re.compile(
+    r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)"
+)
+_ESPACOS = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Formato da consulta, sem variações de espaço e tamanho de listas IN."""
+    return _LISTA_DE_PARAMETROS.sub("(?)", _ESPACOS.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Consultas executadas durante uma requisição."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duracao: float) -> None:
+        formato = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.duration += duracao
+            self.shapes[formato] += 1
+
+    def repeated(self, limite: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Formatos executados mais que ``limite`` vezes."""
+        with self._lock:
+            return [(f, n) for f, n in self.shapes.most_common() if n > limite]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_atual: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_observers: List[Callable[[str, str, QueryStats], None]] = []
+_instalado = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _atual.get() is not None:
+        conn.info["query_counter_inicio"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    inicio = conn.info.pop("query_counter_inicio", None)
+    stats = _atual.get()
+    if stats is not None and inicio is not None:
+        stats.record(statement, time.perf_counter() - inicio)
+
+
+def install() -> None:
+    """Registra a contagem em todos os engines (uma vez)."""
+    global _instalado
+    if not _instalado:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _instalado = True
+
+
+@contextmanager
+def track() -> Iterator[QueryStats]:
+    """Conta as consultas executadas dentro do bloco."""
+    install()
+    stats = QueryStats()
+    token = _atual.set(stats)
+    try:
+        yield stats
+    finally:
+        _atual.reset(token)
+
+
+def add_observer(observer: Callable[[str, str, QueryStats], None]) -> None:
+    """``observer(metodo, rota, stats)`` é chamado ao fim de cada requisição."""
+    _observers.append(observer)
+
+
+def remove_observer(observer: Callable[[str, str, QueryStats], None]) -> None:
+    _observers.remove(observer)
+
+
+def route_template(scope) -> str:
+    """Caminho da rota com os parâmetros, ex.: ``/api/v1/reservas/{reserva_id}``.
+
+    ``scope["route"]`` é a rota do router incluído, com caminho relativo ao
+    prefixo; o prefixo vem do caminho da requisição.
+    """
+    caminho = scope["path"]
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_format"):
+        return caminho
+    try:
+        trecho = route.path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return caminho
+    if not caminho.endswith(trecho):
+        return caminho
+    return caminho[: len(caminho) - len(trecho)] + route.path
+
+
+class QueryCounterMiddleware:
+    """Conta as consultas da requisição e as informa em ``Server-Timing``."""
+
+    def __init__(self, app, repeat_threshold: int = QUERY_REPEAT_THRESHOLD) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        install()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing()
+                )
+            await send(message)
+
+        with track() as stats:
+            await self.app(scope, receive, enviar)
+
+        rota = route_template(scope)
+        for formato, vezes in stats.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possível N+1 em %s %s: %d execuções de %s",
+                scope["method"],
+                rota,
+                vezes,
+                formato[:300],
+            )
+        for observer in list(_observers):
+            observer(scope["method"], rota, stats)
+
+
+__all__ = [
+    "QueryCounterMiddleware",
+    "QueryStats",
+    "add_observer",
+    "install",
+    "remove_observer",
+    "route_template",
+    "statement_shape",
+    "track",
+]
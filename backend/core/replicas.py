@@ -0,0 +1,245 @@
+"""Leituras em réplicas do banco (READ_DATABASE_URLS).
+
+``ReplicaRouter`` escolhe a réplica de cada requisição em round-robin,
+apenas entre as réplicas saudáveis. Uma thread confere cada réplica a cada
+``REPLICA_HEALTH_CHECK_SECONDS`` com ``SELECT 1``; no MySQL também recusa
+réplicas com atraso de replicação acima de ``REPLICA_MAX_LAG_SECONDS``.
+Sem réplica saudável, a leitura volta ao primário.
+
+``RoutingSession`` envia consultas à réplica até a primeira escrita (flush
+ou INSERT/UPDATE/DELETE); dali em diante a sessão inteira usa o primário.
+SQL textual não é inspecionado: rotas que escrevem devem usar ``get_db``.
+
+Para ler o que acabou de escrever, quem fez uma requisição de escrita
+(mesmo token, ou mesmo IP sem token) tem as leituras no primário por
+``REPLICA_STICKY_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.requests import Request
+
+from core.pool_metrics import PoolMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingSession(Session):
+    """Sessão que lê da réplica e passa ao primário na primeira escrita."""
+
+    def __init__(self, primario: Engine, replica: Engine, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.primario = primario
+        self.replica = replica
+        self.no_primario = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.no_primario or self._flushing or isinstance(clause, UpdateBase):
+            self.no_primario = True
+            return self.primario
+        return self.replica
+
+
+@dataclass
+class Replica:
+    nome: str
+    engine: Engine
+    async_engine: Optional[AsyncEngine] = None
+    metrics: Optional[PoolMetrics] = field(default=None, repr=False)
+    saudavel: bool = True
+    atraso_s: Optional[float] = None
+    erro: Optional[str] = None
+    selecoes: int = 0
+    verificada_em: Optional[float] = field(default=None, repr=False)
+
+
+class ReplicaRouter:
+    """Round-robin entre réplicas saudáveis, com leitura no primário após escrita."""
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        check_interval: float = 5.0,
+        max_lag_seconds: float = 30.0,
+        sticky_seconds: float = 5.0,
+    ) -> None:
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self._lock = threading.Lock()
+        self._proxima = itertools.count()
+        self._escritas: Dict[bytes, float] = {}
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.primary_fallbacks = 0
+        self.sticky_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @staticmethod
+    def chave(identificacao: str) -> bytes:
+        return hashlib.sha256(identificacao.encode("utf-8")).digest()
+
+    def registrar_escrita(self, chave: bytes) -> None:
+        """Leituras de ``chave`` ficam no primário por ``sticky_seconds``."""
+        if not self.enabled or self.sticky_seconds <= 0:
+            return
+        agora = time.monotonic()
+        with self._lock:
+            self._escritas[chave] = agora + self.sticky_seconds
+            if len(self._escritas) > 10_000:
+                self._escritas = {
+                    c: fim for c, fim in self._escritas.items() if fim > agora
+                }
+
+    def escolher(self, chave: Optional[bytes] = None) -> Optional[Replica]:
+        """Próxima réplica saudável, ou None para ler do primário."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if chave is not None:
+                fim = self._escritas.get(chave)
+                if fim is not None:
+                    if fim > time.monotonic():
+                        self.sticky_reads += 1
+                        return None
+                    del self._escritas[chave]
+            saudaveis = [r for r in self.replicas if r.saudavel]
+            if not saudaveis:
+                self.primary_fallbacks += 1
+                return None
+            replica = saudaveis[next(self._proxima) % len(saudaveis)]
+            replica.selecoes += 1
+            return replica
+
+    def verificar(self) -> None:
+        """Confere cada réplica e atualiza quais estão saudáveis."""
+        for replica in self.replicas:
+            erro, atraso = None, None
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                    atraso = _atraso_replicacao(conn)
+                if atraso is not None and atraso > self.max_lag_seconds:
+                    erro = f"atraso de replicação de {atraso:.0f}s"
+            except Exception as e:
+                erro = str(e).splitlines()[0] if str(e) else type(e).__name__
+
+            with self._lock:
+                if replica.saudavel != (erro is None):
+                    if erro is None:
+                        logger.info("Réplica %s voltou a responder", replica.nome)
+                    else:
+                        logger.warning("Réplica %s fora de rotação: %s", replica.nome, erro)
+                replica.saudavel = erro is None
+                replica.erro = erro
+                replica.atraso_s = atraso
+                replica.verificada_em = time.time()
+
+    def start(self) -> None:
+        """Verifica as réplicas agora e depois a cada ``check_interval``."""
+        if not self.enabled or self._thread is not None:
+            return
+        self.verificar()
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="replica-health", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._parar.wait(self.check_interval):
+            self.verificar()
+
+    def stop(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval + 1)
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replicas": [
+                    {
+                        "name": r.nome,
+                        "healthy": r.saudavel,
+                        "lag_s": r.atraso_s,
+                        "error": r.erro,
+                        "selected": r.selecoes,
+                        "checked_at": r.verificada_em,
+                        "pool": r.metrics.stats() if r.metrics else None,
+                    }
+                    for r in self.replicas
+                ],
+                "primary_fallbacks": self.primary_fallbacks,
+                "sticky_reads": self.sticky_reads,
+                "sticky_seconds": self.sticky_seconds,
+            }
+
+
+class ReadYourWritesMiddleware:
+    """Registra no ``ReplicaRouter`` as requisições de escrita bem-sucedidas."""
+
+    METODOS_LEITURA = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app, router: ReplicaRouter, chave) -> None:
+        self.app = app
+        self.router = router
+        self.chave = chave
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self.METODOS_LEITURA
+            or not self.router.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(message) -> None:
+            # Registra antes do corpo: a próxima leitura do cliente já vê a escrita
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.router.registrar_escrita(self.chave(Request(scope)))
+            await send(message)
+
+        await self.app(scope, receive, enviar)
+
+
+def _atraso_replicacao(conn) -> Optional[float]:
+    """Segundos de atraso da réplica MySQL (None em outros bancos)."""
+    if conn.dialect.name != "mysql":
+        return None
+    for comando, coluna in (
+        ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+        ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+    ):
+        try:
+            linha = conn.exec_driver_sql(comando).mappings().first()
+        except Exception:
+            continue
+        if linha is None:
+            return None
+        valor = linha.get(coluna)
+        # NULL: a replicação está parada
+        return float(valor) if valor is not None else float("inf")
+    return None
+
+
+__all__ = ["ReadYourWritesMiddleware", "Replica", "ReplicaRouter", "RoutingSession"]
@@ -1,12 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from models.user_model import User
 from schemas.user_schema import TokenData
-from core.config import SECRET_KEY, ALGORITHM
+from services.principal_cache import Principal, principal_cache
+from services.token_decoder import InvalidTokenError, token_decoder
 
 # Esquema OAuth2 para Bearer Token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
@@ -15,14 +15,15 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Função de dependência para obter o usuário atual a partir do token JWT.
 
     Esta função:
-    1. Decodifica o token JWT usando python-jose
-    2. Extrai o username do payload
-    3. Busca o usuário no banco de dados
+    1. Decodifica o token JWT (services/token_decoder, com cache dos
+       tokens já verificados)
+    2. Extrai o username e a versão do token (claim "ver") do payload
+    3. Busca o usuário no cache de principals ou, se ausente, no banco
     4. Retorna o usuário ou levanta uma exceção de credenciais inválidas
 
     Args:
@@ -30,7 +31,8 @@ def get_current_user(
         db (Session): Sessão do banco de dados injetada
 
     Returns:
-        User: Objeto do usuário autenticado
+        Principal: Usuário autenticado (id, username, role, is_active,
+            locked_until e token_version)
 
     Raises:
         HTTPException: 401 se as credenciais forem inválidas
@@ -45,39 +47,47 @@ def get_current_user(
 
     try:
         # Decodificar o token JWT
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_decoder.decode(token)
         username: str = payload.get("sub")
 
         if username is None:
             raise credentials_exception
 
         token_data = TokenData(username=username)
+        # Tokens emitidos antes da versão valem apenas para a versão 0
+        token_version = payload.get("ver", 0)
 
-    except JWTError:
+    except InvalidTokenError:
         raise credentials_exception
 
+    principal = principal_cache.get(token_data.username, token_version)
+    if principal is not None:
+        return principal
+
     # Buscar o usuário no banco de dados
     user = db.query(User).filter(User.username == token_data.username).first()
 
-    if user is None:
+    if user is None or (user.token_version or 0) != token_version:
         raise credentials_exception
 
-    return user
+    principal = Principal.of(user)
+    principal_cache.put(principal)
+    return principal
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Função de dependência para obter o usuário atual ativo.
 
     Esta função verifica se o usuário está ativo e não bloqueado.
 
     Args:
-        current_user (User): Usuário atual obtido via get_current_user
+        current_user (Principal): Usuário atual obtido via get_current_user
 
     Returns:
-        User: Usuário ativo autenticado
+        Principal: Usuário ativo autenticado
 
     Raises:
         HTTPException: 400 se o usuário estiver inativo ou bloqueado
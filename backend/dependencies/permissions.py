@@ -2,7 +2,8 @@
 Dependências para controle de permissões baseado em roles
 """
 from fastapi import Depends, HTTPException, status
-from models.user_model import User, UserRole
+from models.user_model import UserRole
+from services.principal_cache import Principal
 from dependencies.auth import get_current_active_user
 
 
@@ -19,7 +20,7 @@ def require_role(*allowed_roles: UserRole):
     Raises:
         HTTPException 403: Se o usuário não tiver permissão
     """
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    def role_checker(current_user: Principal = Depends(get_current_active_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Teste de carga das rotas async de clientes contra uma API em execução.
+
+Abre ``conexoes`` conexões simultâneas (padrão 200) e repete, durante
+``segundos``, a listagem e a busca de clientes. Mostra requisições por
+segundo, latências p50/p99 e erros. Para comparar a sessão assíncrona com
+a síncrona, suba a API com cada valor de DB_ASYNC_ENABLED e rode o teste
+contra as duas:
+
+    DB_ASYNC_ENABLED=true  uvicorn main:app --port 8000
+    DB_ASYNC_ENABLED=false uvicorn main:app --port 8001
+
+Uso:
+    python load_test_clients.py <usuario> <senha> [url] [conexoes] [segundos]
+
+    python load_test_clients.py admin 'Senha#2024'
+    python load_test_clients.py admin 'Senha#2024' http://localhost:8001 200 20
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+URL_PADRAO = "http://localhost:8000"
+CONEXOES_PADRAO = 200
+SEGUNDOS_PADRAO = 10
+ROTAS = (
+    ("/api/v1/clients/", {"limit": 20}),
+    ("/api/v1/clients/search", {"q": "a", "limit": 20}),
+)
+
+
+async def trabalhador(client: httpx.AsyncClient, fim: float, tempos: list, erros: list) -> None:
+    i = 0
+    while time.perf_counter() < fim:
+        rota, params = ROTAS[i % len(ROTAS)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            resposta = await client.get(rota, params=params)
+            if resposta.status_code != 200:
+                erros.append(resposta.status_code)
+                continue
+        except httpx.HTTPError as e:
+            erros.append(type(e).__name__)
+            continue
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+
+async def executar(usuario: str, senha: str, url: str, conexoes: int, segundos: float) -> int:
+    limites = httpx.Limits(max_connections=conexoes, max_keepalive_connections=conexoes)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as client:
+        login = await client.post(
+            "/api/v1/auth/token", data={"username": usuario, "password": senha}
+        )
+        if login.status_code != 200:
+            print(f"❌ Login falhou ({login.status_code}): {login.text}")
+            return 1
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        print(f"⏳ {conexoes} conexões por {segundos:.0f}s contra {url}")
+        tempos, erros = [], []
+        inicio = time.perf_counter()
+        fim = inicio + segundos
+        await asyncio.gather(
+            *(trabalhador(client, fim, tempos, erros) for _ in range(conexoes))
+        )
+        duracao = time.perf_counter() - inicio
+
+    if not tempos:
+        print(f"❌ Nenhuma requisição concluída ({len(erros)} erros)")
+        return 1
+    tempos.sort()
+    p99 = tempos[min(len(tempos) - 1, int(len(tempos) * 0.99))]
+    print(f"✓ Requisições:  {len(tempos)} ({len(tempos) / duracao:.1f} req/s)")
+    print(f"✓ Latência p50: {statistics.median(tempos):.1f} ms")
+    print(f"✓ Latência p99: {p99:.1f} ms")
+    if erros:
+        print(f"⚠️  Erros: {len(erros)} (ex.: {erros[0]})")
+    return 0
+
+
+def main() -> int:
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return 1
+    usuario, senha = sys.argv[1], sys.argv[2]
+    url = sys.argv[3] if len(sys.argv) > 3 else URL_PADRAO
+    conexoes = int(sys.argv[4]) if len(sys.argv) > 4 else CONEXOES_PADRAO
+    segundos = float(sys.argv[5]) if len(sys.argv) > 5 else SEGUNDOS_PADRAO
+    return asyncio.run(executar(usuario, senha, url, conexoes, segundos))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
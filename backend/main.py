@@ -3,8 +3,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from api.api import api_router
-from core.database import create_tables
-from core.config import ALLOWED_ORIGINS, IS_PRODUCTION
+from core.database import (
+    DB_POOL_WARMUP,
+    SessionLocal,
+    async_engine,
+    create_tables,
+    engine,
+    read_routing_key,
+    replica_router,
+    warm_up_async_pool,
+    warm_up_pool,
+)
+from core.query_counter import QueryCounterMiddleware
+from core.replicas import ReadYourWritesMiddleware
+from core.config import (
+    ALLOWED_ORIGINS,
+    AUDIT_ASYNC_ENABLED,
+    AVAILABILITY_INDEX_ENABLED,
+    IS_PRODUCTION,
+    LOOP_LAG_MONITOR_ENABLED,
+    QUERY_COUNTER_ENABLED,
+)
+from services.audit_writer import audit_writer
+from services.availability_index import availability_index
+from services import dashboard_counters, ocupacao_service
+from services.loop_monitor import loop_monitor
+from services.password_hasher import password_hasher
+from services.service_runner import service_executor
 
 
 @asynccontextmanager
@@ -15,8 +40,44 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Criar todas as tabelas no banco de dados
     create_tables()
+    # Startup: Preencher ocupacao_diaria e dashboard_counters em bancos
+    # anteriores a essas tabelas
+    with SessionLocal() as db:
+        ocupacao_service.popular_se_vazia(db)
+        dashboard_counters.popular_se_vazia(db)
+    # Startup: Abrir as conexões do pool antes das primeiras requisições
+    if DB_POOL_WARMUP:
+        warm_up_pool(engine)
+        if async_engine is not None:
+            await warm_up_async_pool(async_engine)
+    # Startup: Verificar as réplicas de leitura (READ_DATABASE_URLS)
+    replica_router.start()
+    # Startup: Carregar o índice de disponibilidade dos quartos
+    if AVAILABILITY_INDEX_ENABLED:
+        with SessionLocal() as db:
+            availability_index.load(db)
+    # Startup: Gravação da auditoria em lote, fora do caminho da requisição
+    if AUDIT_ASYNC_ENABLED:
+        audit_writer.start(engine)
+    # Startup: Processos para hash de senhas (bcrypt)
+    password_hasher.start()
+    # Startup: Registrar o código que bloqueia o event loop
+    if LOOP_LAG_MONITOR_ENABLED:
+        loop_monitor.start()
     yield
-    # Shutdown: Operações de limpeza (se necessário)
+    # Shutdown: Parar o monitor do event loop
+    await loop_monitor.stop()
+    # Shutdown: Gravar os registros de auditoria ainda na fila
+    audit_writer.stop()
+    password_hasher.shutdown()
+    service_executor.shutdown()
+    replica_router.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replica_router.replicas:
+        replica.engine.dispose()
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
 
 
 # Criar instância do FastAPI
@@ -38,6 +99,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Leituras logo após uma escrita do mesmo usuário vão para o primário
+app.add_middleware(
+    ReadYourWritesMiddleware, router=replica_router, chave=read_routing_key
+)
+
+# Consultas SQL por requisição no header Server-Timing (mais externo)
+if QUERY_COUNTER_ENABLED:
+    app.add_middleware(QueryCounterMiddleware)
+
 # Incluir rotas da API
 app.include_router(api_router, prefix="/api/v1")
 
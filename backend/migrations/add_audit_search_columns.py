@@ -0,0 +1,113 @@
+"""
+Script de migração para a busca de auditoria (GET /audit)
+
+Adiciona à tabela audit_logs as colunas extraídas de ``details``
+(client_id, quarto_id, reason), preenche-as nos registros existentes e cria
+os índices compostos declarados no modelo AuditLog. Os índices simples de
+user_id e action passam a ser prefixos dos compostos e são removidos.
+"""
+import json
+
+from sqlalchemy import select, text, update
+from core.database import engine
+from models.audit_log import AuditLog
+from services.audit_service import campos_indexados
+
+COLUNAS = {
+    "client_id": "INTEGER",
+    "quarto_id": "INTEGER",
+    "reason": "VARCHAR(50)",
+}
+
+INDICES_SUBSTITUIDOS = ("ix_audit_logs_user_id", "ix_audit_logs_action")
+
+LOTE = 1000
+
+
+def add_columns():
+    """Adiciona as colunas extraídas de details"""
+
+    with engine.begin() as conn:
+        for coluna, tipo in COLUNAS.items():
+            try:
+                conn.execute(text(f"ALTER TABLE audit_logs ADD COLUMN {coluna} {tipo}"))
+                print(f"✓ Coluna '{coluna}' adicionada")
+            except Exception as e:
+                print(f"Coluna '{coluna}' já existe ou erro: {e}")
+
+
+def backfill_columns():
+    """Preenche as colunas novas a partir de details, em lotes por id"""
+
+    ultimo_id = 0
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            linhas = conn.execute(
+                select(AuditLog.id, AuditLog.details)
+                .where(AuditLog.id > ultimo_id, AuditLog.details.is_not(None))
+                .order_by(AuditLog.id)
+                .limit(LOTE)
+            ).all()
+            if not linhas:
+                break
+            for registro_id, details in linhas:
+                try:
+                    valores = campos_indexados(json.loads(details))
+                except (ValueError, AttributeError):
+                    continue
+                if any(valor is not None for valor in valores.values()):
+                    conn.execute(
+                        update(AuditLog).where(AuditLog.id == registro_id).values(**valores)
+                    )
+                    total += 1
+            ultimo_id = linhas[-1].id
+    print(f"✓ {total} registro(s) preenchido(s)")
+
+
+def create_audit_indexes():
+    """Cria os índices declarados no modelo e remove os substituídos"""
+
+    with engine.begin() as conn:
+        for index in sorted(AuditLog.__table__.indexes, key=lambda i: i.name):
+            try:
+                index.create(bind=conn, checkfirst=True)
+                print(f"✓ Índice '{index.name}' disponível")
+            except Exception as e:
+                print(f"Índice '{index.name}' não criado: {e}")
+
+    for nome in INDICES_SUBSTITUIDOS:
+        comando = (
+            f"DROP INDEX {nome} ON audit_logs"
+            if engine.dialect.name == "mysql"
+            else f"DROP INDEX IF EXISTS {nome}"
+        )
+        with engine.begin() as conn:
+            try:
+                conn.execute(text(comando))
+                print(f"✓ Índice '{nome}' removido")
+            except Exception as e:
+                print(f"Índice '{nome}' não removido: {e}")
+
+
+def main():
+    """Executa todas as migrações"""
+    print("=== Iniciando migração da tabela 'audit_logs' ===\n")
+
+    print("1. Adicionando colunas...")
+    add_columns()
+    print()
+
+    print("2. Preenchendo colunas a partir de 'details'...")
+    backfill_columns()
+    print()
+
+    print("3. Criando índices compostos...")
+    create_audit_indexes()
+    print()
+
+    print("=== Migração concluída com sucesso! ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Script de migração para criar os índices compostos da tabela reservas
+e limitar o tamanho da coluna status
+
+Execute este script para atualizar bancos criados antes dos índices.
+"""
+from sqlalchemy import text
+from core.database import engine
+from models.reserva import Reserva, STATUS_MAX_LENGTH
+
+
+def create_reserva_indexes():
+    """Cria os índices declarados no modelo Reserva que ainda não existem"""
+
+    with engine.begin() as conn:
+        for index in sorted(Reserva.__table__.indexes, key=lambda i: i.name):
+            try:
+                index.create(bind=conn, checkfirst=True)
+                print(f"✓ Índice '{index.name}' disponível")
+            except Exception as e:
+                print(f"Índice '{index.name}' não criado: {e}")
+
+
+def limit_status_column():
+    """Converte reservas.status para VARCHAR limitado"""
+
+    if engine.dialect.name == "sqlite":
+        # SQLite não impõe tamanho em VARCHAR; nada a alterar
+        print("SQLite: coluna 'status' mantida")
+        return
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text(f"""
+                ALTER TABLE reservas
+                MODIFY status VARCHAR({STATUS_MAX_LENGTH}) NOT NULL DEFAULT 'pendente'
+            """))
+            print(f"✓ Coluna 'status' alterada para VARCHAR({STATUS_MAX_LENGTH})")
+        except Exception as e:
+            print(f"Coluna 'status' não alterada: {e}")
+
+
+def main():
+    """Executa todas as migrações"""
+    print("=== Iniciando migração da tabela 'reservas' ===\n")
+
+    print("1. Limitando coluna 'status'...")
+    limit_status_column()
+    print()
+
+    print("2. Criando índices compostos...")
+    create_reserva_indexes()
+    print()
+
+    print("=== Migração concluída com sucesso! ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Script de migração para adicionar a versão do token à tabela users
+
+A coluna token_version é incrementada ao trocar a senha; tokens JWT com
+outra versão (claim "ver") deixam de ser aceitos. Tokens emitidos antes da
+migração não têm a claim e valem como versão 0.
+"""
+from sqlalchemy import text
+from core.database import engine
+
+
+def add_token_version():
+    """Adiciona a coluna token_version"""
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0
+            """))
+            print("✓ Campo 'token_version' adicionado")
+        except Exception as e:
+            print(f"Campo 'token_version' já existe ou erro: {e}")
+
+
+def main():
+    """Executa todas as migrações"""
+    print("=== Iniciando migração da tabela 'users' ===\n")
+    add_token_version()
+    print()
+    print("=== Migração concluída com sucesso! ===")
+
+
+if __name__ == "__main__":
+    main()
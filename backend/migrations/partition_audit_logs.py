@@ -0,0 +1,86 @@
+"""
+Script de migração para particionar a tabela audit_logs por mês (MySQL)
+
+O MySQL exige que a coluna de particionamento faça parte da chave primária;
+por isso a chave passa a ser (id, timestamp). Cada mês fica em uma partição
+``pYYYYMM`` e os registros futuros em ``pmax``. O job de retenção
+(archive_audit_logs.py) cria as partições dos próximos meses e remove as
+partições arquivadas com DROP PARTITION.
+
+Em SQLite a tabela não é alterada: a retenção arquiva e remove por DELETE.
+"""
+from datetime import date
+
+from sqlalchemy import func, select, text
+from core.database import engine, SessionLocal
+from models.audit_log import AuditLog
+from services.audit_archive import definicao_particao, particoes_mysql
+
+
+def _proximo_mes(dia: date) -> date:
+    return date(dia.year + dia.month // 12, dia.month % 12 + 1, 1)
+
+
+def _meses(inicio: date, meses_futuros: int):
+    """Meses (YYYY-MM) do mês de inicio até meses_futuros após o atual"""
+    fim = date.today().replace(day=1)
+    for _ in range(meses_futuros):
+        fim = _proximo_mes(fim)
+    atual = inicio.replace(day=1)
+    while atual <= fim:
+        yield atual.strftime("%Y-%m")
+        atual = _proximo_mes(atual)
+
+
+def partition_audit_logs(meses_futuros: int = 2):
+    """Converte audit_logs em tabela particionada por mês"""
+
+    if engine.dialect.name != "mysql":
+        print(f"{engine.dialect.name}: particionamento nativo não suportado; tabela mantida")
+        return
+
+    db = SessionLocal()
+    try:
+        if particoes_mysql(db):
+            print("Tabela 'audit_logs' já está particionada")
+            return
+        mais_antigo = db.execute(select(func.min(AuditLog.timestamp))).scalar()
+    finally:
+        db.close()
+
+    inicio = mais_antigo.date() if mais_antigo else date.today()
+    particoes = [definicao_particao(mes) for mes in _meses(inicio, meses_futuros)]
+    particoes.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    with engine.begin() as conn:
+        try:
+            conn.execute(text("""
+                ALTER TABLE audit_logs
+                DROP PRIMARY KEY,
+                ADD PRIMARY KEY (id, timestamp)
+            """))
+            print("✓ Chave primária alterada para (id, timestamp)")
+        except Exception as e:
+            print(f"Chave primária não alterada: {e}")
+            return
+
+        try:
+            conn.execute(text(
+                "ALTER TABLE audit_logs PARTITION BY RANGE (TO_DAYS(timestamp)) ("
+                + ", ".join(particoes) + ")"
+            ))
+            print(f"✓ {len(particoes)} partições criadas")
+        except Exception as e:
+            print(f"Particionamento não aplicado: {e}")
+
+
+def main():
+    """Executa todas as migrações"""
+    print("=== Iniciando particionamento da tabela 'audit_logs' ===\n")
+    partition_audit_logs()
+    print()
+    print("=== Migração concluída! ===")
+
+
+if __name__ == "__main__":
+    main()
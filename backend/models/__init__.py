@@ -1,8 +1,10 @@
 # Pacote de modelos do hotel app
 
 from models.client_model import Client
+from models.dashboard_counter import DashboardCounter
+from models.ocupacao_diaria import OcupacaoDiaria
 from models.quarto import Quarto
 from models.reserva import Reserva
 from models.user_model import User
 
-__all__ = ["User", "Client", "Reserva", "Quarto"]
+__all__ = ["User", "Client", "Reserva", "Quarto", "OcupacaoDiaria", "DashboardCounter"]
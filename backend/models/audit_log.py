@@ -2,23 +2,38 @@
 Modelo de auditoria para log de ações do sistema
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Index, Integer, String, DateTime, Text
 from models.base import Base
 
 
 class AuditLog(Base):
     """Log de auditoria para rastrear ações dos usuários"""
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Filtros da busca (GET /audit), ordenados por data
+        Index("ix_audit_logs_resource_timestamp", "resource", "resource_id", "timestamp"),
+        Index("ix_audit_logs_user_timestamp", "user_id", "timestamp"),
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp"),
+        Index("ix_audit_logs_ip_timestamp", "ip_address", "timestamp"),
+        Index("ix_audit_logs_client_timestamp", "client_id", "timestamp"),
+        Index("ix_audit_logs_quarto_timestamp", "quarto_id", "timestamp"),
+        Index("ix_audit_logs_reason_timestamp", "reason", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=True, index=True)
-    action = Column(String(100), nullable=False, index=True)  # LOGIN, LOGOUT, CREATE_ROOM, etc
+    user_id = Column(Integer, nullable=True)
+    action = Column(String(100), nullable=False)  # LOGIN, LOGOUT, CREATE_ROOM, etc
     resource = Column(String(100), nullable=True)  # quartos, reservas, clientes, etc
     resource_id = Column(Integer, nullable=True)
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     details = Column(Text, nullable=True)  # JSON com detalhes adicionais
+
+    # Chaves de ``details`` copiadas na gravação para busca indexada
+    client_id = Column(Integer, nullable=True)
+    quarto_id = Column(Integer, nullable=True)
+    reason = Column(String(50), nullable=True)  # motivo de falha de login
     
     def __repr__(self):
         return f"<AuditLog {self.action} by user {self.user_id} at {self.timestamp}>"
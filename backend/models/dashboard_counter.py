@@ -0,0 +1,28 @@
+"""Modelo ORM dos contadores agregados do dashboard."""
+
+from __future__ import annotations
+
+from typing import ClassVar
+
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+
+class DashboardCounter(Base):
+    """Contador mantido incrementalmente pelas mutações dos serviços.
+
+    ``periodo`` é vazio para totais globais, ``YYYY-MM`` para acumulados
+    mensais e ``YYYY-MM-DD`` para acumulados diários; o formato ISO permite
+    somar intervalos com comparação de strings.
+    """
+
+    __tablename__: ClassVar[str] = "dashboard_counters"
+
+    nome: Mapped[str] = mapped_column(String(30), primary_key=True)
+    periodo: Mapped[str] = mapped_column(String(10), primary_key=True, default="")
+    valor: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+__all__ = ["DashboardCounter"]
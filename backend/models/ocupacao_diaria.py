@@ -0,0 +1,39 @@
+"""Modelo ORM da ocupação noite a noite dos quartos."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import ClassVar
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+from models.reserva import STATUS_MAX_LENGTH
+
+
+class OcupacaoDiaria(Base):
+    """Uma noite ocupada de um quarto por uma reserva não cancelada.
+
+    Tabela materializada a partir de ``reservas``: cada reserva ocupa as
+    noites ``[data_checkin, data_checkout)``. A chave primária
+    (quarto_id, noite) impede que duas reservas ocupem a mesma noite.
+    """
+
+    __tablename__: ClassVar[str] = "ocupacao_diaria"
+    __table_args__ = (
+        Index("ix_ocupacao_diaria_noite", "noite", "quarto_id"),
+        Index("ix_ocupacao_diaria_reserva_id", "reserva_id"),
+    )
+
+    quarto_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("quartos.id"), primary_key=True
+    )
+    noite: Mapped[date] = mapped_column(Date, primary_key=True)
+    reserva_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("reservas.id", ondelete="CASCADE"), nullable=False
+    )
+    status: Mapped[str] = mapped_column(String(STATUS_MAX_LENGTH), nullable=False)
+
+
+__all__ = ["OcupacaoDiaria"]
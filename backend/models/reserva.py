@@ -5,7 +5,16 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import ClassVar, Optional, TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from models.base import Base
@@ -14,17 +23,36 @@ if TYPE_CHECKING:
     from models.client_model import Client
     from models.quarto import Quarto
 
+STATUS_MAX_LENGTH = 20
+
 
 class Reserva(Base):
     """Representa a reserva de um quarto por um cliente."""
 
     __tablename__: ClassVar[str] = "reservas"
+    __table_args__ = (
+        # Sobreposição de períodos de um quarto (is_quarto_disponivel)
+        Index(
+            "ix_reservas_quarto_periodo",
+            "quarto_id",
+            "data_checkin",
+            "data_checkout",
+            "status",
+        ),
+        # Filtro por mês, calendário e ordenação por check-in
+        Index("ix_reservas_checkin_status", "data_checkin", "status"),
+        # Reservas ativas e quartos ocupados no dashboard
+        Index("ix_reservas_checkout_status", "data_checkout", "status"),
+        # Atividades recentes do dashboard
+        Index("ix_reservas_created_at", "created_at"),
+        Index("ix_reservas_client_id", "client_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     data_checkin: Mapped[date] = mapped_column(Date, nullable=False)
     data_checkout: Mapped[date] = mapped_column(Date, nullable=False)
     valor_total: Mapped[float] = mapped_column(Float, nullable=False)
-    status: Mapped[str] = mapped_column(String, default="pendente")
+    status: Mapped[str] = mapped_column(String(STATUS_MAX_LENGTH), default="pendente")
 
     quarto_id: Mapped[int] = mapped_column(
         ForeignKey("quartos.id"), nullable=False
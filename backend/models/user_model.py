@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import ClassVar, Optional
 
-from sqlalchemy import String, Boolean, DateTime, Enum as SQLEnum, Integer
+from sqlalchemy import String, Boolean, DateTime, Enum as SQLEnum, Integer, event, inspect
 from sqlalchemy.orm import Mapped, mapped_column
 
 from models.base import Base
@@ -41,6 +41,9 @@ class User(Base):
     # Segurança
     failed_login_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Incrementada ao trocar a senha, a role, is_active ou ao bloquear a conta;
+    # tokens com outra versão são recusados
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     
     # Auditoria
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -50,3 +53,23 @@ class User(Base):
 
     def __repr__(self):
         return f"<User {self.username} ({self.role.value})>"
+
+
+@event.listens_for(User, "before_update")
+def _revogar_tokens_ao_restringir(mapper, connection, user: User) -> None:
+    """Incrementa ``token_version`` quando role, is_active ou o bloqueio mudam.
+
+    Como na troca de senha, os tokens emitidos antes da mudança passam a ser
+    recusados: o usuário precisa de um novo login, que carrega a role e o
+    estado atuais. Desbloquear a conta não revoga tokens. ``UPDATE`` em lote
+    (``query.update``) não passa por aqui.
+    """
+    estado = inspect(user)
+    alterado = any(
+        estado.attrs[campo].history.has_changes() for campo in ("role", "is_active")
+    )
+    bloqueio = estado.attrs.locked_until.history
+    if bloqueio.has_changes() and user.locked_until is not None:
+        alterado = True
+    if alterado and not estado.attrs.token_version.history.has_changes():
+        user.token_version = (user.token_version or 0) + 1
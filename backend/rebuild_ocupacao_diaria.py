@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Script para reconstruir a tabela ocupacao_diaria a partir de reservas.
+
+A API já preenche a tabela ao iniciar quando ela está vazia. Use o script
+depois de importar reservas diretamente no banco ou se a ocupação diária
+divergir das reservas.
+
+Uso:
+    python rebuild_ocupacao_diaria.py
+"""
+import sys
+
+from core.database import SessionLocal, create_tables
+from services.ocupacao_service import rebuild_ocupacao_diaria
+
+
+def main() -> bool:
+    """Recria a tabela se necessário e repovoa todas as noites ocupadas."""
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        print("⏳ Reconstruindo a tabela 'ocupacao_diaria'...")
+        resultado = rebuild_ocupacao_diaria(db)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Falha na reconstrução: {e}")
+        return False
+    finally:
+        db.close()
+
+    print(f"📋 Reservas materializadas: {resultado['reservas']}")
+    print(f"🛏️  Noites ocupadas: {resultado['noites']}")
+
+    if resultado["conflitos"]:
+        print("⚠️  Reservas sobrepostas ignoradas (a reserva mais antiga fica com a noite):")
+        print(f"   {resultado['conflitos']}")
+        return False
+
+    print("✅ Tabela 'ocupacao_diaria' consistente com 'reservas'.")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Script para reconciliar a tabela dashboard_counters com contagens completas.
+
+Recalcula os totais de clientes e quartos, a receita por mês e os
+check-outs por dia a partir das tabelas de origem e lista as divergências.
+Com ``--corrigir``, regrava os contadores (use após importar dados
+diretamente no banco; na primeira implantação a API os grava ao iniciar).
+
+Uso:
+    python reconcile_dashboard_counters.py [--corrigir]
+"""
+import sys
+
+from core.database import SessionLocal, create_tables
+from services.dashboard_counters import reconciliar_contadores
+
+
+def main(corrigir: bool = False) -> bool:
+    """Compara os contadores e, se pedido, corrige as divergências."""
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        print("⏳ Reconciliando 'dashboard_counters'...")
+        resultado = reconciliar_contadores(db, corrigir=corrigir)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Falha na reconciliação: {e}")
+        return False
+    finally:
+        db.close()
+
+    if resultado["consistent"]:
+        print("✅ Contadores consistentes com as tabelas de origem.")
+        return True
+
+    print(f"⚠️  {len(resultado['divergencias'])} contador(es) divergente(s):")
+    for divergencia in resultado["divergencias"]:
+        periodo = divergencia["periodo"] or "-"
+        print(
+            f"   - {divergencia['nome']} [{periodo}]: "
+            f"esperado {divergencia['esperado']}, atual {divergencia['atual']}"
+        )
+
+    if corrigir:
+        print("✅ Contadores regravados a partir das contagens completas.")
+        return True
+    print("Execute novamente com --corrigir para regravar os contadores.")
+    return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(corrigir="--corrigir" in sys.argv[1:]) else 1)
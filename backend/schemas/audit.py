@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AuditLogEntry(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    resource: Optional[str] = None
+    resource_id: Optional[int] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    timestamp: datetime
+    details: Optional[str] = None
+    client_id: Optional[int] = None
+    quarto_id: Optional[int] = None
+    reason: Optional[str] = None
@@ -0,0 +1,14 @@
+"""Schemas Pydantic para respostas paginadas por cursor."""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de resultados com o cursor opaco da próxima página."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 """Schemas Pydantic para recursos de quartos."""
 
 from datetime import date
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict
 
@@ -62,3 +62,21 @@ class QuartoCalendar(BaseModel):
     ocupacao: List[QuartoCalendarDay]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class QuartoCalendarCompacto(BaseModel):
+    """Ocupação do quarto em segmentos de dias consecutivos iguais.
+
+    Cada segmento é ``[inicio, fim, status, reserva_id]``, com ``fim``
+    inclusivo. O dia do check-in é sempre um segmento próprio.
+    """
+
+    quarto_id: int
+    numero: str
+    tipo: str
+    status: str
+    capacidade: int
+    valor_diaria: float
+    periodo_inicio: date
+    periodo_fim: date
+    segmentos: List[Tuple[date, date, str, Optional[int]]]
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -23,7 +23,7 @@ class ReservaCreate(ReservaBase):
 class ReservaUpdate(BaseModel):
     data_checkin: Optional[date] = None
     data_checkout: Optional[date] = None
-    status: Optional[str] = None
+    status: Optional[str] = Field(default=None, max_length=20)
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -38,3 +38,28 @@ class Reserva(ReservaBase):
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class ReservaLoteCreate(BaseModel):
+    reservas: List[ReservaCreate] = Field(min_length=1, max_length=200)
+    parcial: bool = False
+
+
+class ReservaLoteFalha(BaseModel):
+    indice: int
+    quarto_id: int
+    status_code: int
+    detail: str
+
+
+class ReservaResumo(ReservaBase):
+    id: int
+    valor_total: float
+    status: str
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class ReservaLoteResultado(BaseModel):
+    criadas: List[ReservaResumo]
+    falhas: List[ReservaLoteFalha]
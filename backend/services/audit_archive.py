@@ -0,0 +1,379 @@
+"""Retenção da auditoria por mês, com arquivos compactados.
+
+A tabela ``audit_logs`` guarda apenas os meses recentes
+(``AUDIT_RETENTION_MONTHS``). Os meses anteriores são movidos para arquivos
+JSONL compactados em ``AUDIT_ARCHIVE_DIR``, um por mês
+(``audit_logs_YYYY-MM.jsonl.gz``), e removidos da tabela. Assim o tamanho da
+tabela, a profundidade dos índices e o custo de inserção ficam limitados.
+
+No MySQL, ``migrations/partition_audit_logs.py`` particiona a tabela por mês
+(RANGE sobre ``timestamp``); nesse caso um mês arquivado sai com
+``DROP PARTITION`` em vez de ``DELETE``, e ``garantir_particoes`` cria as
+partições dos próximos meses. Nos demais bancos a remoção é por ``DELETE``.
+
+``consultar_auditoria`` lê a tabela e, quando necessário, os meses
+arquivados, devolvendo os registros no mesmo formato. Os timestamps são
+gravados em UTC sem fuso; períodos com fuso são convertidos com
+``utc_sem_fuso`` antes da comparação.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from datetime import date, datetime, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from core.config import AUDIT_ARCHIVE_DIR, AUDIT_RETENTION_MONTHS
+from models.audit_log import AuditLog
+from services.audit_service import campos_indexados
+
+Registro = Dict[str, Any]
+
+COLUNAS = (
+    "id",
+    "user_id",
+    "action",
+    "resource",
+    "resource_id",
+    "ip_address",
+    "user_agent",
+    "timestamp",
+    "details",
+    "client_id",
+    "quarto_id",
+    "reason",
+)
+
+LOTE_EXPORTACAO = 5_000
+
+
+def _inicio_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def _somar_meses(dia: date, meses: int) -> date:
+    total = dia.year * 12 + dia.month - 1 + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def _mes(dia: date) -> str:
+    return dia.strftime("%Y-%m")
+
+
+def _limites(mes: str) -> Tuple[datetime, datetime]:
+    inicio = datetime.strptime(mes, "%Y-%m")
+    fim = datetime.combine(_somar_meses(inicio.date(), 1), datetime.min.time())
+    return inicio, fim
+
+
+def utc_sem_fuso(momento: Optional[datetime]) -> Optional[datetime]:
+    """Converte um datetime com fuso para UTC sem fuso, como na tabela."""
+    if momento is None or momento.tzinfo is None:
+        return momento
+    return momento.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _diretorio(diretorio: Optional[str]) -> Path:
+    return Path(diretorio or AUDIT_ARCHIVE_DIR)
+
+
+def caminho_arquivo(mes: str, diretorio: Optional[str] = None) -> Path:
+    """Caminho do arquivo compactado de um mês (``YYYY-MM``)."""
+    return _diretorio(diretorio) / f"audit_logs_{mes}.jsonl.gz"
+
+
+def meses_arquivados(diretorio: Optional[str] = None) -> List[str]:
+    """Meses (``YYYY-MM``) com arquivo, do mais antigo ao mais recente."""
+    pasta = _diretorio(diretorio)
+    if not pasta.is_dir():
+        return []
+    return sorted(
+        nome[len("audit_logs_"):-len(".jsonl.gz")]
+        for nome in os.listdir(pasta)
+        if nome.startswith("audit_logs_") and nome.endswith(".jsonl.gz")
+    )
+
+
+def _para_registro(linha) -> Registro:
+    return {coluna: getattr(linha, coluna) for coluna in COLUNAS}
+
+
+def _serializar(registro: Registro) -> str:
+    return json.dumps({**registro, "timestamp": registro["timestamp"].isoformat()})
+
+
+def ler_arquivo(mes: str, diretorio: Optional[str] = None) -> Iterator[Registro]:
+    """Lê os registros arquivados de um mês.
+
+    Um mês arquivado em mais de uma execução tem vários membros gzip no
+    mesmo arquivo; registros repetidos (mesmo ``id``) são lidos uma vez.
+    Arquivos anteriores às colunas extraídas de ``details`` têm essas
+    colunas preenchidas na leitura.
+    """
+    caminho = caminho_arquivo(mes, diretorio)
+    if not caminho.exists():
+        return
+    vistos = set()
+    with gzip.open(caminho, "rt", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if not linha.strip():
+                continue
+            registro = json.loads(linha)
+            if registro["id"] in vistos:
+                continue
+            vistos.add(registro["id"])
+            registro["timestamp"] = datetime.fromisoformat(registro["timestamp"])
+            if "reason" not in registro:
+                registro.update(
+                    campos_indexados(json.loads(registro["details"] or "{}"))
+                )
+            yield registro
+
+
+# ---------------------------------------------------------------------------
+# Partições nativas (MySQL)
+# ---------------------------------------------------------------------------
+
+def _nome_particao(mes: str) -> str:
+    return "p" + mes.replace("-", "")
+
+
+def particoes_mysql(db: Session) -> List[str]:
+    """Partições de ``audit_logs`` no MySQL; lista vazia se não particionada."""
+    if db.get_bind().dialect.name != "mysql":
+        return []
+    nomes = db.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' "
+            "AND PARTITION_NAME IS NOT NULL ORDER BY PARTITION_ORDINAL_POSITION"
+        )
+    ).scalars()
+    return list(nomes)
+
+
+def definicao_particao(mes: str) -> str:
+    """Cláusula ``PARTITION`` de um mês (registros até o início do seguinte)."""
+    _, fim = _limites(mes)
+    return (
+        f"PARTITION {_nome_particao(mes)} "
+        f"VALUES LESS THAN (TO_DAYS('{fim.date().isoformat()}'))"
+    )
+
+
+def garantir_particoes(
+    db: Session, hoje: Optional[date] = None, meses_futuros: int = 2
+) -> List[str]:
+    """Cria as partições do mês atual e dos próximos, separando-as de ``pmax``.
+
+    Returns:
+        list: Nomes das partições criadas (vazia fora do MySQL particionado).
+    """
+    existentes = particoes_mysql(db)
+    if not existentes:
+        return []
+    hoje = hoje or date.today()
+    novas = []
+    for deslocamento in range(meses_futuros + 1):
+        mes = _mes(_somar_meses(_inicio_mes(hoje), deslocamento))
+        if _nome_particao(mes) in existentes:
+            continue
+        db.execute(
+            text(
+                "ALTER TABLE audit_logs REORGANIZE PARTITION pmax INTO ("
+                f"{definicao_particao(mes)}, "
+                "PARTITION pmax VALUES LESS THAN MAXVALUE)"
+            )
+        )
+        existentes.append(_nome_particao(mes))
+        novas.append(_nome_particao(mes))
+    return novas
+
+
+# ---------------------------------------------------------------------------
+# Retenção
+# ---------------------------------------------------------------------------
+
+def arquivar_mes(db: Session, mes: str, diretorio: Optional[str] = None) -> int:
+    """Move os registros de um mês da tabela para o arquivo compactado.
+
+    O arquivo é gravado (e sincronizado em disco) antes da remoção na
+    tabela; se a remoção falhar, a próxima execução acrescenta os mesmos
+    registros e a leitura descarta as repetições.
+
+    Returns:
+        int: Quantidade de registros arquivados.
+    """
+    inicio, fim = _limites(mes)
+    no_mes = (AuditLog.timestamp >= inicio) & (AuditLog.timestamp < fim)
+    consulta = (
+        select(*(getattr(AuditLog, coluna) for coluna in COLUNAS))
+        .where(no_mes)
+        .order_by(AuditLog.id)
+    )
+
+    partes = db.execute(
+        consulta.execution_options(yield_per=LOTE_EXPORTACAO)
+    ).partitions()
+    primeira = next(partes, None)
+    if not primeira:
+        return 0
+
+    caminho = caminho_arquivo(mes, diretorio)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    with open(caminho, "ab") as bruto:
+        with gzip.open(bruto, "wt", encoding="utf-8") as arquivo:
+            for parte in chain([primeira], partes):
+                arquivo.write(
+                    "".join(
+                        _serializar(_para_registro(linha)) + "\n" for linha in parte
+                    )
+                )
+                total += len(parte)
+                maior_id = parte[-1].id
+        bruto.flush()
+        os.fsync(bruto.fileno())
+
+    if _nome_particao(mes) in particoes_mysql(db):
+        db.execute(text(f"ALTER TABLE audit_logs DROP PARTITION {_nome_particao(mes)}"))
+    else:
+        db.execute(delete(AuditLog).where(no_mes, AuditLog.id <= maior_id))
+    db.commit()
+    return total
+
+
+def aplicar_retencao(
+    db: Session,
+    hoje: Optional[date] = None,
+    meses: int = AUDIT_RETENTION_MONTHS,
+    diretorio: Optional[str] = None,
+) -> List[Tuple[str, int]]:
+    """Arquiva os meses anteriores aos ``meses`` mais recentes.
+
+    Com ``meses=3`` e ``hoje`` em abril, ficam na tabela fevereiro, março
+    e abril; janeiro e anteriores vão para arquivo.
+
+    Returns:
+        list: ``(mes, registros arquivados)`` de cada mês processado.
+    """
+    hoje = hoje or date.today()
+    corte = _somar_meses(_inicio_mes(hoje), -(meses - 1))
+    mais_antigo = db.execute(select(func.min(AuditLog.timestamp))).scalar()
+
+    arquivados = []
+    if mais_antigo is not None:
+        mes = _inicio_mes(mais_antigo.date())
+        while mes < corte:
+            arquivados.append((_mes(mes), arquivar_mes(db, _mes(mes), diretorio)))
+            mes = _somar_meses(mes, 1)
+
+    if garantir_particoes(db, hoje):
+        db.commit()
+    return arquivados
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+def _confere(registro: Registro, filtros: Dict[str, Any]) -> bool:
+    return all(registro.get(campo) == valor for campo, valor in filtros.items())
+
+
+def consultar_auditoria(
+    db: Session,
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    limit: int = 100,
+    antes: Optional[Tuple[datetime, int]] = None,
+    diretorio: Optional[str] = None,
+    **filtros: Any,
+) -> List[Registro]:
+    """Busca registros de auditoria na tabela e nos meses arquivados.
+
+    Args:
+        inicio: Início do período (inclusivo); com fuso, é convertido
+            para UTC.
+        fim: Fim do período (exclusivo), como ``inicio``.
+        limit: Quantidade máxima de registros.
+        antes: Chave ``(timestamp, id)`` do último registro da página
+            anterior; retorna apenas registros mais antigos (keyset).
+        filtros: Igualdade em colunas de ``audit_logs``
+            (``user_id``, ``action``, ``resource``, ``resource_id``...).
+
+    Returns:
+        list: Registros (dicts) do mais recente ao mais antigo.
+    """
+    desconhecidos = set(filtros) - set(COLUNAS)
+    if desconhecidos:
+        raise ValueError(f"Filtros inválidos: {', '.join(sorted(desconhecidos))}")
+    filtros = {campo: valor for campo, valor in filtros.items() if valor is not None}
+    inicio, fim = utc_sem_fuso(inicio), utc_sem_fuso(fim)
+    if antes is not None:
+        antes = (utc_sem_fuso(antes[0]), antes[1])
+
+    consulta = select(*(getattr(AuditLog, coluna) for coluna in COLUNAS))
+    if inicio is not None:
+        consulta = consulta.where(AuditLog.timestamp >= inicio)
+    if fim is not None:
+        consulta = consulta.where(AuditLog.timestamp < fim)
+    for campo, valor in filtros.items():
+        consulta = consulta.where(getattr(AuditLog, campo) == valor)
+    if antes is not None:
+        consulta = consulta.where(
+            or_(
+                AuditLog.timestamp < antes[0],
+                and_(AuditLog.timestamp == antes[0], AuditLog.id < antes[1]),
+            )
+        )
+    consulta = consulta.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+    registros = [
+        _para_registro(linha) for linha in db.execute(consulta.limit(limit))
+    ]
+    if len(registros) >= limit:
+        return registros
+
+    # Meses arquivados são sempre anteriores aos da tabela
+    for mes in reversed(meses_arquivados(diretorio)):
+        inicio_mes, fim_mes = _limites(mes)
+        if fim is not None and inicio_mes >= fim:
+            continue
+        if antes is not None and inicio_mes > antes[0]:
+            continue
+        if inicio is not None and fim_mes <= inicio:
+            break
+        do_mes = [
+            registro
+            for registro in ler_arquivo(mes, diretorio)
+            if (inicio is None or registro["timestamp"] >= inicio)
+            and (fim is None or registro["timestamp"] < fim)
+            and (antes is None or (registro["timestamp"], registro["id"]) < antes)
+            and _confere(registro, filtros)
+        ]
+        do_mes.sort(key=lambda r: (r["timestamp"], r["id"]), reverse=True)
+        registros.extend(do_mes[: limit - len(registros)])
+        if len(registros) >= limit:
+            break
+    return registros
+
+
+__all__ = [
+    "aplicar_retencao",
+    "arquivar_mes",
+    "caminho_arquivo",
+    "consultar_auditoria",
+    "definicao_particao",
+    "garantir_particoes",
+    "ler_arquivo",
+    "meses_arquivados",
+    "particoes_mysql",
+    "utc_sem_fuso",
+]
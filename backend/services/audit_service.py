@@ -7,6 +7,29 @@ from typing import Optional
 from sqlalchemy.orm import Session
 
 from models.audit_log import AuditLog
+from services.audit_writer import audit_writer
+
+REASON_MAX_LENGTH = 50
+
+
+def _inteiro(valor) -> Optional[int]:
+    return valor if isinstance(valor, int) and not isinstance(valor, bool) else None
+
+
+def campos_indexados(details: Optional[dict]) -> dict:
+    """
+    Extrai de ``details`` as chaves com coluna própria em audit_logs.
+
+    Assim a busca por cliente, quarto ou motivo de falha usa índices em vez
+    de varrer o JSON.
+    """
+    details = details or {}
+    reason = details.get("reason")
+    return {
+        "client_id": _inteiro(details.get("client_id")),
+        "quarto_id": _inteiro(details.get("quarto_id")),
+        "reason": str(reason)[:REASON_MAX_LENGTH] if reason is not None else None,
+    }
 
 
 class AuditService:
@@ -37,19 +60,26 @@ class AuditService:
             details: Informações adicionais em formato JSON
             
         Returns:
-            AuditLog: Registro de auditoria criado
+            AuditLog: Registro de auditoria criado. Com a gravação
+            assíncrona ativa, o registro é enfileirado e retornado sem ID.
         """
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action,
-            resource=resource,
-            resource_id=resource_id,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            details=json.dumps(details) if details else None,
-            timestamp=datetime.utcnow()
-        )
-        
+        registro = {
+            "user_id": user_id,
+            "action": action,
+            "resource": resource,
+            "resource_id": resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "details": json.dumps(details) if details else None,
+            "timestamp": datetime.utcnow(),
+            **campos_indexados(details),
+        }
+
+        if audit_writer.accepts(db.get_bind()):
+            audit_writer.enqueue(registro)
+            return AuditLog(**registro)
+
+        audit_log = AuditLog(**registro)
         db.add(audit_log)
         db.commit()
         db.refresh(audit_log)
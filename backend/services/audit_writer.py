@@ -0,0 +1,341 @@
+"""Gravação assíncrona e em lote dos registros de auditoria.
+
+As requisições apenas enfileiram o registro (fila limitada, em memória); uma
+thread de fundo agrupa os registros e grava com um único ``insert()`` a cada
+``batch_size`` registros ou ``flush_interval_ms`` milissegundos.
+
+Se o banco estiver indisponível, ou a fila estiver cheia, os registros vão
+para um arquivo local JSONL (somente acréscimo), reimportado no próximo
+``start()``. ``stop()`` esvazia a fila antes de encerrar a thread.
+
+Um lote recusado pelo banco é regravado registro a registro, para que um
+registro inválido não descarte os demais. Registros recusados e linhas
+ilegíveis do arquivo (uma linha truncada por uma queda durante a escrita,
+por exemplo) vão para ``<arquivo>.rejeitados`` e não são reimportados.
+
+Os workers do servidor compartilham o arquivo. A reimportação roda sob uma
+trava exclusiva entre processos (``<arquivo>.lock``); um worker que a
+encontra ocupada deixa a reimportação para quem a detém.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from contextlib import contextmanager, suppress
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: apenas a trava entre threads
+    fcntl = None
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from core.config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL_MS,
+    AUDIT_QUEUE_MAX_SIZE,
+    AUDIT_SPILL_PATH,
+)
+from core.database import canonical_bind
+from models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+Registro = Dict[str, Any]
+
+_PARAR = object()
+
+
+def _banco_indisponivel(erro: Exception) -> bool:
+    """Falhas do banco em si, e não do conteúdo do registro."""
+    return isinstance(erro, DBAPIError) and not isinstance(
+        erro, (IntegrityError, DataError)
+    )
+
+
+@contextmanager
+def _trava_exclusiva(caminho: str) -> Iterator[bool]:
+    """Trava ``caminho`` entre processos; ``False`` se outro já a detém."""
+    if fcntl is None:
+        yield True
+        return
+    with open(caminho, "a") as arquivo:
+        try:
+            fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+class AuditWriter:
+    """Fila de auditoria com gravação em lote por uma thread de fundo."""
+
+    def __init__(
+        self,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval_ms: float = AUDIT_FLUSH_INTERVAL_MS,
+        max_queue_size: int = AUDIT_QUEUE_MAX_SIZE,
+        spill_path: str = AUDIT_SPILL_PATH,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.spill_path = spill_path
+        self.rejected_path = f"{spill_path}.rejeitados"
+        self.lock_path = f"{spill_path}.lock"
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._engine: Optional[Engine] = None
+        self._spill_lock = threading.Lock()
+        self.written = 0
+        self.spilled = 0
+        self.rejected = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def accepts(self, bind) -> bool:
+        """Indica se registros de uma sessão com ``bind`` podem ir para a fila."""
+        return self.running and canonical_bind(bind) is self._engine
+
+    def start(self, engine: Engine) -> None:
+        """Inicia a thread de gravação e reimporta registros em arquivo."""
+        if self.running:
+            return
+        self._engine = engine
+        try:
+            self.replay_spill()
+        except OSError as e:
+            # O arquivo continua no disco para a próxima inicialização
+            logger.error("Auditoria em arquivo não reimportada: %s", e)
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Grava tudo o que estiver na fila e encerra a thread."""
+        if not self.running:
+            return
+        self._queue.put(_PARAR)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, registro: Registro) -> None:
+        """Enfileira um registro; com a fila cheia, grava direto no arquivo."""
+        try:
+            self._queue.put_nowait(registro)
+        except queue.Full:
+            self._spill([registro])
+
+    def flush(self) -> None:
+        """Bloqueia até que os registros já enfileirados sejam gravados."""
+        if self.running:
+            self._queue.join()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "spilled": self.spilled,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+    def _run(self) -> None:
+        parar = False
+        while not parar:
+            lote: List[Registro] = []
+            item = self._queue.get()
+            recebidos = 1
+            if item is _PARAR:
+                parar = True
+            else:
+                lote.append(item)
+                limite = time.monotonic() + self.flush_interval
+                while len(lote) < self.batch_size:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=restante)
+                    except queue.Empty:
+                        break
+                    recebidos += 1
+                    if item is _PARAR:
+                        parar = True
+                        break
+                    lote.append(item)
+
+            if parar:
+                # Esvazia o que ainda estiver na fila antes de encerrar
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    recebidos += 1
+                    if item is not _PARAR:
+                        lote.append(item)
+
+            try:
+                for inicio in range(0, len(lote), self.batch_size):
+                    self._write(lote[inicio:inicio + self.batch_size])
+            finally:
+                for _ in range(recebidos):
+                    self._queue.task_done()
+
+    def _write(self, lote: List[Registro]) -> None:
+        pendentes = self._inserir(lote)
+        if pendentes:
+            self._spill(pendentes)
+
+    def _inserir(self, registros: List[Registro]) -> List[Registro]:
+        """Grava ``registros`` e devolve os que devem voltar ao arquivo.
+
+        Tenta um único INSERT; se o banco recusar o lote, grava um a um e
+        manda os registros recusados para a quarentena. Com o banco
+        indisponível, os registros ainda não gravados são devolvidos.
+        """
+        if not registros:
+            return []
+        try:
+            with self._engine.begin() as conn:
+                conn.execute(insert(AuditLog), registros)
+            self.written += len(registros)
+            self.batches += 1
+            return []
+        except Exception as e:
+            if _banco_indisponivel(e):
+                logger.warning("Falha ao gravar auditoria no banco: %s", e)
+                return registros
+            logger.warning("Lote de auditoria recusado, gravando um a um: %s", e)
+
+        for posicao, registro in enumerate(registros):
+            try:
+                with self._engine.begin() as conn:
+                    conn.execute(insert(AuditLog), [registro])
+                self.written += 1
+            except Exception as e:
+                if _banco_indisponivel(e):
+                    logger.warning("Falha ao gravar auditoria no banco: %s", e)
+                    return registros[posicao:]
+                logger.warning("Registro de auditoria recusado: %s", e)
+                self._rejeitar(json.dumps(registro, default=str))
+        return []
+
+    def _spill(self, registros: List[Registro]) -> None:
+        linhas = "".join(
+            json.dumps(
+                {
+                    **registro,
+                    "timestamp": registro["timestamp"].isoformat(),
+                }
+            )
+            + "\n"
+            for registro in registros
+        )
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linhas)
+            self.spilled += len(registros)
+
+    def _rejeitar(self, linha: str) -> None:
+        with self._spill_lock:
+            with open(self.rejected_path, "a", encoding="utf-8") as arquivo:
+                arquivo.write(linha.rstrip("\n") + "\n")
+            self.rejected += 1
+
+    def _ler_registros(self, caminho: str) -> List[Registro]:
+        """Lê o arquivo linha a linha, separando as linhas ilegíveis."""
+        registros = []
+        with open(caminho, encoding="utf-8", errors="replace") as arquivo:
+            for linha in arquivo:
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                    registro["timestamp"] = datetime.fromisoformat(registro["timestamp"])
+                except (ValueError, TypeError, KeyError) as e:
+                    logger.warning("Linha ilegível no arquivo de auditoria: %s", e)
+                    self._rejeitar(linha)
+                    continue
+                registros.append(registro)
+        return registros
+
+    def replay_spill(self) -> Tuple[int, int]:
+        """Reimporta o arquivo de contingência para o banco.
+
+        Um ``.replay`` deixado por uma reimportação interrompida é
+        processado junto. Se outro processo estiver reimportando, nada é
+        feito.
+
+        Returns:
+            tuple: (registros reimportados, registros mantidos no arquivo)
+        """
+        with _trava_exclusiva(self.lock_path) as obtida:
+            if not obtida:
+                logger.info("Auditoria em arquivo já em reimportação por outro processo")
+                return 0, 0
+            return self._reimportar()
+
+    def _reimportar(self) -> Tuple[int, int]:
+        processando = f"{self.spill_path}.replay"
+        with self._spill_lock:
+            if os.path.exists(self.spill_path):
+                if os.path.exists(processando):
+                    # Renomeia antes de anexar: escritas de outros processos
+                    # vão para um arquivo novo, e não para o que será removido
+                    anexo = f"{processando}.{os.getpid()}"
+                    os.replace(self.spill_path, anexo)
+                    _anexar(anexo, processando)
+                    os.remove(anexo)
+                else:
+                    os.replace(self.spill_path, processando)
+            elif not os.path.exists(processando):
+                return 0, 0
+
+        registros = self._ler_registros(processando)
+        gravados = self.written
+        pendentes = self._inserir(registros)
+        if pendentes:
+            self._spill(pendentes)
+            self.spilled -= len(pendentes)
+        with suppress(FileNotFoundError):
+            os.remove(processando)
+        return self.written - gravados, len(pendentes)
+
+
+def _anexar(origem: str, destino: str) -> None:
+    """Acrescenta ``origem`` ao fim de ``destino``, em uma linha nova."""
+    with open(destino, "rb+") as saida:
+        saida.seek(0, os.SEEK_END)
+        if saida.tell():
+            saida.seek(-1, os.SEEK_END)
+            if saida.read(1) != b"\n":
+                saida.write(b"\n")
+        with open(origem, "rb") as entrada:
+            shutil.copyfileobj(entrada, saida)
+
+
+audit_writer = AuditWriter()
+
+
+__all__ = ["AuditWriter", "audit_writer"]
@@ -6,26 +6,50 @@ import secrets
 from datetime import datetime, timedelta
 from jose import jwt
 
-from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, BCRYPT_ROUNDS
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """
     Gera o hash da senha usando bcrypt.
 
     Args:
         password (str): Senha em texto plano
+        rounds (int): Custo do bcrypt (padrão: BCRYPT_ROUNDS)
 
     Returns:
         str: Senha hasheada
     """
     # Bcrypt limita senhas a 72 bytes
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Extrai o custo de um hash bcrypt ("$2b$12$...").
+
+    Returns:
+        Optional[int]: Custo do hash, ou None se o formato for desconhecido
+    """
+    partes = hashed_password.split('$')
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """
+    Indica se o hash foi gerado com custo diferente do configurado.
+
+    Hashes abaixo do alvo ficam fracos; acima do alvo deixam o login mais
+    lento que o orçamento. Em ambos os casos o login refaz o hash.
+    """
+    return get_hash_rounds(hashed_password) != rounds
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha em texto plano corresponde ao hash armazenado.
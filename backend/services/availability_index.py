@@ -0,0 +1,285 @@
+"""Índice em memória de disponibilidade dos quartos.
+
+Mantém, para cada quarto, os intervalos ``[data_checkin, data_checkout)``
+das reservas não canceladas em listas ordenadas. A consulta de sobreposição
+usa busca binária e responde sem ida ao banco de dados.
+
+Cada processo mantém o seu índice, atualizado apenas pelas gravações feitas
+nele mesmo. Por isso o índice só pode afirmar que um quarto está livre: uma
+sobreposição encontrada nele precisa ser confirmada no banco
+(``reserva_service.is_quarto_disponivel``).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.config import AVAILABILITY_INDEX_MAX_AGE_SECONDS
+from core.database import canonical_bind
+from models.reserva import Reserva
+
+Interval = Tuple[int, date, date]
+
+
+class _RoomIntervals:
+    """Intervalos de um quarto ordenados pela data de check-in."""
+
+    __slots__ = ("starts", "ends", "ids", "max_ends")
+
+    def __init__(self) -> None:
+        self.starts: List[date] = []
+        self.ends: List[date] = []
+        self.ids: List[int] = []
+        # max_ends[i] = maior data de checkout entre os intervalos 0..i
+        self.max_ends: List[date] = []
+
+    def _rebuild_max_ends(self, start: int) -> None:
+        del self.max_ends[start:]
+        current = self.max_ends[-1] if self.max_ends else None
+        for end in self.ends[start:]:
+            current = end if current is None or end > current else current
+            self.max_ends.append(current)
+
+    def add(self, reserva_id: int, checkin: date, checkout: date) -> None:
+        pos = bisect_left(self.starts, checkin)
+        self.starts.insert(pos, checkin)
+        self.ends.insert(pos, checkout)
+        self.ids.insert(pos, reserva_id)
+        self._rebuild_max_ends(pos)
+
+    def remove(self, reserva_id: int, checkin: date) -> None:
+        pos = bisect_left(self.starts, checkin)
+        while pos < len(self.starts) and self.starts[pos] == checkin:
+            if self.ids[pos] == reserva_id:
+                del self.starts[pos]
+                del self.ends[pos]
+                del self.ids[pos]
+                self._rebuild_max_ends(pos)
+                return
+            pos += 1
+
+    def overlaps(
+        self,
+        checkin: date,
+        checkout: date,
+        ignore_id: Optional[int] = None,
+    ) -> bool:
+        # Candidatos: intervalos que começam antes do checkout solicitado.
+        pos = bisect_left(self.starts, checkout) - 1
+        while pos >= 0 and self.max_ends[pos] > checkin:
+            if self.ends[pos] > checkin and self.ids[pos] != ignore_id:
+                return True
+            pos -= 1
+        return False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class IndexDiff:
+    """Diferenças entre o índice e a tabela ``reservas``."""
+
+    missing: List[int] = field(default_factory=list)
+    unexpected: List[int] = field(default_factory=list)
+    mismatched: List[int] = field(default_factory=list)
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.unexpected or self.mismatched)
+
+
+class AvailabilityIndex:
+    """Índice de disponibilidade por quarto carregado a partir do banco."""
+
+    def __init__(self, max_age_seconds: float = 0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._rooms: Dict[int, _RoomIntervals] = {}
+        self._by_id: Dict[int, Interval] = {}
+        self._bind = None
+        self._loaded_at: Optional[float] = None
+        self._stale = False
+
+    @staticmethod
+    def _load_intervals(db: Session) -> Dict[int, Interval]:
+        # Importação tardia para evitar ciclo com reserva_service
+        from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+        rows = db.query(
+            Reserva.id,
+            Reserva.quarto_id,
+            Reserva.data_checkin,
+            Reserva.data_checkout,
+        ).filter(
+            Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA]))
+        )
+        return {
+            reserva_id: (quarto_id, checkin, checkout)
+            for reserva_id, quarto_id, checkin, checkout in rows
+        }
+
+    def load(self, db: Session) -> None:
+        """Carrega (ou recarrega) o índice a partir da tabela ``reservas``."""
+        intervals = self._load_intervals(db)
+        rooms: Dict[int, _RoomIntervals] = {}
+        for reserva_id, (quarto_id, checkin, checkout) in sorted(
+            intervals.items(), key=lambda item: item[1][1]
+        ):
+            room = rooms.get(quarto_id)
+            if room is None:
+                room = rooms[quarto_id] = _RoomIntervals()
+            room.starts.append(checkin)
+            room.ends.append(checkout)
+            room.ids.append(reserva_id)
+        for room in rooms.values():
+            room._rebuild_max_ends(0)
+
+        with self._lock:
+            self._rooms = rooms
+            self._by_id = intervals
+            self._bind = canonical_bind(db.get_bind())
+            self._loaded_at = time.monotonic()
+            self._stale = False
+
+    def invalidate(self) -> None:
+        """Descarta o conteúdo do índice, forçando o uso do SQL."""
+        with self._lock:
+            self._rooms = {}
+            self._by_id = {}
+            self._bind = None
+            self._loaded_at = None
+            self._stale = False
+
+    def mark_stale(self) -> None:
+        """Força a recarga do índice no próximo ``is_ready``."""
+        with self._lock:
+            self._stale = True
+
+    def _is_bound_to(self, db: Session) -> bool:
+        return self._bind is not None and self._bind is canonical_bind(db.get_bind())
+
+    def _is_expired(self) -> bool:
+        if self._stale:
+            return True
+        if not self.max_age_seconds or self._loaded_at is None:
+            return False
+        return time.monotonic() - self._loaded_at > self.max_age_seconds
+
+    def is_ready(self, db: Session) -> bool:
+        """Indica se o índice pode responder consultas feitas com ``db``.
+
+        Um índice frio (nunca carregado ou carregado a partir de outro banco)
+        não responde, e o chamador deve usar a consulta SQL. Um índice
+        desatualizado é recarregado a partir da sessão informada.
+        """
+        with self._lock:
+            if not self._is_bound_to(db):
+                return False
+            if self._is_expired():
+                self.load(db)
+            return True
+
+    def is_available(
+        self,
+        quarto_id: int,
+        data_checkin: date,
+        data_checkout: date,
+        reserva_id_a_ignorar: Optional[int] = None,
+    ) -> bool:
+        """Verifica se não há reserva sobreposta ao período informado."""
+        with self._lock:
+            room = self._rooms.get(quarto_id)
+            if room is None:
+                return True
+            return not room.overlaps(
+                data_checkin, data_checkout, ignore_id=reserva_id_a_ignorar
+            )
+
+    def _remove_locked(self, reserva_id: int) -> None:
+        previous = self._by_id.pop(reserva_id, None)
+        if previous is None:
+            return
+        quarto_id, checkin, _ = previous
+        room = self._rooms.get(quarto_id)
+        if room is not None:
+            room.remove(reserva_id, checkin)
+            if not room:
+                del self._rooms[quarto_id]
+
+    def sync_reserva(self, db: Session, reserva: Reserva) -> None:
+        """Reflete no índice o estado já persistido de uma reserva."""
+        from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+        with self._lock:
+            if not self._is_bound_to(db):
+                return
+            try:
+                self._remove_locked(reserva.id)
+                if reserva.status not in STATUS_EQUIVALENTS[STATUS_CANCELADA]:
+                    interval = (
+                        reserva.quarto_id,
+                        reserva.data_checkin,
+                        reserva.data_checkout,
+                    )
+                    self._by_id[reserva.id] = interval
+                    room = self._rooms.get(reserva.quarto_id)
+                    if room is None:
+                        room = self._rooms[reserva.quarto_id] = _RoomIntervals()
+                    room.add(reserva.id, reserva.data_checkin, reserva.data_checkout)
+            except Exception:
+                self._stale = True
+                raise
+
+    def discard(self, db: Session, reserva_ids: Iterable[int]) -> None:
+        """Remove do índice reservas excluídas do banco."""
+        with self._lock:
+            if not self._is_bound_to(db):
+                return
+            for reserva_id in reserva_ids:
+                self._remove_locked(reserva_id)
+
+    def diff(self, db: Session) -> IndexDiff:
+        """Compara o conteúdo do índice com a tabela ``reservas``."""
+        expected = self._load_intervals(db)
+        with self._lock:
+            indexed = dict(self._by_id)
+
+        result = IndexDiff()
+        for reserva_id, interval in expected.items():
+            current = indexed.get(reserva_id)
+            if current is None:
+                result.missing.append(reserva_id)
+            elif current != interval:
+                result.mismatched.append(reserva_id)
+        result.unexpected = [
+            reserva_id for reserva_id in indexed if reserva_id not in expected
+        ]
+        result.missing.sort()
+        result.mismatched.sort()
+        result.unexpected.sort()
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self._bind is not None,
+                "stale": self._is_expired() if self._bind is not None else False,
+                "rooms": len(self._rooms),
+                "reservas": len(self._by_id),
+            }
+
+
+availability_index = AvailabilityIndex(
+    max_age_seconds=AVAILABILITY_INDEX_MAX_AGE_SECONDS
+)
+
+
+__all__ = ["AvailabilityIndex", "IndexDiff", "availability_index"]
@@ -0,0 +1,329 @@
+"""Motor do calendário de ocupação dos quartos.
+
+A ocupação do período é montada como uma grade quartos × dias de códigos
+inteiros (um ``bytearray`` por quarto), preenchida por atribuição de fatias
+a partir dos intervalos das reservas, sem percorrer noite a noite. A
+serialização para JSON também trabalha por fatias, sobre fragmentos de
+texto pré-calculados, sem instanciar um modelo pydantic por dia.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.quarto import Quarto
+from models.reserva import Reserva
+from schemas.quarto import QuartoCalendar, QuartoCalendarDay
+
+LIVRE = 0
+CHECKIN = 1
+OCUPADO = 2
+
+STATUS_DIA = ("livre", "checkin", "ocupado")
+
+# (id, quarto_id, data_checkin, data_checkout, status, client_id)
+ReservaLinha = Tuple[int, int, date, date, str, Optional[int]]
+# (primeiro dia, dia seguinte ao último, reserva), em offsets do período
+Colocacao = Tuple[int, int, ReservaLinha]
+# (primeiro dia, último dia, código, reserva_id), em offsets do período
+Segmento = Tuple[int, int, int, Optional[int]]
+
+
+_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+@dataclass
+class QuartoLinha:
+    """Dados do quarto exibidos no cabeçalho de cada linha do calendário."""
+
+    id: int
+    numero: str
+    tipo: str
+    status: str
+    capacidade: int
+    valor_diaria: float
+    codigos: bytearray = field(repr=False)
+    colocacoes: List[Colocacao] = field(default_factory=list, repr=False)
+    # Dias sem reserva com código diferente de LIVRE (status do quarto)
+    dias_sem_reserva_marcados: List[int] = field(default_factory=list, repr=False)
+
+    def reservas_por_dia(self) -> List[Optional[ReservaLinha]]:
+        """Reserva dona de cada dia do período (None nos dias livres)."""
+        donos: List[Optional[ReservaLinha]] = [None] * len(self.codigos)
+        for inicio, fim, reserva in self.colocacoes:
+            donos[inicio:fim] = [reserva] * (fim - inicio)
+        return donos
+
+    def _segmentos_por_dia(self) -> List[Segmento]:
+        """Agrupa dia a dia; usado só quando há reservas sobrepostas."""
+        segmentos: List[Segmento] = []
+        for offset, (codigo, reserva) in enumerate(
+            zip(self.codigos, self.reservas_por_dia())
+        ):
+            reserva_id = reserva[0] if reserva else None
+            if (
+                segmentos
+                and codigo != CHECKIN
+                and segmentos[-1][2:] == (codigo, reserva_id)
+            ):
+                segmentos[-1] = (segmentos[-1][0], offset, codigo, reserva_id)
+            else:
+                segmentos.append((offset, offset, codigo, reserva_id))
+        return segmentos
+
+    def _livres(self, inicio: int, fim: int) -> List[Segmento]:
+        """Segmentos dos dias sem reserva em [inicio, fim)."""
+        if inicio >= fim:
+            return []
+        if not self.dias_sem_reserva_marcados:
+            return [(inicio, fim - 1, LIVRE, None)]
+        segmentos: List[Segmento] = []
+        for offset in sorted(self.dias_sem_reserva_marcados):
+            if inicio <= offset < fim:
+                if offset > inicio:
+                    segmentos.append((inicio, offset - 1, LIVRE, None))
+                segmentos.append((offset, offset, self.codigos[offset], None))
+                inicio = offset + 1
+        if inicio < fim:
+            segmentos.append((inicio, fim - 1, LIVRE, None))
+        return segmentos
+
+    def segmentos(self) -> List[Segmento]:
+        """Dias consecutivos de mesmo status e reserva, sem expandir noites.
+
+        Os segmentos saem direto dos intervalos das reservas. O dia do
+        check-in forma um segmento próprio.
+        """
+        colocacoes = sorted(self.colocacoes, key=lambda colocacao: colocacao[0])
+        segmentos: List[Segmento] = []
+        cursor = 0
+        for inicio, fim, reserva in colocacoes:
+            if inicio < cursor:
+                # Dados legados com sobreposição: a grade decide o dono
+                return self._segmentos_por_dia()
+            segmentos.extend(self._livres(cursor, inicio))
+            if self.codigos[inicio] == CHECKIN:
+                segmentos.append((inicio, inicio, CHECKIN, reserva[0]))
+                inicio += 1
+            if inicio < fim:
+                segmentos.append((inicio, fim - 1, OCUPADO, reserva[0]))
+            cursor = fim
+        segmentos.extend(self._livres(cursor, len(self.codigos)))
+        return segmentos
+
+
+@dataclass
+class CalendarioGrid:
+    """Grade de ocupação de todos os quartos em [data_inicio, data_fim]."""
+
+    data_inicio: date
+    data_fim: date
+    quartos: List[QuartoLinha]
+
+    @property
+    def total_dias(self) -> int:
+        return (self.data_fim - self.data_inicio).days + 1
+
+    def _dias(self) -> List[date]:
+        return [
+            self.data_inicio + timedelta(days=offset)
+            for offset in range(self.total_dias)
+        ]
+
+    def _cabecalho(self, quarto: QuartoLinha) -> str:
+        """JSON do quarto sem o fechamento, pronto para receber a ocupação."""
+        return _json(
+            {
+                "quarto_id": quarto.id,
+                "numero": quarto.numero,
+                "tipo": quarto.tipo,
+                "status": quarto.status,
+                "capacidade": quarto.capacidade,
+                "valor_diaria": float(quarto.valor_diaria),
+                "periodo_inicio": self.data_inicio.isoformat(),
+                "periodo_fim": self.data_fim.isoformat(),
+            }
+        )[:-1]
+
+    def to_json(self) -> bytes:
+        """Serializa no mesmo formato de ``List[QuartoCalendar]``."""
+        prefixos = [f'{{"data":"{dia.isoformat()}","status":' for dia in self._dias()]
+        sem_reserva = [
+            f'"{status}","reserva_id":null,"reserva_status":null,"cliente_id":null}}'
+            for status in STATUS_DIA
+        ]
+        livres = [prefixo + sem_reserva[LIVRE] for prefixo in prefixos]
+        status_json: Dict[str, str] = {}
+
+        partes: List[str] = []
+        for quarto in self.quartos:
+            celulas = livres.copy()
+            # As colocações são reaplicadas na ordem da grade, então a
+            # última reserva sobre um dia prevalece, como em ``codigos``.
+            for inicio, fim, reserva in quarto.colocacoes:
+                reserva_status = status_json.get(reserva[4])
+                if reserva_status is None:
+                    reserva_status = status_json[reserva[4]] = _json(reserva[4])
+                cliente_id = "null" if reserva[5] is None else reserva[5]
+                fragmento = (
+                    f',"reserva_id":{reserva[0]},'
+                    f'"reserva_status":{reserva_status},'
+                    f'"cliente_id":{cliente_id}}}'
+                )
+                ocupado = f'"{STATUS_DIA[OCUPADO]}"{fragmento}'
+                celulas[inicio:fim] = [prefixo + ocupado for prefixo in prefixos[inicio:fim]]
+                if quarto.codigos[inicio] == CHECKIN:
+                    celulas[inicio] = f'{prefixos[inicio]}"{STATUS_DIA[CHECKIN]}"{fragmento}'
+            for offset in quarto.dias_sem_reserva_marcados:
+                celulas[offset] = prefixos[offset] + sem_reserva[quarto.codigos[offset]]
+            partes.append(
+                f'{self._cabecalho(quarto)},"ocupacao":[{",".join(celulas)}]}}'
+            )
+        return f"[{','.join(partes)}]".encode("utf-8")
+
+    def to_json_compacto(self) -> bytes:
+        """Serializa no formato de ``List[QuartoCalendarCompacto]``."""
+        dias = [f'"{dia.isoformat()}"' for dia in self._dias()]
+        status_json = [f'"{status}"' for status in STATUS_DIA]
+
+        partes: List[str] = []
+        for quarto in self.quartos:
+            segmentos = ",".join(
+                f"[{dias[inicio]},{dias[fim]},{status_json[codigo]},"
+                f"{'null' if reserva_id is None else reserva_id}]"
+                for inicio, fim, codigo, reserva_id in quarto.segmentos()
+            )
+            partes.append(f'{self._cabecalho(quarto)},"segmentos":[{segmentos}]}}')
+        return f"[{','.join(partes)}]".encode("utf-8")
+
+    def to_models(self) -> List[QuartoCalendar]:
+        """Converte a grade nos schemas pydantic (caminho lento, uso interno)."""
+        dias = self._dias()
+        calendario = []
+        for quarto in self.quartos:
+            ocupacao = []
+            for dia, codigo, reserva in zip(
+                dias, quarto.codigos, quarto.reservas_por_dia()
+            ):
+                if reserva is None:
+                    ocupacao.append(
+                        QuartoCalendarDay(data=dia, status=STATUS_DIA[codigo])
+                    )
+                else:
+                    ocupacao.append(
+                        QuartoCalendarDay(
+                            data=dia,
+                            status=STATUS_DIA[codigo],
+                            reserva_id=reserva[0],
+                            reserva_status=reserva[4],
+                            cliente_id=reserva[5],
+                        )
+                    )
+            calendario.append(
+                QuartoCalendar(
+                    quarto_id=quarto.id,
+                    numero=quarto.numero,
+                    tipo=quarto.tipo,
+                    status=quarto.status,
+                    capacidade=quarto.capacidade,
+                    valor_diaria=float(quarto.valor_diaria),
+                    periodo_inicio=self.data_inicio,
+                    periodo_fim=self.data_fim,
+                    ocupacao=ocupacao,
+                )
+            )
+        return calendario
+
+
+def montar_calendario(
+    db: Session,
+    data_inicio: date,
+    data_fim: date,
+    hoje: Optional[date] = None,
+) -> CalendarioGrid:
+    """Carrega quartos e reservas do período e preenche a grade.
+
+    Cada reserva ocupa as noites ``[data_checkin, data_checkout)``; o dia do
+    check-in recebe o código CHECKIN e os demais OCUPADO. Quartos marcados
+    como "ocupado" têm apenas o dia de hoje marcado, se estiver livre.
+    """
+    # Importação tardia para evitar ciclo com reserva_service
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    hoje = hoje or date.today()
+    total_dias = (data_fim - data_inicio).days + 1
+
+    quartos = [
+        QuartoLinha(
+            id=quarto_id,
+            numero=numero,
+            tipo=tipo,
+            status=quarto_status,
+            capacidade=capacidade,
+            valor_diaria=valor_diaria,
+            codigos=bytearray(total_dias),
+        )
+        for quarto_id, numero, tipo, quarto_status, capacidade, valor_diaria in (
+            db.query(
+                Quarto.id,
+                Quarto.numero,
+                Quarto.tipo,
+                Quarto.status,
+                Quarto.capacidade,
+                Quarto.valor_diaria,
+            )
+            .order_by(Quarto.numero)
+            .all()
+        )
+    ]
+    if not quartos:
+        return CalendarioGrid(data_inicio, data_fim, [])
+
+    por_id = {quarto.id: quarto for quarto in quartos}
+    reservas = (
+        db.query(
+            Reserva.id,
+            Reserva.quarto_id,
+            Reserva.data_checkin,
+            Reserva.data_checkout,
+            Reserva.status,
+            Reserva.client_id,
+        )
+        .filter(
+            Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])),
+            Reserva.data_checkin < data_fim + timedelta(days=1),
+            Reserva.data_checkout > data_inicio,
+        )
+        .all()
+    )
+
+    for reserva in reservas:
+        quarto = por_id.get(reserva[1])
+        if quarto is None:
+            continue
+        inicio = max((reserva[2] - data_inicio).days, 0)
+        fim = min((reserva[3] - data_inicio).days, total_dias)
+        noites = fim - inicio
+        if noites <= 0:
+            continue
+        quarto.codigos[inicio:fim] = bytes((OCUPADO,)) * noites
+        if reserva[2] >= data_inicio:
+            quarto.codigos[inicio] = CHECKIN
+        quarto.colocacoes.append((inicio, fim, tuple(reserva)))
+
+    offset_hoje = (hoje - data_inicio).days
+    if 0 <= offset_hoje < total_dias:
+        for quarto in quartos:
+            if quarto.status == "ocupado" and quarto.codigos[offset_hoje] == LIVRE:
+                quarto.codigos[offset_hoje] = OCUPADO
+                quarto.dias_sem_reserva_marcados.append(offset_hoje)
+
+    return CalendarioGrid(data_inicio, data_fim, quartos)
+
+
+__all__ = ["CalendarioGrid", "montar_calendario"]
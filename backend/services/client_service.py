@@ -2,12 +2,17 @@
 Serviços para gerenciamento de Clientes
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from models.client_model import Client
+from models.reserva import Reserva
 from schemas.client_schemas import ClientCreate, ClientUpdate
+from services import dashboard_counters, ocupacao_service
+from services.availability_index import availability_index
+from services.dashboard_cache import dashboard_cache
+from utils.pagination import decode_cursor, next_cursor
 
 
 class ClientService:
@@ -27,7 +32,10 @@ class ClientService:
                 address=client_data.address
             )
             db.add(db_client)
+            db.flush()
+            dashboard_counters.ajustar_clients(db, +1)
             db.commit()
+            dashboard_cache.invalidate()
             db.refresh(db_client)
             return db_client
         except IntegrityError:
@@ -66,6 +74,23 @@ class ClientService:
         """
         return db.query(Client).offset(skip).limit(limit).all()
 
+    @staticmethod
+    def get_clients_page(
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Client], Optional[str]]:
+        """
+        Lista clientes paginados por cursor na chave (id)
+        """
+        query = db.query(Client)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, (int,))
+            query = query.filter(Client.id > last_id)
+
+        clients = query.order_by(Client.id).limit(limit + 1).all()
+        return clients, next_cursor(clients, limit, lambda c: (c.id,))
+
     @staticmethod
     def update_client(
         db: Session,
@@ -86,6 +111,7 @@ class ClientService:
 
         try:
             db.commit()
+            dashboard_cache.invalidate()
             db.refresh(db_client)
             return db_client
         except IntegrityError:
@@ -101,8 +127,19 @@ class ClientService:
         if not db_client:
             return False
 
+        # As reservas do cliente são removidas em cascata
+        reserva_ids = [
+            reserva_id for (reserva_id,) in
+            db.query(Reserva.id).filter(Reserva.client_id == client_id)
+        ]
+
+        ocupacao_service.liberar_noites(db, reserva_ids)
+        dashboard_counters.remover_reservas(db, db_client.reservas)
+        dashboard_counters.ajustar_clients(db, -1)
         db.delete(db_client)
         db.commit()
+        dashboard_cache.invalidate()
+        availability_index.discard(db, reserva_ids)
         return True
 
     @staticmethod
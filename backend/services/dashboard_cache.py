@@ -0,0 +1,79 @@
+"""Cache em memória do resumo do dashboard.
+
+Guarda o último resumo calculado por data, com validade curta, para que
+várias abas consultando o dashboard não repitam as agregações. Os serviços
+que alteram clientes, quartos ou reservas chamam ``invalidate()`` após o
+commit. O cache é local ao processo: com vários workers, cada um mantém o
+seu e o TTL limita a defasagem entre eles.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Generic, Tuple, TypeVar
+
+from core.config import DASHBOARD_CACHE_TTL_SECONDS
+
+T = TypeVar("T")
+
+
+class DashboardCache(Generic[T]):
+    """Cache TTL chaveado pela data de referência do resumo."""
+
+    def __init__(self, ttl_seconds: float = DASHBOARD_CACHE_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[date, Tuple[float, T]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: date, compute: Callable[[], T]) -> T:
+        """Retorna o valor em cache para ``key`` ou calcula e guarda."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            # Uma invalidação durante o cálculo torna o valor suspeito
+            if self.ttl_seconds > 0 and generation == self._generation:
+                # Apenas a data corrente é consultada; descarta as antigas
+                self._entries = {key: (time.monotonic() + self.ttl_seconds, value)}
+        return value
+
+    def invalidate(self) -> None:
+        """Descarta os resumos em cache após uma alteração de dados."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+dashboard_cache: DashboardCache = DashboardCache()
+
+
+__all__ = ["DashboardCache", "dashboard_cache"]
@@ -0,0 +1,296 @@
+"""Contadores do dashboard mantidos incrementalmente (dashboard_counters).
+
+As mutações de ClientService, quarto_service e reserva_service chamam as
+funções daqui antes do commit, na mesma transação da alteração. Assim a
+leitura do dashboard não depende do tamanho das tabelas:
+
+- ``clients`` e ``quartos``: totais globais;
+- ``receita`` por mês de check-in (``YYYY-MM``): soma de ``valor_total``
+  das reservas não canceladas;
+- ``checkouts`` por dia (``YYYY-MM-DD``): reservas não canceladas com
+  check-out no dia. As reservas ativas de hoje são a soma dos dias a partir
+  de hoje, limitada ao horizonte de reservas futuras.
+
+Os quartos ocupados hoje vêm de ocupacao_diaria. ``reconciliar_contadores``
+compara tudo com contagens completas e, se pedido, regrava a tabela. Na
+inicialização da aplicação, ``popular_se_vazia`` preenche a tabela de
+bancos que já tinham dados antes dos contadores.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.client_model import Client
+from models.dashboard_counter import DashboardCounter
+from models.ocupacao_diaria import OcupacaoDiaria
+from models.quarto import Quarto
+from models.reserva import Reserva
+from schemas.dashboard import DashboardStats
+
+CLIENTS = "clients"
+QUARTOS = "quartos"
+RECEITA = "receita"
+CHECKOUTS = "checkouts"
+
+Chave = Tuple[str, str]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReservaSnapshot:
+    """Campos de uma reserva que afetam os contadores."""
+
+    data_checkin: date
+    data_checkout: date
+    valor_total: float
+    status: str
+
+    @classmethod
+    def of(cls, reserva: Reserva) -> "ReservaSnapshot":
+        return cls(
+            data_checkin=reserva.data_checkin,
+            data_checkout=reserva.data_checkout,
+            valor_total=reserva.valor_total or 0.0,
+            status=reserva.status,
+        )
+
+
+def _mes(dia: date) -> str:
+    return dia.strftime("%Y-%m")
+
+
+def _is_cancelada(status: str) -> bool:
+    # Importação tardia para evitar ciclo com reserva_service
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    return status in STATUS_EQUIVALENTS[STATUS_CANCELADA]
+
+
+def _upsert(db: Session, deltas: Dict[Chave, float]) -> None:
+    """Soma ``deltas`` aos contadores com um único INSERT ... ON CONFLICT."""
+    linhas = [
+        {"nome": nome, "periodo": periodo, "valor": valor}
+        for (nome, periodo), valor in deltas.items()
+        if valor
+    ]
+    if not linhas:
+        return
+
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(DashboardCounter).values(linhas)
+        stmt = stmt.on_duplicate_key_update(
+            valor=DashboardCounter.valor + stmt.inserted.valor
+        )
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = sqlite_insert(DashboardCounter).values(linhas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DashboardCounter.nome, DashboardCounter.periodo],
+            set_={"valor": DashboardCounter.valor + stmt.excluded.valor},
+        )
+    db.execute(stmt)
+
+
+def _deltas_reserva(
+    deltas: Dict[Chave, float], reserva: ReservaSnapshot, sinal: int
+) -> None:
+    if _is_cancelada(reserva.status):
+        return
+    deltas[(RECEITA, _mes(reserva.data_checkin))] += sinal * reserva.valor_total
+    deltas[(CHECKOUTS, reserva.data_checkout.isoformat())] += sinal
+
+
+def ajustar_clients(db: Session, delta: int) -> None:
+    _upsert(db, {(CLIENTS, ""): delta})
+
+
+def ajustar_quartos(db: Session, delta: int) -> None:
+    _upsert(db, {(QUARTOS, ""): delta})
+
+
+def registrar_reservas(db: Session, reservas: Iterable[Reserva]) -> None:
+    """Soma reservas novas aos contadores."""
+    deltas: Dict[Chave, float] = defaultdict(float)
+    for reserva in reservas:
+        _deltas_reserva(deltas, ReservaSnapshot.of(reserva), +1)
+    _upsert(db, deltas)
+
+
+def remover_reservas(db: Session, reservas: Iterable[Reserva]) -> None:
+    """Subtrai reservas excluídas dos contadores."""
+    deltas: Dict[Chave, float] = defaultdict(float)
+    for reserva in reservas:
+        _deltas_reserva(deltas, ReservaSnapshot.of(reserva), -1)
+    _upsert(db, deltas)
+
+
+def atualizar_reserva(
+    db: Session, anterior: ReservaSnapshot, reserva: Reserva
+) -> None:
+    """Aplica a diferença entre o estado anterior e o atual de uma reserva."""
+    atual = ReservaSnapshot.of(reserva)
+    if atual == anterior:
+        return
+    deltas: Dict[Chave, float] = defaultdict(float)
+    _deltas_reserva(deltas, anterior, -1)
+    _deltas_reserva(deltas, atual, +1)
+    _upsert(db, deltas)
+
+
+def ler_totais(db: Session, hoje: date) -> DashboardStats:
+    """Lê os totais do dashboard em consultas de custo fixo."""
+    valores = dict(
+        db.query(DashboardCounter.nome, DashboardCounter.valor)
+        .filter(
+            DashboardCounter.periodo.in_(("", _mes(hoje))),
+            DashboardCounter.nome.in_((CLIENTS, QUARTOS, RECEITA)),
+        )
+        .all()
+    )
+    active_reservas = (
+        db.query(func.coalesce(func.sum(DashboardCounter.valor), 0))
+        .filter(
+            DashboardCounter.nome == CHECKOUTS,
+            DashboardCounter.periodo >= hoje.isoformat(),
+        )
+        .scalar()
+    )
+    occupied_rooms = (
+        db.query(func.count())
+        .select_from(OcupacaoDiaria)
+        .filter(OcupacaoDiaria.noite == hoje)
+        .scalar()
+    )
+    return DashboardStats(
+        total_clients=int(valores.get(CLIENTS, 0)),
+        total_rooms=int(valores.get(QUARTOS, 0)),
+        active_reservas=int(active_reservas or 0),
+        occupied_rooms=occupied_rooms or 0,
+        monthly_revenue=float(valores.get(RECEITA, 0.0)),
+    )
+
+
+def _contagens_completas(db: Session) -> Dict[Chave, float]:
+    """Recalcula todos os contadores a partir das tabelas de origem."""
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    esperado: Dict[Chave, float] = defaultdict(float)
+    esperado[(CLIENTS, "")] = db.query(func.count(Client.id)).scalar() or 0
+    esperado[(QUARTOS, "")] = db.query(func.count(Quarto.id)).scalar() or 0
+
+    nao_cancelada = Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA]))
+    for checkin, valor in (
+        db.query(Reserva.data_checkin, func.sum(Reserva.valor_total))
+        .filter(nao_cancelada)
+        .group_by(Reserva.data_checkin)
+    ):
+        esperado[(RECEITA, _mes(checkin))] += valor or 0.0
+    for checkout, total in (
+        db.query(Reserva.data_checkout, func.count(Reserva.id))
+        .filter(nao_cancelada)
+        .group_by(Reserva.data_checkout)
+    ):
+        esperado[(CHECKOUTS, checkout.isoformat())] += total
+    return esperado
+
+
+def reconciliar_contadores(db: Session, corrigir: bool = False) -> Dict[str, object]:
+    """Compara os contadores com contagens completas.
+
+    Args:
+        corrigir: Se True, regrava a tabela com os valores recalculados.
+
+    Returns:
+        dict: ``consistent`` e a lista ``divergencias`` com
+        ``nome``, ``periodo``, ``esperado`` e ``atual``.
+    """
+    esperado = {
+        chave: valor for chave, valor in _contagens_completas(db).items() if valor
+    }
+    atual = {
+        (nome, periodo): valor
+        for nome, periodo, valor in db.query(
+            DashboardCounter.nome, DashboardCounter.periodo, DashboardCounter.valor
+        )
+        if valor
+    }
+
+    divergencias = []
+    for chave in sorted(esperado.keys() | atual.keys()):
+        valor_esperado = esperado.get(chave, 0)
+        valor_atual = atual.get(chave, 0)
+        if abs(valor_esperado - valor_atual) > 0.005:
+            divergencias.append(
+                {
+                    "nome": chave[0],
+                    "periodo": chave[1],
+                    "esperado": valor_esperado,
+                    "atual": valor_atual,
+                }
+            )
+
+    if corrigir and divergencias:
+        db.execute(delete(DashboardCounter))
+        if esperado:
+            db.execute(
+                insert(DashboardCounter),
+                [
+                    {"nome": nome, "periodo": periodo, "valor": valor}
+                    for (nome, periodo), valor in esperado.items()
+                ],
+            )
+        db.commit()
+
+    return {"consistent": not divergencias, "divergencias": divergencias}
+
+
+def popular_se_vazia(db: Session) -> Optional[Dict[str, object]]:
+    """Grava os contadores quando a tabela está vazia e há dados de origem.
+
+    Sem isso, um banco anterior aos contadores mostraria zero reservas
+    ativas e receita zero. Tabela já populada não é alterada.
+
+    Returns:
+        dict: O resultado de ``reconciliar_contadores``, ou None se nada
+        foi feito.
+    """
+    if db.query(DashboardCounter.nome).first() is not None:
+        return None
+    if all(
+        db.query(modelo.id).first() is None for modelo in (Client, Quarto, Reserva)
+    ):
+        return None
+
+    logger.warning("Tabela dashboard_counters vazia; recalculando os contadores")
+    try:
+        return reconciliar_contadores(db, corrigir=True)
+    except IntegrityError:
+        # Outro processo da aplicação gravou os contadores ao mesmo tempo
+        db.rollback()
+        return None
+
+
+__all__ = [
+    "ReservaSnapshot",
+    "ajustar_clients",
+    "ajustar_quartos",
+    "atualizar_reserva",
+    "ler_totais",
+    "popular_se_vazia",
+    "reconciliar_contadores",
+    "registrar_reservas",
+    "remover_reservas",
+]
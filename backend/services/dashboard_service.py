@@ -1,84 +1,49 @@
 from datetime import date, datetime
 
-from sqlalchemy import distinct, func
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 
+from models.audit_log import AuditLog
 from models.reserva import Reserva
 from models.client_model import Client
 from models.quarto import Quarto
 from schemas.dashboard import (
     DashboardActivity,
     DashboardResponse,
-    DashboardStats,
 )
+from services import dashboard_counters
+from services.dashboard_cache import dashboard_cache
 from services.reserva_service import (
     STATUS_ATIVA,
     STATUS_CANCELADA,
     STATUS_CONCLUIDA,
-    STATUS_EQUIVALENTS,
     STATUS_PENDENTE,
 )
 
 
-def _get_next_month_start(first_day: date) -> date:
-    if first_day.month == 12:
-        return date(first_day.year + 1, 1, 1)
-    return date(first_day.year, first_day.month + 1, 1)
-
-
 def get_dashboard_summary(db: Session) -> DashboardResponse:
+    """Retorna o resumo do dashboard, servido do cache quando válido."""
     today = date.today()
-    first_day = today.replace(day=1)
-    next_month = _get_next_month_start(first_day)
-
-    total_clients = db.query(func.count(Client.id)).scalar() or 0
-    total_rooms = db.query(func.count(Quarto.id)).scalar() or 0
-
-    active_reservas = (
-        db.query(func.count(Reserva.id))
-        .filter(
-            Reserva.status.notin_(
-                tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])
-            ),
-            Reserva.data_checkout >= today,
-        )
-        .scalar()
-        or 0
+    return dashboard_cache.get_or_compute(
+        today, lambda: _build_dashboard_summary(db, today)
     )
 
-    occupied_rooms = (
-        db.query(func.count(distinct(Reserva.quarto_id)))
-        .filter(
-            Reserva.status.notin_(
-                tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])
-            ),
-            Reserva.data_checkin <= today,
-            Reserva.data_checkout > today,
-        )
-        .scalar()
-        or 0
-    )
 
-    monthly_revenue = (
-        db.query(func.coalesce(func.sum(Reserva.valor_total), 0.0))
-        .filter(
-            Reserva.status.notin_(
-                tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])
-            ),
-            Reserva.data_checkin >= first_day,
-            Reserva.data_checkin < next_month,
-        )
-        .scalar()
-        or 0.0
-    )
+def _build_dashboard_summary(db: Session, today: date) -> DashboardResponse:
+    stats = dashboard_counters.ler_totais(db, today)
 
+    # Nomes do cliente e do quarto vêm no mesmo SELECT, sem carregar relações
     recent_reservas = (
-        db.query(Reserva)
-        .order_by(Reserva.created_at.desc())
-        .options(
-            selectinload(Reserva.client),
-            selectinload(Reserva.quarto),
+        db.query(
+            Reserva.id,
+            Reserva.status,
+            Reserva.created_at,
+            Reserva.data_checkin,
+            Client.name.label("client_name"),
+            Quarto.numero.label("room_number"),
         )
+        .outerjoin(Client, Reserva.client_id == Client.id)
+        .outerjoin(Quarto, Reserva.quarto_id == Quarto.id)
+        .order_by(Reserva.created_at.desc())
         .limit(10)
         .all()
     )
@@ -101,8 +66,8 @@ def get_dashboard_summary(db: Session) -> DashboardResponse:
             else "reserva_confirmada"
         )
 
-        client_name = reserva.client.name if reserva.client else None
-        room_number = reserva.quarto.numero if reserva.quarto else None
+        client_name = reserva.client_name
+        room_number = reserva.room_number
 
         details = []
         if client_name:
@@ -135,13 +100,26 @@ def get_dashboard_summary(db: Session) -> DashboardResponse:
             )
         )
 
-    return DashboardResponse(
-        stats=DashboardStats(
-            total_clients=total_clients,
-            active_reservas=active_reservas,
-            occupied_rooms=occupied_rooms,
-            total_rooms=total_rooms,
-            monthly_revenue=float(monthly_revenue),
-        ),
-        recent_activities=activities,
+    return DashboardResponse(stats=stats, recent_activities=activities)
+
+
+def get_recent_activities(db: Session, limit: int = 10) -> list:
+    """Retorna os últimos registros de auditoria, do mais recente ao mais antigo."""
+    activities = (
+        db.query(AuditLog)
+        .order_by(AuditLog.timestamp.desc())
+        .limit(limit)
+        .all()
     )
+    return [
+        {
+            "id": activity.id,
+            "action": activity.action,
+            "user_id": activity.user_id,
+            "resource": activity.resource,
+            "timestamp": activity.timestamp.isoformat(),
+            "ip_address": activity.ip_address,
+            "details": activity.details,
+        }
+        for activity in activities
+    ]
@@ -0,0 +1,130 @@
+"""Monitor de bloqueios do event loop.
+
+Uma rota ``async def`` que faz I/O síncrono (consulta ao banco, bcrypt)
+bloqueia a única thread do loop e atrasa todas as outras requisições do
+worker. ``LoopLagMonitor`` agenda um batimento no loop a cada
+``threshold/2`` e mede o atraso com que ele acorda; atrasos acima de
+``LOOP_LAG_THRESHOLD_MS`` são registrados no log.
+
+O atraso só é medido depois que o loop volta a rodar. Para identificar o
+culpado, uma thread de vigia confere o último batimento e, se o loop está
+parado há mais que o limite, registra a pilha atual da thread do loop (uma
+vez por bloqueio).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from core.config import LOOP_LAG_THRESHOLD_MS
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Mede o atraso do event loop e registra a pilha dos bloqueios."""
+
+    def __init__(self, threshold_ms: float = LOOP_LAG_THRESHOLD_MS) -> None:
+        self.threshold = threshold_ms / 1000
+        self.interval = max(0.01, self.threshold / 2)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._ultimo_batimento = 0.0
+        self._bloqueio_registrado = False
+        self.reset_stats()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Inicia o monitor no loop em execução (chamar de dentro do loop)."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._ultimo_batimento = time.monotonic()
+        self._parar.clear()
+        self._task = asyncio.get_running_loop().create_task(self._batimentos())
+        self._watchdog = threading.Thread(
+            target=self._vigiar, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._parar.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _batimentos(self) -> None:
+        while True:
+            esperado = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            agora = time.monotonic()
+            atraso = max(0.0, agora - esperado)
+            with self._lock:
+                self._ultimo_batimento = agora
+                self._bloqueio_registrado = False
+                self.checks += 1
+                self.last_lag = atraso
+                self.max_lag = max(self.max_lag, atraso)
+                if atraso > self.threshold:
+                    self.lag_events += 1
+            if atraso > self.threshold:
+                logger.warning("Event loop bloqueado por %.0f ms", atraso * 1000)
+
+    def _vigiar(self) -> None:
+        while not self._parar.wait(self.interval):
+            with self._lock:
+                parado = time.monotonic() - self._ultimo_batimento
+                # O batimento está atrasado além do limite
+                if parado <= self.interval + self.threshold or self._bloqueio_registrado:
+                    continue
+                self._bloqueio_registrado = True
+                self.stacks_captured += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            pilha = "".join(traceback.format_stack(frame)) if frame else "?"
+            logger.warning(
+                "Event loop parado há %.0f ms em:\n%s", parado * 1000, pilha
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "threshold_ms": self.threshold * 1000,
+                "checks": self.checks,
+                "lag_events": self.lag_events,
+                "stacks_captured": self.stacks_captured,
+                "last_lag_ms": self.last_lag * 1000,
+                "max_lag_ms": self.max_lag * 1000,
+            }
+
+    def reset_stats(self) -> None:
+        self.checks = 0
+        self.lag_events = 0
+        self.stacks_captured = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+
+loop_monitor = LoopLagMonitor()
+
+
+__all__ = ["LoopLagMonitor", "loop_monitor"]
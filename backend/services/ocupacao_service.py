@@ -0,0 +1,204 @@
+"""Manutenção da tabela materializada de ocupação diária (ocupacao_diaria).
+
+As funções daqui são chamadas pelas mutações de reserva_service dentro da
+mesma transação da reserva, antes do commit, mantendo a tabela sempre
+consistente com ``reservas``.
+
+Bancos criados antes da tabela têm reservas e nenhuma noite; a
+inicialização da aplicação chama ``popular_se_vazia`` para preenchê-la.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.ocupacao_diaria import OcupacaoDiaria
+from models.reserva import Reserva
+
+REBUILD_BATCH_SIZE = 5000
+
+logger = logging.getLogger(__name__)
+
+
+def _noites(data_checkin: date, data_checkout: date) -> Iterator[date]:
+    noite = data_checkin
+    while noite < data_checkout:
+        yield noite
+        noite += timedelta(days=1)
+
+
+def _linhas(reserva: Reserva) -> List[dict]:
+    return [
+        {
+            "quarto_id": reserva.quarto_id,
+            "noite": noite,
+            "reserva_id": reserva.id,
+            "status": reserva.status,
+        }
+        for noite in _noites(reserva.data_checkin, reserva.data_checkout)
+    ]
+
+
+def _is_cancelada(reserva: Reserva) -> bool:
+    # Importação tardia para evitar ciclo com reserva_service
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    return reserva.status in STATUS_EQUIVALENTS[STATUS_CANCELADA]
+
+
+def ocupar_noites(db: Session, reservas: Iterable[Reserva]) -> None:
+    """Insere as noites das reservas informadas (já com ID atribuído).
+
+    Raises:
+        IntegrityError: se alguma noite já estiver ocupada no quarto.
+    """
+    linhas = [
+        linha
+        for reserva in reservas
+        if not _is_cancelada(reserva)
+        for linha in _linhas(reserva)
+    ]
+    if linhas:
+        db.execute(insert(OcupacaoDiaria), linhas)
+
+
+def liberar_noites(db: Session, reserva_ids: Iterable[int]) -> None:
+    """Remove as noites ocupadas pelas reservas informadas."""
+    ids = list(reserva_ids)
+    if ids:
+        db.execute(
+            delete(OcupacaoDiaria).where(OcupacaoDiaria.reserva_id.in_(ids))
+        )
+
+
+def atualizar_status(db: Session, reserva: Reserva) -> None:
+    """Propaga uma mudança de status que não libera as noites."""
+    db.execute(
+        update(OcupacaoDiaria)
+        .where(OcupacaoDiaria.reserva_id == reserva.id)
+        .values(status=reserva.status)
+    )
+
+
+def sincronizar_reserva(db: Session, reserva: Reserva) -> None:
+    """Regrava as noites de uma reserva após mudança de datas ou status."""
+    liberar_noites(db, [reserva.id])
+    ocupar_noites(db, [reserva])
+
+
+def rebuild_ocupacao_diaria(db: Session) -> Dict[str, object]:
+    """Reconstrói toda a tabela a partir de ``reservas``.
+
+    Reservas que se sobrepõem a outra já registrada (dados legados) não
+    são inseridas; a primeira reserva por ID fica com a noite.
+
+    Returns:
+        dict: Totais de reservas, noites e IDs das reservas em conflito.
+    """
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    db.execute(delete(OcupacaoDiaria))
+
+    reservas = (
+        db.query(
+            Reserva.id,
+            Reserva.quarto_id,
+            Reserva.data_checkin,
+            Reserva.data_checkout,
+            Reserva.status,
+        )
+        .filter(Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])))
+        .order_by(Reserva.id)
+        .all()
+    )
+
+    ocupadas = set()
+    conflitos: List[int] = []
+    lote: List[dict] = []
+    total_reservas = 0
+    total_noites = 0
+
+    for reserva_id, quarto_id, checkin, checkout, status in reservas:
+        noites = list(_noites(checkin, checkout))
+        if any((quarto_id, noite) in ocupadas for noite in noites):
+            conflitos.append(reserva_id)
+            continue
+
+        total_reservas += 1
+        for noite in noites:
+            ocupadas.add((quarto_id, noite))
+            lote.append(
+                {
+                    "quarto_id": quarto_id,
+                    "noite": noite,
+                    "reserva_id": reserva_id,
+                    "status": status,
+                }
+            )
+        if len(lote) >= REBUILD_BATCH_SIZE:
+            db.execute(insert(OcupacaoDiaria), lote)
+            total_noites += len(lote)
+            lote = []
+
+    if lote:
+        db.execute(insert(OcupacaoDiaria), lote)
+        total_noites += len(lote)
+
+    db.commit()
+    return {
+        "reservas": total_reservas,
+        "noites": total_noites,
+        "conflitos": conflitos,
+    }
+
+
+def popular_se_vazia(db: Session) -> Optional[Dict[str, object]]:
+    """Reconstrói a tabela quando ela está vazia e há reservas ativas.
+
+    Sem isso, um banco anterior à tabela listaria quartos reservados como
+    livres. Tabela já populada (ou sem reservas ativas) não é alterada.
+
+    Returns:
+        dict: O resultado de ``rebuild_ocupacao_diaria``, ou None se nada
+        foi feito.
+    """
+    from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+
+    if db.query(OcupacaoDiaria.quarto_id).first() is not None:
+        return None
+    ativa = (
+        db.query(Reserva.id)
+        .filter(Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])))
+        .first()
+    )
+    if ativa is None:
+        return None
+
+    logger.warning("Tabela ocupacao_diaria vazia; reconstruindo a partir de reservas")
+    try:
+        resultado = rebuild_ocupacao_diaria(db)
+    except IntegrityError:
+        # Outro processo da aplicação populou a tabela ao mesmo tempo
+        db.rollback()
+        return None
+    if resultado["conflitos"]:
+        logger.warning(
+            "Reservas sobrepostas fora de ocupacao_diaria: %s", resultado["conflitos"]
+        )
+    return resultado
+
+
+__all__ = [
+    "atualizar_status",
+    "liberar_noites",
+    "ocupar_noites",
+    "popular_se_vazia",
+    "rebuild_ocupacao_diaria",
+    "sincronizar_reserva",
+]
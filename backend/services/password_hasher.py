@@ -0,0 +1,180 @@
+"""Hash e verificação de senhas (bcrypt) fora das threads de requisição.
+
+bcrypt consome CPU por centenas de milissegundos por chamada. Executado
+dentro dos handlers, um pico de logins ocupa todas as threads do servidor
+e atrasa os demais endpoints. Aqui as chamadas vão para um
+``ProcessPoolExecutor`` dedicado, com ``PASSWORD_HASH_WORKERS`` processos e
+no máximo ``PASSWORD_HASH_MAX_PENDING`` chamadas aguardando; acima disso a
+chamada falha com ``PasswordHasherBusy`` (HTTP 503 nos endpoints).
+
+Com ``PASSWORD_HASH_WORKERS=0`` as chamadas usam o executor padrão do loop
+(threads), útil em testes e em ambientes sem ``multiprocessing``.
+
+``rehash_password`` refaz, após um login bem-sucedido, hashes gerados com
+custo diferente de ``BCRYPT_ROUNDS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from core.config import PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WORKERS
+from models.user_model import User
+from services import auth_service
+from services.service_runner import service_executor
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """A fila do pool de hash de senhas está cheia."""
+
+
+def _executar(funcao: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    """Executa ``funcao`` no processo de trabalho e mede início e duração."""
+    inicio = time.time()
+    resultado = funcao(*args)
+    return resultado, inicio, time.time() - inicio
+
+
+class PasswordHasher:
+    """Pool limitado para ``get_password_hash`` e ``verify_password``."""
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._em_andamento = 0
+        self.reset_stats()
+
+    def start(self) -> None:
+        """Cria o pool de processos (uma vez)."""
+        if self._executor is None and self.workers > 0:
+            # "spawn" evita herdar locks das threads já em execução
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(auth_service.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(
+            auth_service.verify_password, plain_password, hashed_password
+        )
+
+    async def _submit(self, funcao: Callable[..., Any], *args: Any) -> Any:
+        capacidade = max(self.workers, 1) + self.max_pending
+        if self._em_andamento >= capacidade:
+            self.rejected += 1
+            raise PasswordHasherBusy(
+                f"{self._em_andamento} chamadas de hash em andamento"
+            )
+
+        self.start()
+        self._em_andamento += 1
+        self.submitted += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._em_andamento)
+        enviado = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            resultado, inicio, duracao = await loop.run_in_executor(
+                self._executor, _executar, funcao, *args
+            )
+        finally:
+            self._em_andamento -= 1
+
+        espera = max(0.0, inicio - enviado)
+        self.completed += 1
+        self._espera_total += espera
+        self._execucao_total += duracao
+        self.max_wait = max(self.max_wait, espera)
+        return resultado
+
+    def stats(self) -> dict:
+        concluidas = self.completed or None
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._em_andamento,
+            "queued": max(0, self._em_andamento - max(self.workers, 1)),
+            "peak_in_flight": self.peak_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": concluidas and self._espera_total / concluidas * 1000,
+            "max_wait_ms": self.max_wait * 1000,
+            "avg_run_ms": concluidas and self._execucao_total / concluidas * 1000,
+        }
+
+    def reset_stats(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_in_flight = self._em_andamento
+        self.max_wait = 0.0
+        self._espera_total = 0.0
+        self._execucao_total = 0.0
+
+
+password_hasher = PasswordHasher()
+
+
+async def rehash_password(
+    bind, user_id: int, plain_password: str, hash_anterior: str
+) -> bool:
+    """Grava um novo hash da senha com o custo atual do bcrypt.
+
+    Executado em segundo plano após o login. A troca só acontece se o hash
+    no banco ainda for ``hash_anterior``, para não sobrescrever uma
+    redefinição de senha feita nesse meio tempo.
+
+    Returns:
+        bool: True se o hash foi atualizado.
+    """
+    try:
+        novo_hash = await password_hasher.hash(plain_password)
+    except PasswordHasherBusy:
+        # Tenta de novo no próximo login
+        return False
+
+    # A gravação roda no executor de serviços, fora do event loop
+    atualizado = await service_executor.run(
+        _gravar_novo_hash, bind, user_id, hash_anterior, novo_hash
+    )
+    if atualizado:
+        logger.info("Hash da senha do usuário %s atualizado", user_id)
+    return atualizado
+
+
+def _gravar_novo_hash(bind, user_id: int, hash_anterior: str, novo_hash: str) -> bool:
+    with Session(bind=bind) as db:
+        resultado = db.execute(
+            update(User)
+            .where(User.id == user_id, User.hashed_password == hash_anterior)
+            .values(hashed_password=novo_hash)
+        )
+        db.commit()
+    return bool(resultado.rowcount)
+
+
+__all__ = ["PasswordHasher", "PasswordHasherBusy", "password_hasher", "rehash_password"]
@@ -0,0 +1,122 @@
+"""Cache dos usuários autenticados (principals) por username e versão do token.
+
+``get_current_user`` consultava ``users`` a cada requisição autenticada. O
+cache guarda apenas o necessário para autorização (id, role, is_active,
+locked_until) com LRU limitado a ``AUTH_PRINCIPAL_CACHE_SIZE`` entradas e
+validade de ``AUTH_PRINCIPAL_CACHE_TTL_SECONDS``.
+
+A chave inclui a versão do token (claim ``ver``): ao trocar a senha, a
+role ou is_active, ou ao bloquear a conta, a ``token_version`` do usuário
+aumenta (a troca de senha explicitamente; as demais pelo evento em
+``models.user_model``) e os tokens antigos são recusados por qualquer worker
+que consulte o banco. O cache é local ao processo: ``invalidate(username)``
+descarta as entradas apenas no worker que fez a alteração, e nos demais a
+entrada já carregada vale até o fim do TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from core.config import AUTH_PRINCIPAL_CACHE_SIZE, AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+from models.user_model import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Usuário autenticado, com os campos usados na autorização."""
+
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool
+    locked_until: Optional[datetime]
+    token_version: int
+
+    @classmethod
+    def of(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            is_active=user.is_active,
+            locked_until=user.locked_until,
+            token_version=user.token_version or 0,
+        )
+
+
+class PrincipalCache:
+    """LRU com TTL de principals chaveado por (username, versão do token)."""
+
+    def __init__(
+        self,
+        max_size: int = AUTH_PRINCIPAL_CACHE_SIZE,
+        ttl_seconds: float = AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Principal]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, username: str, version: int) -> Optional[Principal]:
+        chave = (username, version)
+        with self._lock:
+            entry = self._entries.get(chave)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[chave]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(chave)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        chave = (principal.username, principal.token_version)
+        with self._lock:
+            self._entries[chave] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(chave)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Descarta as entradas do usuário (todas as versões de token)."""
+        with self._lock:
+            for chave in [c for c in self._entries if c[0] == username]:
+                del self._entries[chave]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache()
+
+
+__all__ = ["Principal", "PrincipalCache", "principal_cache"]
@@ -2,23 +2,27 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import date, timedelta
-from typing import Dict, Iterable, List, Optional
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from models.ocupacao_diaria import OcupacaoDiaria
 from models.quarto import Quarto
 from models.reserva import Reserva
 from schemas.quarto import (
     QuartoCalendar,
-    QuartoCalendarDay,
     QuartoCreate,
     QuartoUpdate,
 )
+from services import dashboard_counters
+from services.calendario_grid import montar_calendario
+from services.dashboard_cache import dashboard_cache
 from services.reserva_service import STATUS_CANCELADA, STATUS_EQUIVALENTS
+from utils.pagination import decode_cursor, next_cursor
 
 _CANCELLED_STATUSES: Iterable[str] = STATUS_EQUIVALENTS[STATUS_CANCELADA]
 
@@ -32,51 +36,6 @@ def _ensure_date_range(data_inicio: date, data_fim: date) -> None:
         )
 
 
-def _build_day_entries(
-    reservas: List[Reserva],
-    data_inicio: date,
-    data_fim: date,
-) -> List[QuartoCalendarDay]:
-    """Gera a ocupação diária de um quarto para o período solicitado."""
-    total_dias = (data_fim - data_inicio).days + 1
-    ocupacao_por_dia: Dict[date, Reserva] = {}
-
-    for reserva in reservas:
-        inicio = max(reserva.data_checkin, data_inicio)
-        fim = min(reserva.data_checkout, data_fim + timedelta(days=1))
-        dia_atual = inicio
-        while dia_atual < fim:
-            ocupacao_por_dia[dia_atual] = reserva
-            dia_atual += timedelta(days=1)
-
-    dias: List[QuartoCalendarDay] = []
-    for offset in range(total_dias):
-        dia = data_inicio + timedelta(days=offset)
-        reserva = ocupacao_por_dia.get(dia)
-        if reserva:
-            # Determinar o status do dia baseado na reserva
-            if dia == reserva.data_checkin:
-                day_status = "checkin"
-            elif dia == reserva.data_checkout:
-                day_status = "checkout"
-            else:
-                day_status = "ocupado"
-            
-            dias.append(
-                QuartoCalendarDay(
-                    data=dia,
-                    status=day_status,
-                    reserva_id=reserva.id,
-                    reserva_status=reserva.status,
-                    cliente_id=reserva.client_id,
-                )
-            )
-        else:
-            dias.append(QuartoCalendarDay(data=dia, status="livre"))
-
-    return dias
-
-
 def create_quarto(db: Session, quarto_data: QuartoCreate) -> Quarto:
     """Cria um novo quarto garantindo número único."""
     existente = (
@@ -91,7 +50,10 @@ def create_quarto(db: Session, quarto_data: QuartoCreate) -> Quarto:
     db_quarto = Quarto(**quarto_data.model_dump())
     db.add(db_quarto)
     try:
+        db.flush()
+        dashboard_counters.ajustar_quartos(db, +1)
         db.commit()
+        dashboard_cache.invalidate()
     except IntegrityError as exc:
         db.rollback()
         raise HTTPException(
@@ -119,6 +81,61 @@ def get_quartos(db: Session, skip: int = 0, limit: int = 100) -> List[Quarto]:
     )
 
 
+def get_quartos_page(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Quarto], Optional[str]]:
+    """Lista quartos paginados por cursor na chave (numero, id)."""
+    query = db.query(Quarto)
+
+    if cursor:
+        last_numero, last_id = decode_cursor(cursor, (str, int))
+        query = query.filter(
+            or_(
+                Quarto.numero > last_numero,
+                and_(Quarto.numero == last_numero, Quarto.id > last_id),
+            )
+        )
+
+    quartos = query.order_by(Quarto.numero, Quarto.id).limit(limit + 1).all()
+    return quartos, next_cursor(quartos, limit, lambda q: (q.numero, q.id))
+
+
+def get_quartos_disponiveis(
+    db: Session,
+    data_inicio: date,
+    data_fim: date,
+    tipo: Optional[str] = None,
+    capacidade: Optional[int] = None,
+) -> List[Quarto]:
+    """Lista quartos sem reservas ativas no período [data_inicio, data_fim).
+
+    A disponibilidade é resolvida em uma única consulta com anti-join
+    (``NOT IN``) contra as noites ocupadas do período em ocupacao_diaria,
+    que só contém reservas não canceladas. A subconsulta é uma varredura
+    de intervalo no índice (noite, quarto_id).
+    """
+    if data_inicio >= data_fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="data_fim deve ser posterior a data_inicio",
+        )
+
+    quartos_ocupados = select(OcupacaoDiaria.quarto_id).where(
+        OcupacaoDiaria.noite >= data_inicio,
+        OcupacaoDiaria.noite < data_fim,
+    )
+
+    query = db.query(Quarto).filter(Quarto.id.notin_(quartos_ocupados))
+    if tipo:
+        query = query.filter(Quarto.tipo == tipo)
+    if capacidade:
+        query = query.filter(Quarto.capacidade >= capacidade)
+
+    return query.order_by(Quarto.numero).all()
+
+
 def update_quarto(
     db: Session,
     quarto_id: int,
@@ -156,6 +173,7 @@ def update_quarto(
         setattr(db_quarto, campo, valor)
 
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_quarto)
     return db_quarto
 
@@ -181,8 +199,10 @@ def delete_quarto(db: Session, quarto_id: int) -> bool:
             detail="Não é possível remover o quarto com reservas ativas.",
         )
 
+    dashboard_counters.ajustar_quartos(db, -1)
     db.delete(db_quarto)
     db.commit()
+    dashboard_cache.invalidate()
     return True
 
 
@@ -193,53 +213,23 @@ def get_calendario_ocupacao(
 ) -> List[QuartoCalendar]:
     """Retorna a ocupação de todos os quartos no período informado."""
     _ensure_date_range(data_inicio, data_fim)
+    return montar_calendario(db, data_inicio, data_fim).to_models()
 
-    quartos = db.query(Quarto).order_by(Quarto.numero).all()
-    if not quartos:
-        return []
 
-    reservas = (
-        db.query(Reserva)
-        .filter(
-            Reserva.status.notin_(tuple(_CANCELLED_STATUSES)),
-            Reserva.data_checkin < data_fim + timedelta(days=1),
-            Reserva.data_checkout > data_inicio,
-        )
-        .all()
-    )
-
-    reservas_por_quarto: Dict[int, List[Reserva]] = defaultdict(list)
-    for reserva in reservas:
-        reservas_por_quarto[reserva.quarto_id].append(reserva)
-
-    calendario: List[QuartoCalendar] = []
-    hoje = date.today()
-    
-    for quarto in quartos:
-        dias = _build_day_entries(
-            reservas_por_quarto.get(quarto.id, []),
-            data_inicio,
-            data_fim,
-        )
-        
-        # Se o quarto está marcado como "ocupado", marcar SOMENTE hoje
-        if quarto.status == "ocupado":
-            for dia in dias:
-                if dia.status == "livre" and dia.data == hoje:
-                    dia.status = "ocupado"
-        
-        calendario.append(
-            QuartoCalendar(
-                quarto_id=quarto.id,
-                numero=quarto.numero,
-                tipo=quarto.tipo,
-                status=quarto.status,
-                capacidade=quarto.capacidade,
-                valor_diaria=float(quarto.valor_diaria),
-                periodo_inicio=data_inicio,
-                periodo_fim=data_fim,
-                ocupacao=dias,
-            )
-        )
-
-    return calendario
+def get_calendario_ocupacao_json(
+    db: Session,
+    data_inicio: date,
+    data_fim: date,
+    formato: str = "completo",
+) -> bytes:
+    """Retorna a ocupação do período já serializada.
+
+    ``formato="completo"`` segue ``List[QuartoCalendar]`` (um item por dia);
+    ``formato="compacto"`` segue ``List[QuartoCalendarCompacto]`` (segmentos
+    de dias consecutivos). Evita instanciar um modelo por quarto e dia.
+    """
+    _ensure_date_range(data_inicio, data_fim)
+    grid = montar_calendario(db, data_inicio, data_fim)
+    if formato == "compacto":
+        return grid.to_json_compacto()
+    return grid.to_json()
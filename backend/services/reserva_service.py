@@ -1,15 +1,22 @@
 """Regras de negócio relacionadas às reservas."""
 
 from datetime import date
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_
+from sqlalchemy import RowMapping, and_, insert, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session, selectinload
 
 from models.reserva import Reserva
+from models.client_model import Client
 from models.quarto import Quarto
-from schemas.reserva import ReservaCreate, ReservaUpdate
+from schemas.reserva import ReservaCreate, ReservaLoteFalha, ReservaUpdate
+from services import dashboard_counters, ocupacao_service
+from services.availability_index import availability_index
+from services.dashboard_cache import dashboard_cache
+from utils.pagination import decode_cursor, next_cursor
 
 STATUS_PENDENTE = "pendente"
 STATUS_ATIVA = "ativa"
@@ -29,15 +36,14 @@ STATUS_EQUIVALENTS = {
 }
 
 
-def is_quarto_disponivel(
+def _reservas_sobrepostas(
     db: Session,
     quarto_id: int,
     data_checkin: date,
     data_checkout: date,
     reserva_id_a_ignorar: Optional[int] = None,
-) -> bool:
-    """Verifica se um quarto está disponível no período informado."""
-    query = db.query(Reserva).filter(
+):
+    query = db.query(Reserva.id).filter(
         Reserva.quarto_id == quarto_id,
         Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])),
         and_(
@@ -49,22 +55,74 @@ def is_quarto_disponivel(
     if reserva_id_a_ignorar:
         query = query.filter(Reserva.id != reserva_id_a_ignorar)
 
-    return query.first() is None
+    return query
 
 
-def calcular_valor_total(
+def _reservas_sobrepostas_query(
+    db: Session,
+    quarto_ids: Iterable[int],
+    data_checkin: date,
+    data_checkout: date,
+):
+    """Períodos ativos de vários quartos que tocam o intervalo informado."""
+    return db.query(
+        Reserva.quarto_id, Reserva.data_checkin, Reserva.data_checkout
+    ).filter(
+        Reserva.quarto_id.in_(tuple(quarto_ids)),
+        Reserva.status.notin_(tuple(STATUS_EQUIVALENTS[STATUS_CANCELADA])),
+        Reserva.data_checkin < data_checkout,
+        Reserva.data_checkout > data_checkin,
+    )
+
+
+def is_quarto_disponivel(
     db: Session,
     quarto_id: int,
     data_checkin: date,
     data_checkout: date,
-) -> float:
-    """Calcula o valor total da estadia com base na diária e número de noites."""
+    reserva_id_a_ignorar: Optional[int] = None,
+) -> bool:
+    """Verifica se um quarto está disponível no período informado.
+
+    O índice de disponibilidade em memória, quando carregado para o banco
+    da sessão, é apenas um atalho para "disponível". Cada processo tem o
+    seu índice e não vê cancelamentos feitos pelos outros, então uma
+    resposta "indisponível" do índice é sempre confirmada na tabela
+    ``reservas``; se o banco discordar, o índice é recarregado no próximo
+    uso.
+    """
+    indice_pronto = availability_index.is_ready(db)
+    if indice_pronto and availability_index.is_available(
+        quarto_id, data_checkin, data_checkout, reserva_id_a_ignorar
+    ):
+        return True
+
+    query = _reservas_sobrepostas(
+        db, quarto_id, data_checkin, data_checkout, reserva_id_a_ignorar
+    )
+    disponivel = query.first() is None
+    if disponivel and indice_pronto:
+        availability_index.mark_stale()
+    return disponivel
+
+
+def _validar_periodo(data_checkin: date, data_checkout: date) -> None:
     if data_checkin >= data_checkout:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A data de check-out deve ser posterior à data de check-in.",
         )
 
+
+def calcular_valor_total(
+    db: Session,
+    quarto_id: int,
+    data_checkin: date,
+    data_checkout: date,
+) -> float:
+    """Calcula o valor total da estadia com base na diária e número de noites."""
+    _validar_periodo(data_checkin, data_checkout)
+
     quarto = db.query(Quarto).filter(Quarto.id == quarto_id).first()
     if not quarto:
         raise HTTPException(
@@ -76,34 +134,274 @@ def calcular_valor_total(
     return quarto.valor_diaria * numero_de_noites
 
 
-def create_reserva(db: Session, reserva: ReservaCreate) -> Reserva:
-    """Cria uma reserva após validar disponibilidade e calcular o valor."""
-    if not is_quarto_disponivel(
-        db, reserva.quarto_id, reserva.data_checkin, reserva.data_checkout
-    ):
+def _bloquear_quartos(db: Session, quarto_ids: Iterable[int]) -> Dict[int, Quarto]:
+    """Obtém os quartos com bloqueio de escrita até o fim da transação.
+
+    Serializa as reservas concorrentes de um mesmo quarto. Bancos com
+    suporte usam ``SELECT ... FOR UPDATE``; no SQLite, que ignora a
+    cláusula, um ``UPDATE`` sem efeito obtém o lock de escrita do banco.
+    Os quartos são bloqueados em ordem de ID para evitar deadlocks.
+    """
+    ids = sorted(set(quarto_ids))
+    try:
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(
+                update(Quarto)
+                .where(Quarto.id.in_(ids))
+                .values(id=Quarto.id)
+            )
+        quartos = (
+            db.query(Quarto)
+            .filter(Quarto.id.in_(ids))
+            .order_by(Quarto.id)
+            .with_for_update()
+            .all()
+        )
+    except OperationalError as exc:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="O quarto não está disponível para as datas selecionadas.",
+            detail="O quarto está sendo reservado por outra requisição.",
+        ) from exc
+
+    return {quarto.id: quarto for quarto in quartos}
+
+
+def _bloquear_quarto(db: Session, quarto_id: int) -> Quarto:
+    """Obtém um quarto com bloqueio de escrita até o fim da transação."""
+    quarto = _bloquear_quartos(db, [quarto_id]).get(quarto_id)
+    if not quarto:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quarto não encontrado.",
+        )
+    return quarto
+
+
+def _garantir_disponibilidade(
+    db: Session,
+    quarto_id: int,
+    data_checkin: date,
+    data_checkout: date,
+    detail: str,
+    reserva_id_a_ignorar: Optional[int] = None,
+) -> Quarto:
+    """Bloqueia o quarto e confirma a disponibilidade no banco.
+
+    A consulta é uma leitura com bloqueio para enxergar as reservas já
+    confirmadas por transações concorrentes, independentemente do
+    snapshot da transação atual.
+    """
+    quarto = _bloquear_quarto(db, quarto_id)
+    conflito = (
+        _reservas_sobrepostas(
+            db, quarto_id, data_checkin, data_checkout, reserva_id_a_ignorar
         )
+        .with_for_update()
+        .first()
+    )
+    if conflito is not None:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+    return quarto
 
-    valor_total = calcular_valor_total(
+
+def _ocupar_ou_conflito(db: Session, ocupar, detail: str) -> None:
+    """Executa ``ocupar`` e traduz noite já ocupada em 409.
+
+    A chave primária de ocupacao_diaria é a última barreira contra reservas
+    sobrepostas, inclusive as gravadas fora dos bloqueios de quarto.
+    """
+    try:
+        ocupar()
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=detail
+        ) from exc
+
+
+def create_reserva(db: Session, reserva: ReservaCreate) -> Reserva:
+    """Cria uma reserva após validar disponibilidade e calcular o valor.
+
+    A verificação rápida (índice em memória ou SQL) rejeita conflitos
+    óbvios sem bloquear nada; a confirmação final acontece com o quarto
+    bloqueado, na mesma transação do INSERT.
+    """
+    _validar_periodo(reserva.data_checkin, reserva.data_checkout)
+
+    detail = "O quarto não está disponível para as datas selecionadas."
+    if not is_quarto_disponivel(
         db, reserva.quarto_id, reserva.data_checkin, reserva.data_checkout
+    ):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+    quarto = _garantir_disponibilidade(
+        db, reserva.quarto_id, reserva.data_checkin, reserva.data_checkout, detail
     )
+    numero_de_noites = (reserva.data_checkout - reserva.data_checkin).days
 
     db_reserva = Reserva(
         quarto_id=reserva.quarto_id,
         client_id=reserva.client_id,
         data_checkin=reserva.data_checkin,
         data_checkout=reserva.data_checkout,
-        valor_total=valor_total,
+        valor_total=quarto.valor_diaria * numero_de_noites,
         status=STATUS_PENDENTE,
     )
     db.add(db_reserva)
+    db.flush()
+    _ocupar_ou_conflito(
+        db, lambda: ocupacao_service.ocupar_noites(db, [db_reserva]), detail
+    )
+    dashboard_counters.registrar_reservas(db, [db_reserva])
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_reserva)
+    availability_index.sync_reserva(db, db_reserva)
     return db_reserva
 
 
+def create_reservas_lote(
+    db: Session,
+    reservas: List[ReservaCreate],
+    parcial: bool = False,
+) -> Tuple[List[Reserva], List[ReservaLoteFalha]]:
+    """Cria um bloco de reservas (grupos) em uma única transação.
+
+    Bloqueia todos os quartos envolvidos, busca as reservas sobrepostas
+    com uma única consulta e insere as reservas válidas com um INSERT em
+    lote. Com ``parcial=False`` qualquer falha cancela o bloco inteiro;
+    com ``parcial=True`` apenas os itens com falha são descartados.
+
+    Returns:
+        Reservas criadas e as falhas (índice do item, quarto e motivo).
+
+    Raises:
+        HTTPException: quando ``parcial=False`` e algum item falhar, ou
+            quando nenhum item do bloco pôde ser criado. O código é o da
+            primeira falha.
+    """
+    falhas: List[ReservaLoteFalha] = []
+
+    def falhar(indice: int, item: ReservaCreate, codigo: int, detail: str) -> None:
+        falhas.append(
+            ReservaLoteFalha(
+                indice=indice,
+                quarto_id=item.quarto_id,
+                status_code=codigo,
+                detail=detail,
+            )
+        )
+
+    validos = []
+    for indice, item in enumerate(reservas):
+        if item.data_checkin >= item.data_checkout:
+            falhar(
+                indice,
+                item,
+                status.HTTP_400_BAD_REQUEST,
+                "A data de check-out deve ser posterior à data de check-in.",
+            )
+        else:
+            validos.append((indice, item))
+
+    quartos = _bloquear_quartos(db, [item.quarto_id for _, item in validos]) if validos else {}
+
+    ocupados: Dict[int, List[Tuple[date, date]]] = defaultdict(list)
+    if quartos:
+        existentes = (
+            _reservas_sobrepostas_query(
+                db,
+                quartos.keys(),
+                min(item.data_checkin for _, item in validos),
+                max(item.data_checkout for _, item in validos),
+            )
+            .with_for_update()
+            .all()
+        )
+        for quarto_id, checkin, checkout in existentes:
+            ocupados[quarto_id].append((checkin, checkout))
+
+    linhas = []
+    for indice, item in validos:
+        quarto = quartos.get(item.quarto_id)
+        if quarto is None:
+            falhar(indice, item, status.HTTP_404_NOT_FOUND, "Quarto não encontrado.")
+            continue
+
+        periodos = ocupados[item.quarto_id]
+        if any(
+            checkin < item.data_checkout and checkout > item.data_checkin
+            for checkin, checkout in periodos
+        ):
+            falhar(
+                indice,
+                item,
+                status.HTTP_409_CONFLICT,
+                "O quarto não está disponível para as datas selecionadas.",
+            )
+            continue
+
+        # Itens seguintes do mesmo bloco também não podem se sobrepor
+        periodos.append((item.data_checkin, item.data_checkout))
+        numero_de_noites = (item.data_checkout - item.data_checkin).days
+        linhas.append(
+            {
+                "quarto_id": item.quarto_id,
+                "client_id": item.client_id,
+                "data_checkin": item.data_checkin,
+                "data_checkout": item.data_checkout,
+                "valor_total": quarto.valor_diaria * numero_de_noites,
+                "status": STATUS_PENDENTE,
+            }
+        )
+
+    if falhas and (not parcial or not linhas):
+        db.rollback()
+        falhas.sort(key=lambda falha: falha.indice)
+        raise HTTPException(
+            status_code=falhas[0].status_code,
+            detail={
+                "mensagem": "Nenhuma reserva do bloco foi criada.",
+                "falhas": [falha.model_dump() for falha in falhas],
+            },
+        )
+
+    criadas: List[Reserva] = []
+    if linhas:
+        db.execute(insert(Reserva), linhas)
+        # Com os quartos bloqueados, (quarto_id, data_checkin) identifica
+        # unicamente cada reserva ativa recém-inserida.
+        criadas = (
+            db.query(Reserva)
+            .filter(
+                tuple_(Reserva.quarto_id, Reserva.data_checkin).in_(
+                    [(linha["quarto_id"], linha["data_checkin"]) for linha in linhas]
+                ),
+                Reserva.status == STATUS_PENDENTE,
+            )
+            .order_by(Reserva.id)
+            .all()
+        )
+        _ocupar_ou_conflito(
+            db,
+            lambda: ocupacao_service.ocupar_noites(db, criadas),
+            "Um dos quartos não está disponível para as datas selecionadas.",
+        )
+        dashboard_counters.registrar_reservas(db, criadas)
+    db.commit()
+    dashboard_cache.invalidate()
+
+    for reserva in criadas:
+        availability_index.sync_reserva(db, reserva)
+
+    falhas.sort(key=lambda falha: falha.indice)
+    return criadas, falhas
+
+
 def get_reserva(db: Session, reserva_id: int) -> Optional[Reserva]:
     """Busca uma reserva pelo ID."""
     return (
@@ -133,21 +431,14 @@ def _parse_month_filter(mes: str) -> Tuple[date, date]:
     return start, end
 
 
-def get_reservas(
+def _reservas_query(
     db: Session,
-    skip: int = 0,
-    limit: int = 100,
     status_filter: Optional[str] = None,
     mes: Optional[str] = None,
-) -> List[Reserva]:
-    """Lista reservas com filtros opcionais de status e mês."""
-    query = (
-        db.query(Reserva)
-        .options(
-            selectinload(Reserva.quarto),
-            selectinload(Reserva.client),
-        )
-        .order_by(Reserva.data_checkin.desc())
+):
+    query = db.query(Reserva).options(
+        selectinload(Reserva.quarto),
+        selectinload(Reserva.client),
     )
 
     if status_filter:
@@ -161,9 +452,106 @@ def get_reservas(
             Reserva.data_checkin < end,
         )
 
+    return query
+
+
+def get_reservas(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    status_filter: Optional[str] = None,
+    mes: Optional[str] = None,
+) -> List[Reserva]:
+    """Lista reservas com filtros opcionais de status e mês."""
+    query = _reservas_query(db, status_filter, mes).order_by(
+        Reserva.data_checkin.desc(), Reserva.id.desc()
+    )
     return query.offset(skip).limit(limit).all()
 
 
+def get_reservas_page(
+    db: Session,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = None,
+    mes: Optional[str] = None,
+) -> Tuple[List[Reserva], Optional[str]]:
+    """Lista reservas paginadas por cursor na chave (data_checkin, id).
+
+    Returns:
+        Reservas da página e o cursor da próxima página (ou None).
+    """
+    query = _reservas_query(db, status_filter, mes)
+
+    if cursor:
+        last_checkin, last_id = decode_cursor(cursor, (date, int))
+        query = query.filter(
+            or_(
+                Reserva.data_checkin < last_checkin,
+                and_(Reserva.data_checkin == last_checkin, Reserva.id < last_id),
+            )
+        )
+
+    reservas = (
+        query.order_by(Reserva.data_checkin.desc(), Reserva.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    return reservas, next_cursor(
+        reservas, limit, lambda r: (r.data_checkin, r.id)
+    )
+
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Reserva.id.label("id"),
+    Reserva.quarto_id.label("quarto_id"),
+    Quarto.numero.label("quarto_numero"),
+    Reserva.client_id.label("client_id"),
+    Client.name.label("cliente_nome"),
+    Reserva.data_checkin.label("data_checkin"),
+    Reserva.data_checkout.label("data_checkout"),
+    Reserva.valor_total.label("valor_total"),
+    Reserva.status.label("status"),
+    Reserva.created_at.label("created_at"),
+)
+
+
+def iter_reservas_export(
+    db: Session,
+    desde: Optional[date] = None,
+    ate: Optional[date] = None,
+) -> Iterator[List[RowMapping]]:
+    """Percorre, em lotes, as reservas para exportação sem carregar objetos ORM.
+
+    Seleciona apenas as colunas exportadas e lê o resultado em lotes de
+    EXPORT_BATCH_SIZE com cursor do lado do servidor (``yield_per``),
+    mantendo o uso de memória constante.
+
+    Args:
+        desde: Data de check-in mínima (inclusiva)
+        ate: Data de check-in máxima (inclusiva)
+    """
+    query = (
+        select(*EXPORT_COLUMNS)
+        .join(Quarto, Quarto.id == Reserva.quarto_id)
+        .join(Client, Client.id == Reserva.client_id)
+        .order_by(Reserva.data_checkin, Reserva.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if desde:
+        query = query.where(Reserva.data_checkin >= desde)
+    if ate:
+        query = query.where(Reserva.data_checkin <= ate)
+
+    result = db.execute(query)
+    try:
+        yield from result.mappings().partitions()
+    finally:
+        result.close()
+
+
 def update_reserva(
     db: Session,
     reserva_id: int,
@@ -173,6 +561,7 @@ def update_reserva(
     db_reserva = get_reserva(db, reserva_id)
     if not db_reserva:
         return None
+    anterior = dashboard_counters.ReservaSnapshot.of(db_reserva)
 
     update_data = reserva_update.model_dump(exclude_unset=True, by_alias=True)
 
@@ -180,6 +569,8 @@ def update_reserva(
     new_checkout = update_data.get("data_checkout", db_reserva.data_checkout)
 
     if "data_checkin" in update_data or "data_checkout" in update_data:
+        _validar_periodo(new_checkin, new_checkout)
+        detail = "O quarto não está disponível para as novas datas."
         if not is_quarto_disponivel(
             db,
             db_reserva.quarto_id,
@@ -187,13 +578,17 @@ def update_reserva(
             new_checkout,
             reserva_id_a_ignorar=reserva_id,
         ):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="O quarto não está disponível para as novas datas.",
-            )
-        update_data["valor_total"] = calcular_valor_total(
-            db, db_reserva.quarto_id, new_checkin, new_checkout
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+        quarto = _garantir_disponibilidade(
+            db,
+            db_reserva.quarto_id,
+            new_checkin,
+            new_checkout,
+            detail,
+            reserva_id_a_ignorar=reserva_id,
         )
+        numero_de_noites = (new_checkout - new_checkin).days
+        update_data["valor_total"] = quarto.valor_diaria * numero_de_noites
 
     if "status" in update_data:
         db_reserva.status = update_data["status"]
@@ -207,8 +602,16 @@ def update_reserva(
     if "valor_total" in update_data:
         db_reserva.valor_total = update_data["valor_total"]
 
+    _ocupar_ou_conflito(
+        db,
+        lambda: ocupacao_service.sincronizar_reserva(db, db_reserva),
+        "O quarto não está disponível para as novas datas.",
+    )
+    dashboard_counters.atualizar_reserva(db, anterior, db_reserva)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(db_reserva)
+    availability_index.sync_reserva(db, db_reserva)
     return db_reserva
 
 
@@ -224,7 +627,9 @@ def check_in_reserva(db: Session, reserva_id: int) -> Reserva:
         )
 
     reserva.status = STATUS_ATIVA
+    ocupacao_service.atualizar_status(db, reserva)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(reserva)
     return reserva
 
@@ -241,7 +646,9 @@ def check_out_reserva(db: Session, reserva_id: int) -> Reserva:
         )
 
     reserva.status = STATUS_CONCLUIDA
+    ocupacao_service.atualizar_status(db, reserva)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(reserva)
     return reserva
 
@@ -257,9 +664,14 @@ def cancel_reserva(db: Session, reserva_id: int) -> Reserva:
             detail="Reservas concluídas não podem ser canceladas.",
         )
 
+    anterior = dashboard_counters.ReservaSnapshot.of(reserva)
     reserva.status = STATUS_CANCELADA
+    ocupacao_service.liberar_noites(db, [reserva.id])
+    dashboard_counters.atualizar_reserva(db, anterior, reserva)
     db.commit()
+    dashboard_cache.invalidate()
     db.refresh(reserva)
+    availability_index.sync_reserva(db, reserva)
     return reserva
 
 
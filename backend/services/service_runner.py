@@ -0,0 +1,131 @@
+"""Execução dos serviços a partir das rotas ``async def``.
+
+Os serviços (``ClientService``, ``dashboard_service``...) recebem uma
+``Session`` síncrona. Chamados diretamente de uma rota assíncrona, cada
+consulta bloqueava o event loop. ``run_service`` tira a espera pelo banco
+do loop:
+
+- com ``DB_ASYNC_ENABLED`` a rota recebe uma ``AsyncSession`` e o serviço
+  roda via ``run_sync``, sobre o driver assíncrono (aiomysql/aiosqlite).
+  O código do serviço continua na thread do loop (em um greenlet); só o
+  I/O do banco é assíncrono;
+- com a sessão síncrona o serviço roda em um executor de threads dedicado,
+  limitado a ``SERVICE_EXECUTOR_WORKERS`` threads. Chamadas além disso
+  aguardam na fila do executor, sem ocupar as threads do anyio usadas
+  pelas rotas ``def``.
+
+A sessão da requisição é usada por uma chamada de cada vez, então passá-la
+para outra thread é seguro.
+
+Trabalho pesado de CPU não deve contar com ``run_service``: no modo
+assíncrono ele bloquearia o loop. Use um executor próprio, como o pool de
+hash de senhas em ``password_hasher``.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.config import SERVICE_EXECUTOR_WORKERS
+
+T = TypeVar("T")
+
+
+class ServiceExecutor:
+    """Executor de threads limitado para serviços síncronos."""
+
+    def __init__(self, workers: int = SERVICE_EXECUTOR_WORKERS) -> None:
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._em_andamento = 0
+        self.reset_stats()
+
+    def _obter_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="service"
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def run(self, funcao: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # O contexto é copiado, como em run_in_threadpool
+        contexto = contextvars.copy_context()
+        chamada = functools.partial(funcao, *args, **kwargs)
+        enviado = time.perf_counter()
+        with self._lock:
+            self._em_andamento += 1
+            self.submitted += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._em_andamento)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._obter_executor(), self._executar, contexto, chamada, enviado
+            )
+        finally:
+            with self._lock:
+                self._em_andamento -= 1
+                self.completed += 1
+
+    def _executar(self, contexto, chamada, enviado: float):
+        espera = time.perf_counter() - enviado
+        with self._lock:
+            self._espera_total += espera
+            self.max_wait = max(self.max_wait, espera)
+        return contexto.run(chamada)
+
+    def stats(self) -> dict:
+        with self._lock:
+            concluidas = self.completed or None
+            return {
+                "workers": self.workers,
+                "in_flight": self._em_andamento,
+                "queued": max(0, self._em_andamento - self.workers),
+                "peak_in_flight": self.peak_in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "avg_wait_ms": concluidas and self._espera_total / concluidas * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def reset_stats(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.peak_in_flight = self._em_andamento
+        self.max_wait = 0.0
+        self._espera_total = 0.0
+
+
+service_executor = ServiceExecutor()
+
+
+async def run_service(
+    db: Union[AsyncSession, Session],
+    funcao: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """Executa ``funcao(sessao, *args, **kwargs)`` sem bloquear o loop no I/O.
+
+    Com ``AsyncSession`` a função roda na thread do loop via ``run_sync``;
+    com ``Session`` roda no ``service_executor``.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(funcao, *args, **kwargs)
+    return await service_executor.run(funcao, db, *args, **kwargs)
+
+
+__all__ = ["ServiceExecutor", "run_service", "service_executor"]
@@ -0,0 +1,166 @@
+"""Decodificação de tokens JWT com cache dos tokens já verificados.
+
+Cada requisição autenticada verificava a assinatura HMAC do mesmo token,
+apresentado centenas de vezes por sessão. ``CachedTokenDecoder`` guarda as
+claims de tokens já verificados, chaveadas pelo SHA-256 do token (o token
+em si não fica em memória), em um LRU de ``JWT_DECODE_CACHE_SIZE``
+entradas. Um acerto dispensa a verificação, mas a expiração é conferida
+contra o ``exp`` guardado; tokens sem ``exp`` não são guardados.
+
+O decodificador é plugável: ``JWT_DECODER`` aceita um nome registrado
+(``"jose"``, padrão) ou um caminho ``"modulo:Classe"`` para uma classe com
+``decode(token) -> dict`` que levante ``InvalidTokenError`` em tokens
+inválidos. As rotas dependem apenas de ``dependencies/auth``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Protocol, Tuple
+
+from jose import JWTError, jwt
+
+from core.config import ALGORITHM, JWT_DECODE_CACHE_SIZE, JWT_DECODER, SECRET_KEY
+
+
+class InvalidTokenError(Exception):
+    """Token com assinatura, formato ou validade inválidos."""
+
+
+class TokenDecoder(Protocol):
+    def decode(self, token: str) -> dict:
+        ...
+
+
+class JoseDecoder:
+    """Verificação completa com python-jose (assinatura e ``exp``)."""
+
+    def __init__(self, secret_key: str = SECRET_KEY, algorithm: str = ALGORITHM) -> None:
+        self.secret_key = secret_key
+        self.algorithms = [algorithm]
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=self.algorithms)
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+DECODERS: Dict[str, Callable[[], TokenDecoder]] = {"jose": JoseDecoder}
+
+
+def register_decoder(nome: str, fabrica: Callable[[], TokenDecoder]) -> None:
+    """Registra um decodificador para uso via ``JWT_DECODER``."""
+    DECODERS[nome] = fabrica
+
+
+def load_decoder(nome: str = JWT_DECODER) -> TokenDecoder:
+    """Instancia o decodificador por nome registrado ou ``"modulo:Classe"``."""
+    if nome in DECODERS:
+        return DECODERS[nome]()
+    modulo, _, classe = nome.partition(":")
+    if not classe:
+        raise ValueError(f"Decodificador JWT desconhecido: {nome}")
+    return getattr(importlib.import_module(modulo), classe)()
+
+
+class CachedTokenDecoder:
+    """LRU de claims por hash do token, na frente de outro decodificador."""
+
+    def __init__(
+        self, decoder: TokenDecoder, max_size: int = JWT_DECODE_CACHE_SIZE
+    ) -> None:
+        self.decoder = decoder
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self.reset_stats()
+
+    def decode(self, token: str) -> dict:
+        chave = hashlib.sha256(token.encode("utf-8")).digest()
+        agora = time.time()
+        with self._lock:
+            entry = self._entries.get(chave)
+            if entry is not None:
+                claims, exp = entry
+                if exp > agora:
+                    self._entries.move_to_end(chave)
+                    self.hits += 1
+                    return dict(claims)
+                del self._entries[chave]
+                self.expired += 1
+                raise InvalidTokenError("Signature has expired.")
+            self.misses += 1
+
+        inicio = time.perf_counter()
+        claims = self.decoder.decode(token)
+        duracao = time.perf_counter() - inicio
+
+        exp = claims.get("exp")
+        with self._lock:
+            self._decode_total += duracao
+            self._decodes += 1
+            if self.max_size > 0 and isinstance(exp, (int, float)):
+                self._entries[chave] = (dict(claims), float(exp))
+                self._entries.move_to_end(chave)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return claims
+
+    def set_decoder(self, decoder: TokenDecoder) -> None:
+        """Troca o decodificador; as claims em cache são descartadas."""
+        with self._lock:
+            self.decoder = decoder
+            self._entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            media = self._decode_total / self._decodes if self._decodes else None
+            return {
+                "decoder": type(self.decoder).__name__,
+                "max_size": self.max_size,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_ratio": self.hits / total if total else None,
+                "avg_decode_us": media and media * 1_000_000,
+                # Verificações evitadas vezes o custo médio medido nas falhas
+                "saved_ms": media and self.hits * media * 1000,
+            }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._decodes = 0
+        self._decode_total = 0.0
+
+
+token_decoder = CachedTokenDecoder(load_decoder())
+
+
+def set_token_decoder(decoder: TokenDecoder) -> None:
+    """Troca o decodificador usado por ``dependencies/auth``."""
+    token_decoder.set_decoder(decoder)
+
+
+__all__ = [
+    "CachedTokenDecoder",
+    "InvalidTokenError",
+    "JoseDecoder",
+    "TokenDecoder",
+    "load_decoder",
+    "register_decoder",
+    "set_token_decoder",
+    "token_decoder",
+]
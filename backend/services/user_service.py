@@ -0,0 +1,223 @@
+"""Consultas e gravações de usuários dos endpoints de autenticação.
+
+Os endpoints de ``/auth`` são ``async def`` para aguardar o pool de hash de
+senhas sem ocupar uma thread. Tudo o que acessa o banco (buscas, contadores
+de falhas, auditoria) fica nestas funções síncronas, chamadas por
+``run_service``; no loop fica apenas o ``await`` do bcrypt.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from core.database import canonical_bind
+from models.user_model import User, UserRole
+from schemas.user_schema import User as UserSchema, UserCreate
+from services.audit_service import AuditService
+from services.auth_service import calculate_lockout_time, is_account_locked
+from services.principal_cache import principal_cache
+
+ClientInfo = Dict[str, Optional[str]]
+
+
+@dataclass(frozen=True)
+class LoginAceito:
+    """Dados do usuário autenticado lidos antes de encerrar a sessão."""
+
+    user_id: int
+    username: str
+    token_version: int
+    hashed_password: str
+    bind: Any
+
+
+def _credenciais_invalidas() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Credenciais inválidas",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def verificar_cadastro(db: Session, username: str, email: Optional[str]) -> None:
+    """Recusa (400) username ou email já cadastrados."""
+    if db.query(User.id).filter(User.username == username).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+    if email and db.query(User.id).filter(User.email == email).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+
+def criar_usuario(
+    db: Session,
+    user_data: UserCreate,
+    hashed_password: str,
+    client_info: ClientInfo,
+) -> UserSchema:
+    """Cria o usuário (role VIEWER) e registra a auditoria."""
+    db_user = User(
+        username=user_data.username,
+        email=getattr(user_data, "email", None),
+        hashed_password=hashed_password,
+        role=UserRole.VIEWER,  # Novos usuários começam como VIEWER
+        is_active=True
+    )
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    criado = UserSchema.model_validate(db_user)
+
+    AuditService.log_action(
+        db=db,
+        user_id=criado.id,
+        action="USER_CREATED",
+        resource="USER",
+        resource_id=criado.id,
+        ip_address=client_info["ip_address"],
+        user_agent=client_info["user_agent"]
+    )
+    return criado
+
+
+def buscar_para_login(db: Session, username: str, client_info: ClientInfo) -> User:
+    """Busca o usuário que pode tentar o login.
+
+    Raises:
+        HTTPException: 401 se o usuário não existir; 403 se a conta estiver
+            bloqueada ou inativa (a tentativa é auditada).
+    """
+    user = db.query(User).filter(User.username == username).first()
+
+    # Erro genérico: não revela se o username existe
+    if not user:
+        raise _credenciais_invalidas()
+
+    if is_account_locked(user.failed_login_attempts, user.locked_until):
+        lockout_message = "Conta bloqueada devido a múltiplas tentativas de login falhadas."
+        if user.locked_until:
+            lockout_message += f" Tente novamente após {user.locked_until.strftime('%d/%m/%Y %H:%M:%S')}"
+        AuditService.log_login(
+            db=db,
+            user_id=user.id,
+            success=False,
+            ip_address=client_info["ip_address"],
+            user_agent=client_info["user_agent"],
+            details={"reason": "account_locked"}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=lockout_message,
+        )
+
+    if not user.is_active:
+        AuditService.log_login(
+            db=db,
+            user_id=user.id,
+            success=False,
+            ip_address=client_info["ip_address"],
+            user_agent=client_info["user_agent"],
+            details={"reason": "account_inactive"}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Conta inativa. Contate o administrador.",
+        )
+
+    return user
+
+
+def registrar_falha_login(db: Session, user: User, client_info: ClientInfo) -> None:
+    """Conta a senha inválida, bloqueia a conta se preciso e audita.
+
+    Não interrompe o login: quem chama deve responder 401 em seguida.
+    """
+    user.failed_login_attempts += 1
+    user.locked_until = calculate_lockout_time(user.failed_login_attempts)
+    tentativas = user.failed_login_attempts
+    db.commit()
+    principal_cache.invalidate(user.username)
+
+    AuditService.log_login(
+        db=db,
+        user_id=user.id,
+        success=False,
+        ip_address=client_info["ip_address"],
+        user_agent=client_info["user_agent"],
+        details={
+            "reason": "invalid_password",
+            "failed_attempts": tentativas
+        }
+    )
+
+
+def registrar_login(db: Session, user: User, client_info: ClientInfo) -> LoginAceito:
+    """Zera as falhas, grava o último login e registra a auditoria."""
+    user.failed_login_attempts = 0
+    user.locked_until = None
+    user.last_login = datetime.utcnow()
+    user.last_login_ip = client_info["ip_address"]
+    aceito = LoginAceito(
+        user_id=user.id,
+        username=user.username,
+        token_version=user.token_version or 0,
+        hashed_password=user.hashed_password,
+        # Engine síncrono, usável fora da requisição (novo hash da senha)
+        bind=canonical_bind(db.get_bind()),
+    )
+    db.commit()
+    principal_cache.invalidate(aceito.username)
+
+    AuditService.log_login(
+        db=db,
+        user_id=aceito.user_id,
+        success=True,
+        ip_address=client_info["ip_address"],
+        user_agent=client_info["user_agent"]
+    )
+    return aceito
+
+
+def buscar_por_token_reset(db: Session, token: str) -> User:
+    """Usuário do token de reset ainda válido (400 caso contrário)."""
+    user = db.query(User).filter(User.reset_token == token).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token de reset inválido"
+        )
+    if not user.reset_token_expires or user.reset_token_expires < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token de reset expirado. Solicite um novo token."
+        )
+    return user
+
+
+def concluir_reset(
+    db: Session, user: User, hashed_password: str, client_info: ClientInfo
+) -> None:
+    """Grava a nova senha, desbloqueia a conta e revoga os tokens emitidos."""
+    user.hashed_password = hashed_password
+    user.reset_token = None
+    user.reset_token_expires = None
+    user.failed_login_attempts = 0  # Resetar contador de falhas
+    user.locked_until = None  # Desbloquear conta se estiver bloqueada
+    user.token_version = (user.token_version or 0) + 1  # Revogar tokens emitidos
+    username, user_id = user.username, user.id
+    db.commit()
+    principal_cache.invalidate(username)
+
+    AuditService.log_password_reset_complete(
+        db=db,
+        user_id=user_id,
+        ip_address=client_info["ip_address"],
+        user_agent=client_info["user_agent"]
+    )
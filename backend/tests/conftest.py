@@ -8,11 +8,14 @@ from sqlalchemy.pool import StaticPool
 
 # Garantir que a aplicação use o banco de dados em memória durante os testes
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("AUDIT_ASYNC_ENABLED", "false")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
 
 # Imports após configuração do ambiente
 from main import app  # noqa: E402
 from models.base import Base  # noqa: E402
-from core.database import get_db  # noqa: E402
+from core.database import get_db, get_route_db  # noqa: E402
 
 # Configuração do banco de dados de teste em memória
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -43,8 +46,9 @@ def override_get_db():
         db.close()
 
 
-# Aplica a sobrescrita da dependência na aplicação
+# Aplica a sobrescrita da dependência na aplicação (rotas sync e async)
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_route_db] = override_get_db
 
 
 @pytest.fixture(scope="function")
@@ -69,3 +73,27 @@ def test_client():
     """
     with TestClient(app) as client:
         yield client
+
+
+@pytest.fixture(scope="function")
+def isolated_session():
+    """
+    Fixture do pytest que fornece uma sessão ligada a um banco em memória
+    exclusivo do teste, sem interferir no banco compartilhado pela API.
+    """
+    isolated_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=isolated_engine)
+    db = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=isolated_engine,
+    )()
+    try:
+        yield db
+    finally:
+        db.close()
+        isolated_engine.dispose()
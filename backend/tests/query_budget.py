@@ -0,0 +1,118 @@
+"""Plugin do pytest: orçamento de consultas SQL por rota.
+
+Durante cada teste, as requisições feitas ao app são contadas por
+``core.query_counter``. O teste falha se uma requisição passar do
+orçamento da rota em ``ROUTE_BUDGETS`` ou do limite do marcador
+``@pytest.mark.query_budget(n)``, que vale para todas as requisições do
+teste. Requisições feitas em fixtures não são verificadas.
+
+``pytest --query-report`` lista o máximo de consultas observado por rota,
+para ajustar os orçamentos ao mudar uma rota de propósito.
+
+Carregado por ``addopts = -p tests.query_budget`` no pytest.ini.
+"""
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+# Máximo de consultas por requisição, por (método, rota). Inclui a busca do
+# usuário em get_current_user quando o cache de principals está frio.
+ROUTE_BUDGETS: Dict[Tuple[str, str], int] = {
+    ("GET", "/api/v1/audit/"): 2,
+    ("POST", "/api/v1/auth/forgot-password"): 6,
+    ("POST", "/api/v1/auth/register"): 7,
+    ("POST", "/api/v1/auth/reset-password"): 5,
+    ("POST", "/api/v1/auth/token"): 7,
+    ("POST", "/api/v1/clients/"): 7,
+    ("GET", "/api/v1/clients/"): 1,
+    ("GET", "/api/v1/clients/search"): 1,
+    ("GET", "/api/v1/clients/{client_id}"): 1,
+    ("PUT", "/api/v1/clients/{client_id}"): 6,
+    ("DELETE", "/api/v1/clients/{client_id}"): 5,
+    ("GET", "/api/v1/dashboard/"): 5,
+    ("GET", "/api/v1/dashboard/activities"): 1,
+    ("POST", "/api/v1/quartos/"): 8,
+    ("GET", "/api/v1/quartos/"): 2,
+    ("GET", "/api/v1/quartos/calendario"): 3,
+    ("GET", "/api/v1/quartos/disponiveis"): 1,
+    ("GET", "/api/v1/quartos/{quarto_id}"): 1,
+    ("PUT", "/api/v1/quartos/{quarto_id}"): 6,
+    ("DELETE", "/api/v1/quartos/{quarto_id}"): 5,
+    ("POST", "/api/v1/reservas/"): 13,
+    ("GET", "/api/v1/reservas/"): 3,
+    ("GET", "/api/v1/reservas/export"): 1,
+    ("POST", "/api/v1/reservas/lote"): 19,
+    ("GET", "/api/v1/reservas/{reserva_id}"): 3,
+    ("PUT", "/api/v1/reservas/{reserva_id}"): 19,
+    ("DELETE", "/api/v1/reservas/{reserva_id}"): 14,
+}
+
+_MAXIMOS = pytest.StashKey[Dict[Tuple[str, str], int]]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-report",
+        action="store_true",
+        default=False,
+        help="lista o máximo de consultas SQL observado por rota",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries): limite de consultas SQL por requisição no teste",
+    )
+    config.stash[_MAXIMOS] = {}
+
+
+def _resumo(stats) -> str:
+    repetidas = stats.shapes.most_common(3)
+    return "\n".join(f"    {n}x {formato[:160]}" for formato, n in repetidas)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    from core.query_counter import add_observer, remove_observer
+
+    marcador = item.get_closest_marker("query_budget")
+    limite_do_teste = marcador.args[0] if marcador else None
+    maximos = item.config.stash[_MAXIMOS]
+    excedidas: List[str] = []
+
+    def observar(metodo: str, rota: str, stats) -> None:
+        chave = (metodo, rota)
+        maximos[chave] = max(maximos.get(chave, 0), stats.count)
+        limite = (
+            limite_do_teste
+            if limite_do_teste is not None
+            else ROUTE_BUDGETS.get(chave)
+        )
+        if limite is not None and stats.count > limite:
+            excedidas.append(
+                f"  {metodo} {rota}: {stats.count} consultas (orçamento {limite})\n"
+                + _resumo(stats)
+            )
+
+    add_observer(observar)
+    try:
+        resultado = yield
+    finally:
+        remove_observer(observar)
+    if excedidas:
+        pytest.fail(
+            "Orçamento de consultas SQL excedido:\n" + "\n".join(excedidas),
+            pytrace=False,
+        )
+    return resultado
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("--query-report"):
+        return
+    terminalreporter.section("consultas SQL por rota (máximo)")
+    for (metodo, rota), total in sorted(config.stash[_MAXIMOS].items(), key=lambda i: i[0][1]):
+        orcamento = ROUTE_BUDGETS.get((metodo, rota), "-")
+        terminalreporter.write_line(f"{total:>4} / {orcamento!s:>4}  {metodo:<6} {rota}")
@@ -0,0 +1,135 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from core.database import async_database_url, canonical_bind, get_route_db, register_bind_alias
+from main import app
+from models.audit_log import AuditLog
+from models.base import Base
+from models.client_model import Client
+
+
+def test_async_database_url_troca_driver():
+    assert async_database_url("mysql+pymysql://u:p@db:3306/hotel") == (
+        "mysql+aiomysql://u:p@db:3306/hotel"
+    )
+    assert async_database_url("sqlite:///./hotel.db") == "sqlite+aiosqlite:///./hotel.db"
+    with pytest.raises(ValueError):
+        async_database_url("postgresql://u:p@db/hotel")
+
+
+@pytest.fixture
+def headers(test_client: TestClient) -> dict:
+    """Usuário criado no banco da API, antes da troca da sessão async."""
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "asyncuser",
+            "email": "asyncuser@example.com",
+            "password": "AsyncUser123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "asyncuser", "password": "AsyncUser123!"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def banco_async(tmp_path, headers):
+    """Rotas async com AsyncSession (aiosqlite) sobre um arquivo SQLite."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(async_database_url(url), poolclass=NullPool)
+    register_bind_alias(async_engine.sync_engine, sync_engine)
+
+    async def override_get_route_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            yield db
+
+    anterior = app.dependency_overrides[get_route_db]
+    app.dependency_overrides[get_route_db] = override_get_route_db
+    try:
+        yield sync_engine, async_engine
+    finally:
+        app.dependency_overrides[get_route_db] = anterior
+        sync_engine.dispose()
+
+
+def test_rotas_de_clientes_com_sessao_assincrona(
+    test_client: TestClient, headers: dict, banco_async
+):
+    sync_engine, async_engine = banco_async
+    assert canonical_bind(async_engine.sync_engine) is sync_engine
+
+    criado = test_client.post(
+        "/api/v1/clients/",
+        json={
+            "name": "Cliente Async",
+            "email": "cliente.async@example.com",
+            "phone": "11999990000",
+            "document": "ASYNC-001",
+        },
+        headers=headers,
+    )
+    assert criado.status_code == 201
+    client_id = criado.json()["id"]
+
+    lista = test_client.get(
+        "/api/v1/clients/", params={"paginacao": "cursor"}, headers=headers
+    ).json()
+    assert [c["id"] for c in lista["items"]] == [client_id]
+    busca = test_client.get(
+        "/api/v1/clients/search", params={"q": "Async"}, headers=headers
+    ).json()
+    assert [c["id"] for c in busca] == [client_id]
+
+    atualizado = test_client.put(
+        f"/api/v1/clients/{client_id}", json={"phone": "11888880000"}, headers=headers
+    )
+    assert atualizado.json()["phone"] == "11888880000"
+
+    atividades = test_client.get(
+        "/api/v1/dashboard/activities", headers=headers
+    ).json()
+    assert sorted(a["action"] for a in atividades) == ["CREATE_CLIENT", "UPDATE_CLIENT"]
+
+    assert test_client.delete(
+        f"/api/v1/clients/{client_id}", headers=headers
+    ).status_code == 204
+    assert test_client.get(
+        f"/api/v1/clients/{client_id}", headers=headers
+    ).status_code == 404
+
+    # Tudo foi gravado no banco da sessão assíncrona
+    with Session(sync_engine) as db:
+        assert db.query(Client).count() == 0
+        registro = db.query(AuditLog).filter(AuditLog.action == "CREATE_CLIENT").one()
+        assert json.loads(registro.details) == {"client_name": "Cliente Async"}
+
+
+def test_autenticacao_com_sessao_assincrona(test_client: TestClient, banco_async):
+    sync_engine, _ = banco_async
+    dados = {"username": "asynclogin", "password": "AsyncLogin123!"}
+
+    registro = test_client.post(
+        "/api/v1/auth/register", json={**dados, "email": "asynclogin@example.com"}
+    )
+    assert registro.status_code == 201
+    assert test_client.post(
+        "/api/v1/auth/token", data={**dados, "password": "Errada123!"}
+    ).status_code == 401
+    login = test_client.post("/api/v1/auth/token", data=dados)
+    assert login.status_code == 200
+    assert login.json()["access_token"]
+
+    with Session(sync_engine) as db:
+        acoes = [acao for (acao,) in db.query(AuditLog.action).order_by(AuditLog.id)]
+        assert acoes == ["USER_CREATED", "LOGIN_FAILED", "LOGIN_SUCCESS"]
@@ -0,0 +1,107 @@
+import gzip
+from datetime import date, datetime
+
+import pytest
+
+from models.audit_log import AuditLog
+from services import audit_archive
+
+
+@pytest.fixture
+def arquivo_dir(tmp_path):
+    return str(tmp_path / "audit_archive")
+
+
+def _seed(db):
+    registros = []
+    for mes, quantidade in (("2024-01", 3), ("2024-02", 2), ("2024-03", 2), ("2024-04", 1)):
+        for i in range(quantidade):
+            registros.append(
+                AuditLog(
+                    user_id=i % 2 + 1,
+                    action="LOGIN_SUCCESS",
+                    resource="AUTH",
+                    resource_id=None,
+                    timestamp=datetime.strptime(f"{mes}-1{i} 10:00", "%Y-%m-%d %H:%M"),
+                )
+            )
+    db.add_all(registros)
+    db.commit()
+
+
+def test_retencao_move_meses_antigos_para_arquivo(isolated_session, arquivo_dir):
+    db = isolated_session
+    _seed(db)
+
+    arquivados = audit_archive.aplicar_retencao(
+        db, hoje=date(2024, 4, 20), meses=2, diretorio=arquivo_dir
+    )
+
+    assert arquivados == [("2024-01", 3), ("2024-02", 2)]
+    assert audit_archive.meses_arquivados(arquivo_dir) == ["2024-01", "2024-02"]
+    restantes = db.query(AuditLog.timestamp).all()
+    assert len(restantes) == 3
+    assert all(ts >= datetime(2024, 3, 1) for (ts,) in restantes)
+
+    with gzip.open(audit_archive.caminho_arquivo("2024-01", arquivo_dir), "rt") as f:
+        assert len(f.readlines()) == 3
+
+    # Executar de novo não arquiva nada
+    assert audit_archive.aplicar_retencao(
+        db, hoje=date(2024, 4, 20), meses=2, diretorio=arquivo_dir
+    ) == []
+
+
+def test_consulta_le_tabela_e_meses_arquivados(isolated_session, arquivo_dir):
+    db = isolated_session
+    _seed(db)
+    audit_archive.aplicar_retencao(
+        db, hoje=date(2024, 4, 20), meses=2, diretorio=arquivo_dir
+    )
+
+    todos = audit_archive.consultar_auditoria(db, diretorio=arquivo_dir)
+    assert len(todos) == 8
+    timestamps = [registro["timestamp"] for registro in todos]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+    fevereiro = audit_archive.consultar_auditoria(
+        db,
+        inicio=datetime(2024, 2, 1),
+        fim=datetime(2024, 3, 1),
+        diretorio=arquivo_dir,
+    )
+    assert [r["timestamp"].month for r in fevereiro] == [2, 2]
+
+    do_usuario = audit_archive.consultar_auditoria(
+        db, user_id=2, diretorio=arquivo_dir
+    )
+    assert {r["user_id"] for r in do_usuario} == {2}
+    assert len(do_usuario) == 3
+
+    limitados = audit_archive.consultar_auditoria(db, limit=4, diretorio=arquivo_dir)
+    assert [r["timestamp"].month for r in limitados] == [4, 3, 3, 2]
+
+    with pytest.raises(ValueError):
+        audit_archive.consultar_auditoria(db, senha="x", diretorio=arquivo_dir)
+
+
+def test_arquivar_mes_repetido_nao_duplica_leitura(isolated_session, arquivo_dir):
+    db = isolated_session
+    _seed(db)
+    registros = (
+        db.query(AuditLog)
+        .filter(AuditLog.timestamp < datetime(2024, 2, 1))
+        .all()
+    )
+    copia = [
+        {c: getattr(r, c) for c in audit_archive.COLUNAS} for r in registros
+    ]
+
+    assert audit_archive.arquivar_mes(db, "2024-01", arquivo_dir) == 3
+    # Simula uma remoção que falhou após o arquivo ser gravado
+    db.add_all(AuditLog(**registro) for registro in copia)
+    db.commit()
+    assert audit_archive.arquivar_mes(db, "2024-01", arquivo_dir) == 3
+
+    lidos = list(audit_archive.ler_arquivo("2024-01", arquivo_dir))
+    assert sorted(r["id"] for r in lidos) == sorted(r["id"] for r in copia)
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from core.database import get_db
+from main import app
+from models.audit_log import AuditLog
+from models.user_model import User, UserRole
+from services import audit_archive
+from services.audit_archive import consultar_auditoria
+from services.audit_service import AuditService
+
+
+def _seed(db, total=30):
+    inicio = datetime(2024, 5, 1, 8, 0)
+    for i in range(total):
+        db.add(
+            AuditLog(
+                user_id=i % 3 + 1,
+                action="UPDATE" if i % 2 else "CREATE",
+                resource="RESERVATION",
+                resource_id=i % 5,
+                ip_address=f"10.0.0.{i % 4}",
+                # Timestamps repetidos exercitam o desempate por id
+                timestamp=inicio + timedelta(minutes=i // 2),
+            )
+        )
+    db.commit()
+
+
+def test_log_action_extrai_campos_de_details(isolated_session):
+    db = isolated_session
+    reserva = AuditService.log_action(
+        db=db,
+        user_id=1,
+        action="CREATE_RESERVATION",
+        resource="RESERVATION",
+        resource_id=10,
+        details={"client_id": 7, "quarto_id": 3},
+    )
+    falha = AuditService.log_login(
+        db=db, user_id=1, success=False, details={"reason": "invalid_password"}
+    )
+
+    assert (reserva.client_id, reserva.quarto_id, reserva.reason) == (7, 3, None)
+    assert falha.reason == "invalid_password"
+    assert [r["id"] for r in consultar_auditoria(db, client_id=7)] == [reserva.id]
+    assert [r["id"] for r in consultar_auditoria(db, reason="invalid_password")] == [falha.id]
+
+
+def test_paginacao_keyset_percorre_tudo_sem_repetir(isolated_session):
+    db = isolated_session
+    _seed(db)
+
+    vistos, antes = [], None
+    while True:
+        pagina = consultar_auditoria(db, limit=7, antes=antes, user_id=2)
+        if not pagina:
+            break
+        vistos.extend(pagina)
+        antes = (pagina[-1]["timestamp"], pagina[-1]["id"])
+
+    esperado = (
+        db.query(AuditLog.id)
+        .filter(AuditLog.user_id == 2)
+        .order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        .all()
+    )
+    assert [r["id"] for r in vistos] == [id_ for (id_,) in esperado]
+
+
+def test_filtros_usam_indices_compostos(isolated_session):
+    db = isolated_session
+    _seed(db)
+    engine = db.get_bind()
+    filtros = (
+        {"user_id": 1},
+        {"resource": "RESERVATION", "resource_id": 2},
+        {"action": "UPDATE"},
+        {"ip_address": "10.0.0.1"},
+        {"client_id": 4},
+    )
+
+    for filtro in filtros:
+        capturadas = []
+
+        def capturar(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                capturadas.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capturar)
+        try:
+            consultar_auditoria(
+                db, inicio=datetime(2024, 5, 1), limit=5, **filtro
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capturar)
+
+        with engine.connect() as conn:
+            for statement, parameters in capturadas:
+                plano = " ".join(
+                    row[-1]
+                    for row in conn.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statement}", parameters
+                    )
+                )
+                assert "USING INDEX ix_audit_logs_" in plano, (filtro, plano)
+                assert "_timestamp" in plano, (filtro, plano)
+
+
+def _admin_headers(test_client: TestClient) -> dict:
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "auditadmin",
+            "email": "auditadmin@example.com",
+            "password": "AuditAdmin123!",
+        },
+    )
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        user = db.query(User).filter(User.username == "auditadmin").one()
+        user.role = UserRole.ADMIN
+        db.commit()
+    finally:
+        db.close()
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "auditadmin", "password": "AuditAdmin123!"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_audit_endpoint_pagina_com_cursor(test_client: TestClient):
+    headers = _admin_headers(test_client)
+
+    primeira = test_client.get(
+        "/api/v1/audit/",
+        params={"action": "LOGIN_SUCCESS", "limit": 1},
+        headers=headers,
+    )
+    assert primeira.status_code == 200
+    corpo = primeira.json()
+    assert len(corpo["items"]) == 1
+    assert corpo["items"][0]["action"] == "LOGIN_SUCCESS"
+
+    # Um segundo login gera outro registro e a página seguinte o precede
+    test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "auditadmin", "password": "AuditAdmin123!"},
+    )
+    recente = test_client.get(
+        "/api/v1/audit/",
+        params={"action": "LOGIN_SUCCESS", "user_id": corpo["items"][0]["user_id"], "limit": 1},
+        headers=headers,
+    ).json()
+    assert recente["next_cursor"]
+    seguinte = test_client.get(
+        "/api/v1/audit/",
+        params={"action": "LOGIN_SUCCESS", "limit": 1, "cursor": recente["next_cursor"]},
+        headers=headers,
+    ).json()
+    assert seguinte["items"][0]["id"] < recente["items"][0]["id"]
+
+    invalido = test_client.get(
+        "/api/v1/audit/", params={"cursor": "xyz"}, headers=headers
+    )
+    assert invalido.status_code == 400
+
+    periodo = test_client.get(
+        "/api/v1/audit/",
+        params={"inicio": "2024-02-01T00:00:00", "fim": "2024-01-01T00:00:00"},
+        headers=headers,
+    )
+    assert periodo.status_code == 400
+
+
+def test_audit_endpoint_aceita_datas_com_fuso(test_client: TestClient, tmp_path, monkeypatch):
+    headers = _admin_headers(test_client)
+    monkeypatch.setattr(audit_archive, "AUDIT_ARCHIVE_DIR", str(tmp_path))
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        db.add(
+            AuditLog(action="ARQUIVADO", resource="AUTH", timestamp=datetime(2020, 1, 15, 10, 0))
+        )
+        db.commit()
+        assert audit_archive.arquivar_mes(db, "2020-01") == 1
+    finally:
+        db.close()
+
+    def buscar(**params):
+        resposta = test_client.get(
+            "/api/v1/audit/", params={"action": "ARQUIVADO", **params}, headers=headers
+        )
+        assert resposta.status_code == 200, resposta.text
+        return resposta.json()["items"]
+
+    # 06:00 em -03:00 = 09:00 UTC, antes do registro das 10:00 UTC
+    assert len(buscar(inicio="2020-01-15T06:00:00-03:00", fim="2020-02-01T00:00:00Z")) == 1
+    # 08:00 em -03:00 = 11:00 UTC, depois do registro
+    assert buscar(inicio="2020-01-15T08:00:00-03:00") == []
+    # Início com fuso e fim sem fuso
+    assert len(buscar(inicio="2020-01-01T00:00:00Z", fim="2020-01-16T00:00:00")) == 1
+
+
+def test_audit_endpoint_exige_admin(test_client: TestClient):
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "auditviewer",
+            "email": "auditviewer@example.com",
+            "password": "AuditViewer123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "auditviewer", "password": "AuditViewer123!"},
+    ).json()["access_token"]
+
+    resposta = test_client.get(
+        "/api/v1/audit/", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resposta.status_code == 403
@@ -0,0 +1,208 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+
+from models.audit_log import AuditLog
+from models.base import Base
+from services.audit_service import AuditService
+from services import audit_writer as audit_writer_module
+from services.audit_writer import AuditWriter, _trava_exclusiva
+
+
+def _registro(i: int) -> dict:
+    return {
+        "user_id": None,
+        "action": "TEST",
+        "resource": "teste",
+        "resource_id": i,
+        "ip_address": "127.0.0.1",
+        "user_agent": "pytest",
+        "details": None,
+        "timestamp": datetime(2024, 1, 1, 12, 0, i % 60),
+    }
+
+
+def _total(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(AuditLog)).scalar()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = AuditWriter(
+        batch_size=10,
+        flush_interval_ms=50,
+        max_queue_size=100,
+        spill_path=str(tmp_path / "audit_spill.jsonl"),
+    )
+    try:
+        yield writer
+    finally:
+        writer.stop()
+
+
+def test_grava_em_lotes(engine, writer):
+    writer.start(engine)
+    for i in range(25):
+        writer.enqueue(_registro(i))
+    writer.flush()
+
+    assert _total(engine) == 25
+    stats = writer.stats()
+    assert stats["written"] == 25
+    assert stats["spilled"] == 0
+    assert stats["batches"] <= 5
+
+
+def test_stop_esvazia_a_fila(engine, tmp_path):
+    writer = AuditWriter(
+        batch_size=1000,
+        flush_interval_ms=60_000,
+        spill_path=str(tmp_path / "audit_spill.jsonl"),
+    )
+    writer.start(engine)
+    for i in range(30):
+        writer.enqueue(_registro(i))
+    writer.stop()
+
+    assert not writer.running
+    assert _total(engine) == 30
+
+
+def test_banco_indisponivel_vai_para_arquivo_e_e_reimportado(engine, writer):
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_off"))
+    writer.start(engine)
+    for i in range(5):
+        writer.enqueue(_registro(i))
+    writer.flush()
+
+    with open(writer.spill_path, encoding="utf-8") as arquivo:
+        linhas = [json.loads(linha) for linha in arquivo]
+    assert [linha["resource_id"] for linha in linhas] == list(range(5))
+    assert writer.stats()["spilled"] == 5
+
+    writer.stop()
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE audit_logs_off RENAME TO audit_logs"))
+    writer.start(engine)
+
+    assert _total(engine) == 5
+    with pytest.raises(FileNotFoundError):
+        open(writer.spill_path)
+
+
+def _linha(i: int) -> str:
+    return json.dumps({**_registro(i), "timestamp": "2024-01-01T12:00:00"})
+
+
+def test_linha_truncada_e_replay_interrompido(engine, writer):
+    # Sobra de uma reimportação interrompida
+    with open(f"{writer.spill_path}.replay", "w", encoding="utf-8") as arquivo:
+        arquivo.write(_linha(1) + "\n" + _linha(2)[:30])
+    # Queda no meio da escrita deixou a última linha truncada
+    with open(writer.spill_path, "w", encoding="utf-8") as arquivo:
+        arquivo.write(_linha(3) + "\n" + _linha(4)[:40])
+
+    writer.start(engine)
+
+    assert writer.running
+    with engine.connect() as conn:
+        ids = conn.execute(select(AuditLog.resource_id).order_by(AuditLog.resource_id)).scalars()
+        assert list(ids) == [1, 3]
+    with open(writer.rejected_path, encoding="utf-8") as arquivo:
+        assert len(arquivo.readlines()) == 2
+    assert writer.stats()["rejected"] == 2
+    for sufixo in ("", ".replay"):
+        with pytest.raises(FileNotFoundError):
+            open(writer.spill_path + sufixo)
+
+
+@pytest.mark.skipif(audit_writer_module.fcntl is None, reason="requer fcntl")
+def test_replay_de_outro_processo_nao_duplica(engine, writer):
+    with open(writer.spill_path, "w", encoding="utf-8") as arquivo:
+        arquivo.write(_linha(1) + "\n" + _linha(2) + "\n")
+    outro = AuditWriter(spill_path=writer.spill_path)
+    outro._engine = engine
+
+    # Outro worker está reimportando: este não toca no arquivo
+    with _trava_exclusiva(writer.lock_path) as obtida:
+        assert obtida
+        writer.start(engine)
+    assert _total(engine) == 0
+    with open(writer.spill_path, encoding="utf-8") as arquivo:
+        assert len(arquivo.readlines()) == 2
+
+    assert outro.replay_spill() == (2, 0)
+    assert outro.replay_spill() == (0, 0)
+    assert _total(engine) == 2
+
+
+def test_registro_invalido_nao_descarta_o_lote(engine, writer):
+    writer.start(engine)
+    for i in range(5):
+        registro = _registro(i)
+        if i == 2:
+            registro["action"] = None
+        writer.enqueue(registro)
+    writer.flush()
+
+    assert _total(engine) == 4
+    stats = writer.stats()
+    assert (stats["written"], stats["rejected"], stats["spilled"]) == (4, 1, 0)
+    with open(writer.rejected_path, encoding="utf-8") as arquivo:
+        assert json.loads(arquivo.read())["resource_id"] == 2
+
+
+def test_fila_cheia_vai_para_arquivo(engine, tmp_path):
+    writer = AuditWriter(
+        batch_size=10,
+        flush_interval_ms=50,
+        max_queue_size=2,
+        spill_path=str(tmp_path / "audit_spill.jsonl"),
+    )
+    # Sem a thread de gravação, a fila enche após dois registros
+    for i in range(5):
+        writer.enqueue(_registro(i))
+
+    assert writer.stats()["queued"] == 2
+    assert writer.stats()["spilled"] == 3
+
+    writer.start(engine)
+    writer.flush()
+    writer.stop()
+    assert _total(engine) == 5
+
+
+def test_log_action_enfileira_quando_writer_ativo(engine, tmp_path, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+
+    from services import audit_service
+
+    writer = AuditWriter(spill_path=str(tmp_path / "audit_spill.jsonl"))
+    monkeypatch.setattr(audit_service, "audit_writer", writer)
+    writer.start(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        log = AuditService.log_action(
+            db=db, user_id=None, action="LOGIN", resource="auth", details={"ok": True}
+        )
+        assert log.id is None
+        assert not db.new
+        writer.flush()
+        assert _total(engine) == 1
+    finally:
+        writer.stop()
+        db.close()
@@ -1,4 +1,10 @@
+import asyncio
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from core.database import get_db
+from main import app
 
 
 def test_register_user(test_client: TestClient):
@@ -42,3 +48,43 @@ def test_login_for_access_token(test_client: TestClient):
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_auth_nao_acessa_o_banco_no_event_loop(test_client: TestClient):
+    """
+    Testa que registro, login e reset de senha consultam o banco fora do
+    event loop (a sessão síncrona roda no executor de serviços).
+    """
+    db = next(app.dependency_overrides[get_db]())
+    engine = db.get_bind()
+    db.close()
+    no_loop = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        no_loop.append(statement)
+
+    dados = {"username": "loopuser", "password": "LoopUser123!"}
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        assert test_client.post(
+            "/api/v1/auth/register", json={**dados, "email": "loopuser@example.com"}
+        ).status_code == 201
+        assert test_client.post(
+            "/api/v1/auth/token", data={**dados, "password": "Errada123!"}
+        ).status_code == 401
+        assert test_client.post("/api/v1/auth/token", data=dados).status_code == 200
+        token = test_client.post(
+            "/api/v1/auth/forgot-password", params={"username": "loopuser"}
+        ).json()["reset_token"]
+        assert test_client.post(
+            "/api/v1/auth/reset-password",
+            params={"token": token, "new_password": "LoopUser456!"},
+        ).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert no_loop == []
@@ -0,0 +1,292 @@
+from datetime import date, timedelta
+
+import pytest
+
+from core.database import get_db
+from main import app
+from models.client_model import Client
+from models.quarto import Quarto
+from schemas.reserva import ReservaCreate, ReservaUpdate
+from services import reserva_service
+from services.availability_index import AvailabilityIndex, availability_index
+from services.client_service import ClientService
+
+
+@pytest.fixture(scope="function")
+def indexed_session(isolated_session):
+    """Sessão isolada com o índice global carregado a partir dela."""
+    availability_index.load(isolated_session)
+    try:
+        yield isolated_session
+    finally:
+        availability_index.invalidate()
+
+
+def _seed(db):
+    quarto = Quarto(numero="101", tipo="standard", valor_diaria=100.0)
+    client = Client(
+        name="Cliente Índice",
+        email="indice@example.com",
+        phone="123",
+        document="999",
+    )
+    db.add_all([quarto, client])
+    db.commit()
+    return quarto, client
+
+
+def _reservar(db, quarto, client, checkin, noites):
+    return reserva_service.create_reserva(
+        db,
+        ReservaCreate(
+            quarto_id=quarto.id,
+            client_id=client.id,
+            data_checkin=checkin,
+            data_checkout=checkin + timedelta(days=noites),
+        ),
+    )
+
+
+def test_index_answers_overlap_queries(indexed_session):
+    """Testa as consultas de sobreposição respondidas pelo índice."""
+    quarto, client = _seed(indexed_session)
+    inicio = date(2030, 1, 10)
+    reserva = _reservar(indexed_session, quarto, client, inicio, 3)
+
+    assert availability_index.is_ready(indexed_session)
+    fim = reserva.data_checkout
+    assert not availability_index.is_available(quarto.id, inicio, fim)
+    assert not availability_index.is_available(
+        quarto.id, inicio - timedelta(days=1), inicio + timedelta(days=1)
+    )
+    # Check-out e check-in no mesmo dia não conflitam
+    assert availability_index.is_available(quarto.id, fim, fim + timedelta(days=2))
+    assert availability_index.is_available(quarto.id, inicio - timedelta(days=2), inicio)
+    assert availability_index.is_available(
+        quarto.id, inicio, fim, reserva_id_a_ignorar=reserva.id
+    )
+
+
+def test_index_follows_reserva_mutations(indexed_session):
+    """Testa que criação, alteração de datas e cancelamento atualizam o índice."""
+    quarto, client = _seed(indexed_session)
+    inicio = date(2030, 2, 1)
+    reserva = _reservar(indexed_session, quarto, client, inicio, 2)
+
+    novo_inicio = inicio + timedelta(days=10)
+    reserva_service.update_reserva(
+        indexed_session,
+        reserva.id,
+        ReservaUpdate(data_checkin=novo_inicio, data_checkout=novo_inicio + timedelta(days=2)),
+    )
+    assert availability_index.is_available(quarto.id, inicio, inicio + timedelta(days=2))
+    assert not availability_index.is_available(
+        quarto.id, novo_inicio, novo_inicio + timedelta(days=1)
+    )
+
+    reserva_service.cancel_reserva(indexed_session, reserva.id)
+    assert availability_index.is_available(
+        quarto.id, novo_inicio, novo_inicio + timedelta(days=2)
+    )
+    assert availability_index.diff(indexed_session).consistent
+
+
+def test_index_discards_reservas_of_deleted_client(indexed_session):
+    """Testa que a exclusão em cascata de um cliente remove suas reservas."""
+    quarto, client = _seed(indexed_session)
+    inicio = date(2030, 3, 1)
+    _reservar(indexed_session, quarto, client, inicio, 2)
+
+    ClientService.delete_client(indexed_session, client.id)
+
+    assert availability_index.is_available(quarto.id, inicio, inicio + timedelta(days=2))
+    assert availability_index.diff(indexed_session).consistent
+
+
+def test_diff_reports_divergences(isolated_session):
+    """Testa a verificação de consistência contra a tabela de reservas."""
+    quarto, client = _seed(isolated_session)
+    index = AvailabilityIndex()
+    index.load(isolated_session)
+
+    reserva = _reservar(isolated_session, quarto, client, date(2030, 4, 1), 2)
+
+    diff = index.diff(isolated_session)
+    assert not diff.consistent
+    assert diff.missing == [reserva.id]
+
+
+def test_cold_index_falls_back_to_sql(isolated_session):
+    """Testa que um índice não carregado não responde pela sessão."""
+    quarto, client = _seed(isolated_session)
+    inicio = date(2030, 5, 1)
+    _reservar(isolated_session, quarto, client, inicio, 2)
+
+    assert not availability_index.is_ready(isolated_session)
+    assert not reserva_service.is_quarto_disponivel(
+        isolated_session, quarto.id, inicio, inicio + timedelta(days=1)
+    )
+
+
+@pytest.fixture
+def api_headers(test_client):
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "indiceapi",
+            "email": "indiceapi@example.com",
+            "password": "IndiceApi123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "indiceapi", "password": "IndiceApi123!"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def api_index_session():
+    """Índice global carregado a partir do banco usado pela API nos testes."""
+    db = next(app.dependency_overrides[get_db]())
+    availability_index.load(db)
+    try:
+        yield db
+    finally:
+        availability_index.invalidate()
+        db.close()
+
+
+def _espiar_indice(monkeypatch):
+    respostas = []
+    original = availability_index.is_available
+
+    def is_available(*args, **kwargs):
+        respostas.append(original(*args, **kwargs))
+        return respostas[-1]
+
+    monkeypatch.setattr(availability_index, "is_available", is_available)
+    return respostas
+
+
+def _post_reserva(test_client, headers, quarto, client, checkin, noites):
+    return test_client.post(
+        "/api/v1/reservas/",
+        json={
+            "quarto_id": quarto.id,
+            "client_id": client.id,
+            "data_checkin": str(checkin),
+            "data_checkout": str(checkin + timedelta(days=noites)),
+        },
+        headers=headers,
+    )
+
+
+def test_api_usa_o_indice_carregado(
+    test_client, api_headers, api_index_session, monkeypatch
+):
+    """Testa POST /reservas pelo índice carregado a partir do banco da API."""
+    quarto = Quarto(numero="IDX-API-1", tipo="standard", valor_diaria=100.0)
+    client = Client(
+        name="Cliente Índice API",
+        email="indice.api@example.com",
+        phone="123",
+        document="IDX-API-1",
+    )
+    api_index_session.add_all([quarto, client])
+    api_index_session.commit()
+    respostas = _espiar_indice(monkeypatch)
+    inicio = date(2031, 1, 10)
+
+    assert _post_reserva(test_client, api_headers, quarto, client, inicio, 3).status_code == 201
+    assert respostas == [True]
+    # A reserva criada pela API entra no índice
+    assert not availability_index.is_available(
+        quarto.id, inicio, inicio + timedelta(days=1)
+    )
+    respostas.clear()
+
+    conflito = _post_reserva(
+        test_client, api_headers, quarto, client, inicio + timedelta(days=1), 2
+    )
+    assert conflito.status_code == 409
+    assert respostas == [False]
+
+    livre = _post_reserva(
+        test_client, api_headers, quarto, client, inicio + timedelta(days=3), 2
+    )
+    assert livre.status_code == 201
+    assert respostas == [False, True]
+    assert availability_index.diff(api_index_session).consistent
+
+
+def test_api_sem_indice_usa_sql(test_client, api_headers, api_index_session, monkeypatch):
+    """Testa que, com o índice descartado, POST /reservas consulta o banco."""
+    quarto = Quarto(numero="IDX-API-2", tipo="standard", valor_diaria=100.0)
+    client = Client(
+        name="Cliente Índice SQL",
+        email="indice.sql@example.com",
+        phone="123",
+        document="IDX-API-2",
+    )
+    api_index_session.add_all([quarto, client])
+    api_index_session.commit()
+    inicio = date(2031, 2, 10)
+    assert _post_reserva(test_client, api_headers, quarto, client, inicio, 3).status_code == 201
+
+    availability_index.invalidate()
+    respostas = _espiar_indice(monkeypatch)
+
+    conflito = _post_reserva(test_client, api_headers, quarto, client, inicio, 1)
+    assert conflito.status_code == 409
+    livre = _post_reserva(
+        test_client, api_headers, quarto, client, inicio + timedelta(days=3), 1
+    )
+    assert livre.status_code == 201
+    assert respostas == []
+
+
+def test_api_confirma_no_banco_o_conflito_do_indice(
+    test_client, api_headers, api_index_session, monkeypatch
+):
+    """Testa que uma reserva cancelada por outro processo libera o quarto.
+
+    O cancelamento passa por um índice separado, como num outro worker, e
+    o índice deste processo continua com o período; a nova reserva deve ser
+    aceita.
+    """
+    quarto = Quarto(numero="IDX-API-3", tipo="standard", valor_diaria=100.0)
+    client = Client(
+        name="Cliente Índice Antigo",
+        email="indice.antigo@example.com",
+        phone="123",
+        document="IDX-API-3",
+    )
+    api_index_session.add_all([quarto, client])
+    api_index_session.commit()
+    inicio = date(2031, 3, 10)
+    criada = _post_reserva(test_client, api_headers, quarto, client, inicio, 3)
+    assert criada.status_code == 201
+
+    monkeypatch.setattr(reserva_service, "availability_index", AvailabilityIndex())
+    reserva_service.update_reserva(
+        api_index_session,
+        criada.json()["id"],
+        ReservaUpdate(status=reserva_service.STATUS_CANCELADA),
+    )
+    monkeypatch.setattr(reserva_service, "availability_index", availability_index)
+    assert not availability_index.is_available(
+        quarto.id, inicio, inicio + timedelta(days=1)
+    )
+    respostas = _espiar_indice(monkeypatch)
+
+    nova = _post_reserva(
+        test_client, api_headers, quarto, client, inicio + timedelta(days=1), 2
+    )
+    assert nova.status_code == 201
+    # O índice ainda tinha o período cancelado; o banco desfez o engano
+    assert respostas == [False]
+    # e o índice é recarregado no próximo uso
+    assert availability_index.stats()["stale"]
+    assert availability_index.is_ready(api_index_session)
+    assert availability_index.diff(api_index_session).consistent
@@ -0,0 +1,165 @@
+import json
+from datetime import date, timedelta
+
+from models.client_model import Client
+from models.quarto import Quarto
+from models.reserva import Reserva
+from services.calendario_grid import montar_calendario
+
+INICIO = date(2030, 3, 1)
+FIM = date(2030, 3, 10)
+
+
+def _seed(db):
+    livre = Quarto(numero="401", tipo="standard", valor_diaria=100.0)
+    reservado = Quarto(numero="402", tipo="suite", valor_diaria=250.0, status="ocupado")
+    client = Client(
+        name="Cliente Calendário",
+        email="calendario@example.com",
+        phone="123",
+        document="777",
+    )
+    db.add_all([livre, reservado, client])
+    db.flush()
+
+    def reserva(checkin, checkout, status="pendente"):
+        return Reserva(
+            quarto_id=reservado.id,
+            client_id=client.id,
+            data_checkin=checkin,
+            data_checkout=checkout,
+            valor_total=100.0,
+            status=status,
+        )
+
+    reservas = [
+        # Começa antes do período: não há dia de check-in visível
+        reserva(INICIO - timedelta(days=2), INICIO + timedelta(days=2), "ativa"),
+        reserva(INICIO + timedelta(days=4), INICIO + timedelta(days=6)),
+        reserva(INICIO + timedelta(days=7), INICIO + timedelta(days=9), "cancelada"),
+        # Termina depois do período
+        reserva(FIM, FIM + timedelta(days=3)),
+    ]
+    db.add_all(reservas)
+    db.commit()
+    return livre, reservado, client, reservas
+
+
+def test_grid_codes_follow_reservation_nights(isolated_session):
+    """Testa os status gerados para cada dia a partir dos intervalos."""
+    livre, reservado, client, reservas = _seed(isolated_session)
+    hoje = INICIO + timedelta(days=8)
+
+    calendario = montar_calendario(isolated_session, INICIO, FIM, hoje=hoje).to_models()
+
+    assert [quarto.numero for quarto in calendario] == ["401", "402"]
+    assert {dia.status for dia in calendario[0].ocupacao} == {"livre"}
+
+    dias = calendario[1].ocupacao
+    assert len(dias) == 10
+    assert [dia.status for dia in dias] == [
+        "ocupado",
+        "ocupado",
+        "livre",  # dia do check-out fica livre
+        "livre",
+        "checkin",
+        "ocupado",
+        "livre",
+        "livre",  # reserva cancelada não ocupa
+        "ocupado",  # quarto marcado como ocupado hoje, sem reserva
+        "checkin",
+    ]
+    assert [dia.reserva_id for dia in dias] == [
+        reservas[0].id,
+        reservas[0].id,
+        None,
+        None,
+        reservas[1].id,
+        reservas[1].id,
+        None,
+        None,
+        None,
+        reservas[3].id,
+    ]
+    assert dias[0].reserva_status == "ativa"
+    assert dias[4].cliente_id == client.id
+
+
+def test_json_matches_pydantic_serialization(isolated_session):
+    """Testa que o JSON direto é idêntico ao dos schemas pydantic."""
+    _seed(isolated_session)
+    grid = montar_calendario(
+        isolated_session, INICIO, FIM, hoje=INICIO + timedelta(days=8)
+    )
+
+    esperado = [quarto.model_dump(mode="json") for quarto in grid.to_models()]
+    assert json.loads(grid.to_json()) == esperado
+
+
+def test_empty_hotel_returns_empty_list(isolated_session):
+    """Testa o calendário sem quartos cadastrados."""
+    grid = montar_calendario(isolated_session, INICIO, FIM)
+    assert grid.to_json() == b"[]"
+    assert grid.to_models() == []
+
+
+def _expandir(segmentos_json):
+    """Reconstrói (data, status, reserva_id) por dia a partir dos segmentos."""
+    dias = []
+    for inicio, fim, status, reserva_id in segmentos_json:
+        dia = date.fromisoformat(inicio)
+        while dia <= date.fromisoformat(fim):
+            dias.append((dia.isoformat(), status, reserva_id))
+            dia += timedelta(days=1)
+    return dias
+
+
+def test_compact_segments_collapse_consecutive_days(isolated_session):
+    """Testa os segmentos do formato compacto contra o formato completo."""
+    _, _, _, reservas = _seed(isolated_session)
+    grid = montar_calendario(
+        isolated_session, INICIO, FIM, hoje=INICIO + timedelta(days=8)
+    )
+
+    completo = json.loads(grid.to_json())
+    compacto = json.loads(grid.to_json_compacto())
+
+    assert compacto[0]["segmentos"] == [["2030-03-01", "2030-03-10", "livre", None]]
+    assert compacto[1]["segmentos"] == [
+        ["2030-03-01", "2030-03-02", "ocupado", reservas[0].id],
+        ["2030-03-03", "2030-03-04", "livre", None],
+        ["2030-03-05", "2030-03-05", "checkin", reservas[1].id],
+        ["2030-03-06", "2030-03-06", "ocupado", reservas[1].id],
+        ["2030-03-07", "2030-03-08", "livre", None],
+        ["2030-03-09", "2030-03-09", "ocupado", None],
+        ["2030-03-10", "2030-03-10", "checkin", reservas[3].id],
+    ]
+    for quarto_completo, quarto_compacto in zip(completo, compacto):
+        assert _expandir(quarto_compacto["segmentos"]) == [
+            (dia["data"], dia["status"], dia["reserva_id"])
+            for dia in quarto_completo["ocupacao"]
+        ]
+
+
+def test_compact_segments_with_overlapping_reservations(isolated_session):
+    """Testa que sobreposições legadas seguem o mesmo dono da grade."""
+    _, reservado, client, _ = _seed(isolated_session)
+    isolated_session.add(
+        Reserva(
+            quarto_id=reservado.id,
+            client_id=client.id,
+            data_checkin=INICIO + timedelta(days=5),
+            data_checkout=INICIO + timedelta(days=8),
+            valor_total=100.0,
+            status="pendente",
+        )
+    )
+    isolated_session.commit()
+    grid = montar_calendario(isolated_session, INICIO, FIM)
+
+    completo = json.loads(grid.to_json())[1]
+    compacto = json.loads(grid.to_json_compacto())[1]
+    assert _expandir(compacto["segmentos"]) == [
+        (dia["data"], dia["status"], dia["reserva_id"])
+        for dia in completo["ocupacao"]
+    ]
@@ -153,3 +153,64 @@ def test_delete_client(test_client: TestClient, auth_headers: dict):
         headers=auth_headers,
     )
     assert response_get.status_code == 404
+
+
+def test_list_clients_cursor_pagination(test_client: TestClient, auth_headers: dict):
+    """Testa a paginação por cursor da listagem de clientes."""
+    for i in range(3):
+        test_client.post(
+            "/api/v1/clients/",
+            json={
+                "name": f"Cursor Client {i}",
+                "email": f"cursor{i}@example.com",
+                "phone": "1234567890",
+                "document": f"CURSOR-{i}",
+            },
+            headers=auth_headers,
+        )
+
+    vistos = []
+    cursor = None
+    while True:
+        params = {"paginacao": "cursor", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = test_client.get("/api/v1/clients/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        vistos.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    todos = test_client.get("/api/v1/clients/", params={"limit": 1000}, headers=auth_headers).json()
+    assert vistos == sorted(c["id"] for c in todos)
+
+    response = test_client.get("/api/v1/clients/", params={"cursor": "invalido"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("params", [
+    {"paginacao": "cursor", "limit": 0},
+    {"limit": -1},
+    {"limit": 1001},
+    {"skip": -1},
+])
+@pytest.mark.parametrize("url", ["/api/v1/clients/", "/api/v1/clients/search?q=a"])
+def test_list_clients_rejeita_limit_fora_dos_limites(
+    test_client: TestClient, auth_headers: dict, url: str, params: dict
+):
+    """Testa que skip/limit fora dos limites respondem 422."""
+    test_client.post(
+        "/api/v1/clients/",
+        json={
+            "name": "Limite Client",
+            "email": "limite@example.com",
+            "phone": "1234567890",
+            "document": "LIMITE-1",
+        },
+        headers=auth_headers,
+    )
+    response = test_client.get(url, params=params, headers=auth_headers)
+    assert response.status_code == 422
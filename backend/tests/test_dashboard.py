@@ -0,0 +1,287 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from models.dashboard_counter import DashboardCounter
+from models.reserva import Reserva
+from schemas.client_schemas import ClientCreate
+from schemas.quarto import QuartoCreate
+from schemas.reserva import ReservaCreate, ReservaUpdate
+from services import dashboard_counters, dashboard_service, quarto_service, reserva_service
+from services.client_service import ClientService
+from services.dashboard_cache import DashboardCache, dashboard_cache
+
+
+@pytest.fixture(scope="function")
+def dashboard_session(isolated_session):
+    """Sessão isolada com o cache global do dashboard zerado."""
+    dashboard_cache.invalidate()
+    dashboard_cache.reset_stats()
+    try:
+        yield isolated_session
+    finally:
+        dashboard_cache.invalidate()
+        dashboard_cache.reset_stats()
+
+
+def _seed(db):
+    quartos = [
+        quarto_service.create_quarto(
+            db,
+            QuartoCreate(numero=str(600 + i), tipo="standard", valor_diaria=100.0),
+        )
+        for i in range(3)
+    ]
+    client = ClientService.create_client(
+        db,
+        ClientCreate(
+            name="Cliente Dashboard",
+            email="dashboard@example.com",
+            phone="123",
+            document="666",
+        ),
+    )
+    return quartos, client
+
+
+def _reservar(db, quarto, client, checkin, noites):
+    return reserva_service.create_reserva(
+        db,
+        ReservaCreate(
+            quarto_id=quarto.id,
+            client_id=client.id,
+            data_checkin=checkin,
+            data_checkout=checkin + timedelta(days=noites),
+        ),
+    )
+
+
+def test_summary_stats(dashboard_session):
+    """Testa as estatísticas calculadas pela consulta agregada."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+    today = date.today()
+
+    hospedado = _reservar(db, quartos[0], client, today - timedelta(days=1), 3)
+    futura = _reservar(db, quartos[1], client, today + timedelta(days=40), 2)
+    cancelada = _reservar(db, quartos[2], client, today, 2)
+    reserva_service.cancel_reserva(db, cancelada.id)
+
+    stats = dashboard_service.get_dashboard_summary(db).stats
+
+    receita = sum(
+        reserva.valor_total
+        for reserva in (hospedado, futura)
+        if reserva.data_checkin.replace(day=1) == today.replace(day=1)
+    )
+    assert stats.total_clients == 1
+    assert stats.total_rooms == 3
+    assert stats.active_reservas == 2
+    assert stats.occupied_rooms == 1
+    assert stats.monthly_revenue == pytest.approx(receita)
+
+
+def test_summary_recent_activities(dashboard_session):
+    """Testa as atividades recentes montadas com os nomes em um só SELECT."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+    reserva = _reservar(db, quartos[0], client, date.today() + timedelta(days=5), 2)
+    reserva_service.cancel_reserva(db, reserva.id)
+
+    (atividade,) = dashboard_service.get_dashboard_summary(db).recent_activities
+    assert atividade.id == reserva.id
+    assert atividade.event_type == "reserva_cancelada"
+    assert atividade.description == "Reserva cancelada • Cliente Dashboard - Quarto 600"
+
+
+def test_summary_is_cached_until_mutation(dashboard_session):
+    """Testa acertos, falhas e invalidação do cache após alterações."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+
+    primeiro = dashboard_service.get_dashboard_summary(db)
+    assert dashboard_service.get_dashboard_summary(db) is primeiro
+    assert dashboard_cache.stats()["hits"] == 1
+    assert dashboard_cache.stats()["misses"] == 1
+
+    ClientService.create_client(
+        db,
+        ClientCreate(
+            name="Outro Cliente",
+            email="outro.dashboard@example.com",
+            phone="456",
+            document="555",
+        ),
+    )
+    assert dashboard_service.get_dashboard_summary(db).stats.total_clients == 2
+    assert dashboard_cache.stats()["misses"] == 2
+
+    _reservar(db, quartos[0], client, date.today(), 1)
+    assert dashboard_service.get_dashboard_summary(db).stats.occupied_rooms == 1
+    assert dashboard_cache.stats()["misses"] == 3
+
+
+def test_counters_follow_mutations(dashboard_session):
+    """Testa os contadores após criação, alteração, cancelamento e exclusão."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+    checkin = date.today() + timedelta(days=3)
+    reserva = _reservar(db, quartos[0], client, checkin, 2)
+    _reservar(db, quartos[1], client, checkin, 1)
+
+    reserva_service.update_reserva(
+        db,
+        reserva.id,
+        ReservaUpdate(data_checkout=checkin + timedelta(days=4)),
+    )
+    reserva_service.check_in_reserva(db, reserva.id)
+    cancelada = _reservar(db, quartos[2], client, checkin, 1)
+    reserva_service.cancel_reserva(db, cancelada.id)
+    quarto_service.delete_quarto(db, quartos[2].id)
+
+    assert dashboard_counters.reconciliar_contadores(db)["consistent"]
+    totais = dashboard_counters.ler_totais(db, date.today())
+    assert totais.total_rooms == 2
+    assert totais.active_reservas == 2
+
+    assert ClientService.delete_client(db, client.id)
+    assert dashboard_counters.reconciliar_contadores(db)["consistent"]
+    totais = dashboard_counters.ler_totais(db, date.today())
+    assert (totais.total_clients, totais.active_reservas) == (0, 0)
+
+
+def test_reconciliation_reports_and_fixes_drift(dashboard_session):
+    """Testa a reconciliação com reservas gravadas fora dos serviços."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+    checkin = date.today() + timedelta(days=10)
+    db.add(
+        Reserva(
+            quarto_id=quartos[0].id,
+            client_id=client.id,
+            data_checkin=checkin,
+            data_checkout=checkin + timedelta(days=2),
+            valor_total=200.0,
+            status="pendente",
+        )
+    )
+    db.commit()
+
+    resultado = dashboard_counters.reconciliar_contadores(db)
+    assert not resultado["consistent"]
+    assert {
+        (divergencia["nome"], divergencia["periodo"])
+        for divergencia in resultado["divergencias"]
+    } == {
+        ("receita", checkin.strftime("%Y-%m")),
+        ("checkouts", (checkin + timedelta(days=2)).isoformat()),
+    }
+
+    dashboard_counters.reconciliar_contadores(db, corrigir=True)
+    assert dashboard_counters.reconciliar_contadores(db)["consistent"]
+    assert dashboard_counters.ler_totais(db, date.today()).active_reservas == 1
+
+
+def test_popular_se_vazia_grava_contadores_de_banco_legado(dashboard_session):
+    """Testa os contadores de um banco com dados anteriores à tabela."""
+    db = dashboard_session
+    quartos, client = _seed(db)
+    checkin = date.today() + timedelta(days=5)
+    _reservar(db, quartos[0], client, checkin, 2)
+    db.query(DashboardCounter).delete()
+    db.commit()
+    assert dashboard_counters.ler_totais(db, date.today()).active_reservas == 0
+
+    assert dashboard_counters.popular_se_vazia(db)["divergencias"]
+
+    totais = dashboard_counters.ler_totais(db, date.today())
+    assert (totais.total_clients, totais.total_rooms, totais.active_reservas) == (1, 3, 1)
+    assert dashboard_counters.reconciliar_contadores(db)["consistent"]
+    # Com a tabela populada, nada é refeito
+    assert dashboard_counters.popular_se_vazia(db) is None
+
+
+def test_dashboard_endpoint_uses_service(test_client: TestClient):
+    """Testa GET /dashboard servido pelo serviço, com totais e atividades."""
+    dashboard_cache.invalidate()
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "dashboarduser",
+            "email": "dashboarduser@example.com",
+            "password": "DashboardTest123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "dashboarduser", "password": "DashboardTest123!"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    antes = test_client.get("/api/v1/dashboard/", headers=headers)
+    assert antes.status_code == 200
+    quarto = test_client.post(
+        "/api/v1/quartos/",
+        json={"numero": "690", "tipo": "standard", "valor_diaria": 100.00},
+        headers=headers,
+    ).json()
+    client = test_client.post(
+        "/api/v1/clients/",
+        json={
+            "name": "Cliente Endpoint",
+            "email": "endpoint.dashboard@example.com",
+            "phone": "123",
+            "document": "444",
+        },
+        headers=headers,
+    ).json()
+    hoje = date.today()
+    reserva = test_client.post(
+        "/api/v1/reservas/",
+        json={
+            "quarto_id": quarto["id"],
+            "client_id": client["id"],
+            "data_checkin": hoje.isoformat(),
+            "data_checkout": (hoje + timedelta(days=2)).isoformat(),
+        },
+        headers=headers,
+    )
+    assert reserva.status_code == 201
+
+    depois = test_client.get("/api/v1/dashboard/", headers=headers).json()
+    stats_antes = antes.json()["stats"]
+    assert depois["stats"]["total_clients"] == stats_antes["total_clients"] + 1
+    assert depois["stats"]["total_rooms"] == stats_antes["total_rooms"] + 1
+    assert depois["stats"]["occupied_rooms"] == stats_antes["occupied_rooms"] + 1
+    assert depois["stats"]["active_reservas"] == stats_antes["active_reservas"] + 1
+    assert depois["recent_activities"][0]["id"] == reserva.json()["id"]
+
+
+def test_cache_expires_after_ttl(monkeypatch):
+    """Testa a expiração das entradas do cache."""
+    relogio = [100.0]
+    monkeypatch.setattr("services.dashboard_cache.time.monotonic", lambda: relogio[0])
+    cache = DashboardCache(ttl_seconds=5)
+    hoje = date.today()
+
+    assert cache.get_or_compute(hoje, lambda: "a") == "a"
+    assert cache.get_or_compute(hoje, lambda: "b") == "a"
+    relogio[0] += 6
+    assert cache.get_or_compute(hoje, lambda: "c") == "c"
+    assert cache.get_or_compute(hoje + timedelta(days=1), lambda: "d") == "d"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_invalidation_during_compute_is_not_cached():
+    """Testa que um valor calculado durante uma invalidação não é guardado."""
+    cache = DashboardCache(ttl_seconds=60)
+    hoje = date.today()
+
+    def calcular():
+        cache.invalidate()
+        return "antigo"
+
+    assert cache.get_or_compute(hoje, calcular) == "antigo"
+    assert cache.get_or_compute(hoje, lambda: "novo") == "novo"
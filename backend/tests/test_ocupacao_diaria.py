@@ -0,0 +1,188 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from models.client_model import Client
+from models.ocupacao_diaria import OcupacaoDiaria
+from models.quarto import Quarto
+from models.reserva import Reserva
+from schemas.reserva import ReservaCreate, ReservaUpdate
+from services import ocupacao_service, reserva_service
+from services.client_service import ClientService
+
+
+def _seed(db):
+    quarto = Quarto(numero="201", tipo="standard", valor_diaria=100.0)
+    client = Client(
+        name="Cliente Ocupação",
+        email="ocupacao@example.com",
+        phone="123",
+        document="888",
+    )
+    db.add_all([quarto, client])
+    db.commit()
+    return quarto, client
+
+
+def _reservar(db, quarto, client, checkin, noites):
+    return reserva_service.create_reserva(
+        db,
+        ReservaCreate(
+            quarto_id=quarto.id,
+            client_id=client.id,
+            data_checkin=checkin,
+            data_checkout=checkin + timedelta(days=noites),
+        ),
+    )
+
+
+def _noites(db, reserva_id=None):
+    query = db.query(OcupacaoDiaria)
+    if reserva_id is not None:
+        query = query.filter(OcupacaoDiaria.reserva_id == reserva_id)
+    return [
+        (linha.quarto_id, linha.noite, linha.reserva_id, linha.status)
+        for linha in query.order_by(OcupacaoDiaria.quarto_id, OcupacaoDiaria.noite)
+    ]
+
+
+def test_create_and_move_reserva_updates_nights(isolated_session):
+    """Testa a criação e a mudança de datas refletidas nas noites."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    inicio = date(2030, 5, 10)
+    reserva = _reservar(db, quarto, client, inicio, 3)
+
+    assert _noites(db) == [
+        (quarto.id, inicio + timedelta(days=i), reserva.id, "pendente")
+        for i in range(3)
+    ]
+
+    novo_inicio = inicio + timedelta(days=10)
+    reserva_service.update_reserva(
+        db,
+        reserva.id,
+        ReservaUpdate(
+            data_checkin=novo_inicio,
+            data_checkout=novo_inicio + timedelta(days=2),
+        ),
+    )
+    assert [noite for _, noite, _, _ in _noites(db)] == [
+        novo_inicio,
+        novo_inicio + timedelta(days=1),
+    ]
+
+
+def test_status_changes_update_nights(isolated_session):
+    """Testa check-in, check-out e cancelamento na tabela de ocupação."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    concluida = _reservar(db, quarto, client, date(2030, 6, 1), 2)
+    cancelada = _reservar(db, quarto, client, date(2030, 6, 10), 2)
+
+    reserva_service.check_in_reserva(db, concluida.id)
+    assert {status for *_, status in _noites(db, concluida.id)} == {"ativa"}
+
+    reserva_service.check_out_reserva(db, concluida.id)
+    assert {status for *_, status in _noites(db, concluida.id)} == {"concluida"}
+
+    reserva_service.cancel_reserva(db, cancelada.id)
+    assert _noites(db, cancelada.id) == []
+
+    # A noite liberada pode ser reservada de novo
+    nova = _reservar(db, quarto, client, date(2030, 6, 10), 1)
+    assert len(_noites(db, nova.id)) == 1
+
+
+def test_occupied_night_is_rejected(isolated_session):
+    """Testa que a chave (quarto_id, noite) barra sobreposições não detectadas."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    inicio = date(2030, 7, 1)
+    _reservar(db, quarto, client, inicio, 3)
+
+    # Simula uma verificação de disponibilidade que deixou passar o conflito
+    legado = Reserva(
+        quarto_id=quarto.id,
+        client_id=client.id,
+        data_checkin=inicio + timedelta(days=2),
+        data_checkout=inicio + timedelta(days=4),
+        valor_total=200.0,
+        status="pendente",
+    )
+    db.add(legado)
+    db.flush()
+    with pytest.raises(HTTPException) as exc:
+        reserva_service._ocupar_ou_conflito(
+            db, lambda: ocupacao_service.ocupar_noites(db, [legado]), "conflito"
+        )
+    assert exc.value.status_code == 409
+    assert db.query(Reserva).count() == 1
+
+
+def test_delete_client_releases_nights(isolated_session):
+    """Testa que excluir o cliente remove as noites das suas reservas."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    _reservar(db, quarto, client, date(2030, 8, 1), 4)
+
+    assert ClientService.delete_client(db, client.id)
+    assert _noites(db) == []
+
+
+def test_rebuild_matches_incremental_maintenance(isolated_session):
+    """Testa que a reconstrução reproduz a tabela mantida incrementalmente."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    ativa = _reservar(db, quarto, client, date(2030, 9, 1), 3)
+    reserva_service.check_in_reserva(db, ativa.id)
+    cancelada = _reservar(db, quarto, client, date(2030, 9, 10), 2)
+    reserva_service.cancel_reserva(db, cancelada.id)
+    _reservar(db, quarto, client, date(2030, 9, 20), 5)
+
+    incremental = _noites(db)
+    resultado = ocupacao_service.rebuild_ocupacao_diaria(db)
+
+    assert _noites(db) == incremental
+    assert resultado == {"reservas": 2, "noites": 8, "conflitos": []}
+
+
+def test_popular_se_vazia_preenche_banco_legado(isolated_session):
+    """Testa o preenchimento de ocupacao_diaria em um banco anterior à tabela."""
+    db = isolated_session
+    quarto, client = _seed(db)
+    # Reservas gravadas direto na tabela, sem ocupacao_diaria
+    legada = Reserva(
+        quarto_id=quarto.id,
+        client_id=client.id,
+        data_checkin=date(2030, 10, 1),
+        data_checkout=date(2030, 10, 3),
+        valor_total=200.0,
+        status="pendente",
+    )
+    cancelada = Reserva(
+        quarto_id=quarto.id,
+        client_id=client.id,
+        data_checkin=date(2030, 10, 1),
+        data_checkout=date(2030, 10, 3),
+        valor_total=200.0,
+        status="cancelada",
+    )
+    db.add_all([legada, cancelada])
+    db.commit()
+
+    resultado = ocupacao_service.popular_se_vazia(db)
+
+    assert resultado == {"reservas": 1, "noites": 2, "conflitos": []}
+    assert [linha[1:3] for linha in _noites(db)] == [
+        (date(2030, 10, 1), legada.id),
+        (date(2030, 10, 2), legada.id),
+    ]
+    # Com a tabela populada, nada é refeito
+    assert ocupacao_service.popular_se_vazia(db) is None
+
+
+def test_popular_se_vazia_ignora_banco_sem_reservas(isolated_session):
+    """Testa que um banco sem reservas ativas não é alterado."""
+    assert ocupacao_service.popular_se_vazia(isolated_session) is None
@@ -0,0 +1,172 @@
+import asyncio
+
+from services.auth_service import get_password_hash
+from services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+def test_pool_de_processos_gera_e_verifica_hash():
+    hasher = PasswordHasher(workers=1, max_pending=10)
+    hasher.start()
+    try:
+        async def cenario():
+            hashed = await hasher.hash("Senha123!")
+            return (
+                hashed,
+                await hasher.verify("Senha123!", hashed),
+                await hasher.verify("Errada123!", hashed),
+            )
+
+        hashed, valida, invalida = asyncio.run(cenario())
+    finally:
+        hasher.shutdown()
+
+    assert hashed.startswith("$2")
+    assert valida is True
+    assert invalida is False
+    stats = hasher.stats()
+    assert stats["mode"] == "process"
+    assert stats["submitted"] == stats["completed"] == 3
+    assert stats["in_flight"] == 0
+    assert stats["avg_run_ms"] > 0
+
+
+def test_fila_cheia_rejeita_chamadas():
+    hasher = PasswordHasher(workers=0, max_pending=1)
+    hashed = get_password_hash("Senha123!")
+
+    async def cenario():
+        return await asyncio.gather(
+            *(hasher.verify("Senha123!", hashed) for _ in range(4)),
+            return_exceptions=True,
+        )
+
+    resultados = asyncio.run(cenario())
+
+    assert resultados.count(True) == 2
+    assert sum(isinstance(r, PasswordHasherBusy) for r in resultados) == 2
+    stats = hasher.stats()
+    assert stats["rejected"] == 2
+    assert stats["peak_in_flight"] == 2
+
+
+def test_login_responde_503_com_pool_cheio(test_client, monkeypatch):
+    from services import password_hasher as modulo
+
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "hashbusy",
+            "email": "hashbusy@example.com",
+            "password": "HashBusy123!",
+        },
+    )
+
+    async def ocupado(*args):
+        raise PasswordHasherBusy("cheio")
+
+    monkeypatch.setattr(modulo.password_hasher, "verify", ocupado)
+    resposta = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "hashbusy", "password": "HashBusy123!"},
+    )
+    assert resposta.status_code == 503
+    assert resposta.headers["Retry-After"] == "1"
+
+
+def test_hash_pool_stats_exige_admin(test_client):
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "hashviewer",
+            "email": "hashviewer@example.com",
+            "password": "HashViewer123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "hashviewer", "password": "HashViewer123!"},
+    ).json()["access_token"]
+    resposta = test_client.get(
+        "/api/v1/auth/hash-pool", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resposta.status_code == 403
+
+
+def test_stats_sem_chamadas():
+    stats = PasswordHasher(workers=0).stats()
+    assert stats["avg_wait_ms"] is None
+    assert stats["queued"] == 0
+
+
+def test_needs_rehash_compara_custo():
+    from services.auth_service import get_hash_rounds, needs_rehash
+
+    hashed = get_password_hash("Senha123!", rounds=5)
+    assert get_hash_rounds(hashed) == 5
+    assert needs_rehash(hashed, rounds=6)
+    assert needs_rehash(hashed, rounds=4)
+    assert not needs_rehash(hashed, rounds=5)
+    assert get_hash_rounds("texto-qualquer") is None
+
+
+def test_login_refaz_hash_com_custo_diferente(test_client):
+    from core.config import BCRYPT_ROUNDS
+    from core.database import get_db
+    from main import app
+    from models.user_model import User
+    from services.auth_service import get_hash_rounds
+
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "rehashuser",
+            "email": "rehashuser@example.com",
+            "password": "Rehash123!",
+        },
+    )
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        user = db.query(User).filter(User.username == "rehashuser").one()
+        user.hashed_password = get_password_hash("Rehash123!", rounds=BCRYPT_ROUNDS + 1)
+        db.commit()
+
+        resposta = test_client.post(
+            "/api/v1/auth/token",
+            data={"username": "rehashuser", "password": "Rehash123!"},
+        )
+        assert resposta.status_code == 200
+
+        # A tarefa em segundo plano roda após a resposta
+        db.expire_all()
+        user = db.query(User).filter(User.username == "rehashuser").one()
+        assert get_hash_rounds(user.hashed_password) == BCRYPT_ROUNDS
+    finally:
+        db.close()
+
+    assert test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "rehashuser", "password": "Rehash123!"},
+    ).status_code == 200
+
+
+def test_rehash_nao_sobrescreve_senha_alterada(isolated_session):
+    from models.user_model import User
+    from services.password_hasher import rehash_password
+
+    db = isolated_session
+    user = User(
+        username="cas",
+        email="cas@example.com",
+        hashed_password=get_password_hash("Nova123!"),
+    )
+    db.add(user)
+    db.commit()
+    atual = user.hashed_password
+
+    alterado = asyncio.run(
+        rehash_password(db.get_bind(), user.id, "Antiga123!", "hash-antigo")
+    )
+
+    assert alterado is False
+    db.refresh(user)
+    assert user.hashed_password == atual
@@ -0,0 +1,98 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from core.database import get_db, warm_up_pool
+from core.pool_metrics import InstrumentedQueuePool, PoolMetrics
+from main import app
+from models.user_model import User, UserRole
+
+
+@pytest.fixture
+def engine_instrumentado(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.1,
+        connect_args={"check_same_thread": False},
+    )
+    metrics = PoolMetrics("teste").instrument(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+def test_metricas_de_uso_overflow_e_timeout(engine_instrumentado):
+    engine, metrics = engine_instrumentado
+
+    conexoes = [engine.connect() for _ in range(3)]
+    stats = metrics.stats()
+    assert (stats["in_use"], stats["overflow_in_use"], stats["peak_overflow"]) == (3, 1, 1)
+    assert stats["connects"] == 3
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert metrics.stats()["timeouts"] == 1
+
+    for conexao in conexoes:
+        conexao.close()
+    stats = metrics.stats()
+    assert stats["in_use"] == 0
+    assert stats["checkins"] == 3
+    assert sum(faixa["count"] for faixa in stats["wait_histogram"]) == 3
+    # A conexão de overflow é fechada ao voltar para o pool
+    assert stats["open_connections"] == 2
+    assert stats["oldest_connection_s"] >= 0
+
+
+def test_warm_up_abre_pool_size_conexoes(engine_instrumentado):
+    engine, metrics = engine_instrumentado
+
+    assert warm_up_pool(engine, 2) == 2
+    assert metrics.stats()["connects"] == 2
+
+    # As próximas requisições reaproveitam as conexões abertas
+    with engine.connect(), engine.connect():
+        pass
+    stats = metrics.stats()
+    assert stats["connects"] == 2
+    assert stats["checkouts"] == 4
+
+    # dispose() recria o pool e mantém as métricas
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert metrics.stats()["connects"] == 3
+    assert metrics.stats()["pool_size"] == 2
+
+
+def test_metrics_db_pool_exige_admin(test_client: TestClient):
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "pooladmin",
+            "email": "pooladmin@example.com",
+            "password": "PoolAdmin123!",
+        },
+    )
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        user = db.query(User).filter(User.username == "pooladmin").one()
+        user.role = UserRole.ADMIN
+        db.commit()
+    finally:
+        db.close()
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "pooladmin", "password": "PoolAdmin123!"},
+    ).json()["access_token"]
+
+    resposta = test_client.get(
+        "/api/v1/metrics/db-pool", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert corpo["settings"]["pool_size"] >= 1
+    assert "wait_histogram" in corpo["sync"]
+    assert test_client.get("/api/v1/metrics/db-pool").status_code == 401
@@ -0,0 +1,139 @@
+import time
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from core.database import get_db
+from main import app
+from models.user_model import User, UserRole
+from services.principal_cache import Principal, PrincipalCache, principal_cache
+
+
+def _principal(username="ana", version=0, role=UserRole.VIEWER):
+    return Principal(
+        id=1,
+        username=username,
+        role=role,
+        is_active=True,
+        locked_until=None,
+        token_version=version,
+    )
+
+
+def test_cache_lru_ttl_e_invalidacao():
+    cache = PrincipalCache(max_size=2, ttl_seconds=60)
+    cache.put(_principal("ana"))
+    cache.put(_principal("bia"))
+    assert cache.get("ana", 0) is not None
+    cache.put(_principal("caio"))  # remove "bia", a menos usada
+
+    assert cache.get("bia", 0) is None
+    assert cache.get("ana", 0) is not None
+    assert cache.get("ana", 1) is None  # outra versão do token
+
+    cache.invalidate("ana")
+    assert cache.get("ana", 0) is None
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["invalidations"] == 1
+
+    expira = PrincipalCache(max_size=10, ttl_seconds=0.01)
+    expira.put(_principal("ana"))
+    time.sleep(0.02)
+    assert expira.get("ana", 0) is None
+
+
+def _registrar_e_logar(test_client: TestClient, username: str, password: str) -> str:
+    test_client.post(
+        "/api/v1/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+    return test_client.post(
+        "/api/v1/auth/token", data={"username": username, "password": password}
+    ).json()["access_token"]
+
+
+def test_requisicoes_autenticadas_nao_consultam_users(test_client: TestClient):
+    token = _registrar_e_logar(test_client, "principaluser", "Principal123!")
+    headers = {"Authorization": f"Bearer {token}"}
+    db = next(app.dependency_overrides[get_db]())
+    engine = db.get_bind()
+    db.close()
+
+    consultas = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            consultas.append(statement)
+
+    assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 200
+    event.listen(engine, "before_cursor_execute", capturar)
+    try:
+        for _ in range(5):
+            assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+
+    assert consultas == []
+
+
+def test_reset_de_senha_revoga_tokens(test_client: TestClient):
+    token = _registrar_e_logar(test_client, "revogado", "Revogado123!")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 200
+    assert principal_cache.stats()["entries"] >= 1
+
+    reset_token = test_client.post(
+        "/api/v1/auth/forgot-password", params={"username": "revogado"}
+    ).json()["reset_token"]
+    resposta = test_client.post(
+        "/api/v1/auth/reset-password",
+        params={"token": reset_token, "new_password": "NovaSenha123!"},
+    )
+    assert resposta.status_code == 200
+
+    assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 401
+    novo = test_client.post(
+        "/api/v1/auth/token", data={"username": "revogado", "password": "NovaSenha123!"}
+    ).json()["access_token"]
+    assert test_client.get(
+        "/api/v1/quartos/", headers={"Authorization": f"Bearer {novo}"}
+    ).status_code == 200
+
+
+def test_restricoes_do_usuario_revogam_tokens(test_client: TestClient):
+    token = _registrar_e_logar(test_client, "restrito", "Restrito123!")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 200
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        user = db.query(User).filter(User.username == "restrito").one()
+        versao = user.token_version
+
+        # Desbloquear e campos alheios à autorização não revogam tokens
+        user.locked_until = None
+        user.last_login_ip = "10.0.0.1"
+        db.commit()
+        assert user.token_version == versao
+
+        # Alteração feita por outro worker: nada invalida o cache deste
+        user.role = UserRole.ADMIN
+        db.commit()
+        assert user.token_version == versao + 1
+        user.is_active = False
+        db.commit()
+        user.is_active = True
+        user.locked_until = datetime.utcnow() + timedelta(minutes=15)
+        db.commit()
+        assert user.token_version == versao + 3
+        user.locked_until = None
+        db.commit()
+    finally:
+        db.close()
+
+    # Quando a entrada do cache expira, o token antigo é recusado
+    principal_cache.clear()
+    assert test_client.get("/api/v1/quartos/", headers=headers).status_code == 401
+    assert _registrar_e_logar(test_client, "restrito", "Restrito123!")
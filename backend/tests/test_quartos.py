@@ -281,3 +281,196 @@ def test_create_quarto_invalid_data(test_client: TestClient, auth_headers: dict)
         headers=auth_headers,
     )
     assert response2.status_code == 422
+
+
+def test_search_quartos_disponiveis_por_periodo(test_client: TestClient, auth_headers: dict):
+    """Testa a busca de quartos livres para um período."""
+    quartos = []
+    for numero, tipo, capacidade in (("201", "suite", 4), ("202", "suite", 4), ("203", "suite", 1)):
+        response = test_client.post(
+            "/api/v1/quartos/",
+            json={
+                "numero": numero,
+                "tipo": tipo,
+                "valor_diaria": 500.00,
+                "capacidade": capacidade,
+            },
+            headers=auth_headers,
+        )
+        quartos.append(response.json())
+
+    client = test_client.post(
+        "/api/v1/clients/",
+        json={
+            "name": "Cliente Disponibilidade",
+            "email": "disponibilidade@example.com",
+            "phone": "123456789",
+            "document": "55544433322",
+        },
+        headers=auth_headers,
+    ).json()
+
+    inicio = date.today() + timedelta(days=30)
+    response_reserva = test_client.post(
+        "/api/v1/reservas/",
+        json={
+            "client_id": client["id"],
+            "quarto_id": quartos[0]["id"],
+            "data_checkin": str(inicio),
+            "data_checkout": str(inicio + timedelta(days=3)),
+        },
+        headers=auth_headers,
+    )
+    assert response_reserva.status_code == 201
+
+    response = test_client.get(
+        "/api/v1/quartos/disponiveis",
+        params={
+            "data_inicio": str(inicio + timedelta(days=1)),
+            "data_fim": str(inicio + timedelta(days=5)),
+            "tipo": "suite",
+            "capacidade": 2,
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    numeros = [q["numero"] for q in response.json()]
+    assert numeros == ["202"]
+
+    # A partir do dia do check-out o quarto volta a ficar disponível
+    response = test_client.get(
+        "/api/v1/quartos/disponiveis",
+        params={
+            "data_inicio": str(inicio + timedelta(days=3)),
+            "data_fim": str(inicio + timedelta(days=5)),
+            "tipo": "suite",
+        },
+        headers=auth_headers,
+    )
+    assert {q["numero"] for q in response.json()} == {"201", "202", "203"}
+
+
+def test_search_quartos_disponiveis_invalid_range(test_client: TestClient, auth_headers: dict):
+    """Testa a busca de quartos livres com período inválido."""
+    hoje = date.today()
+    response = test_client.get(
+        "/api/v1/quartos/disponiveis",
+        params={"data_inicio": str(hoje), "data_fim": str(hoje)},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_list_quartos_cursor_pagination(test_client: TestClient, auth_headers: dict):
+    """Testa a paginação por cursor da listagem de quartos."""
+    for numero in ("301", "302", "303"):
+        test_client.post(
+            "/api/v1/quartos/",
+            json={"numero": numero, "tipo": "standard", "valor_diaria": 100.00},
+            headers=auth_headers,
+        )
+
+    numeros = []
+    response = test_client.get(
+        "/api/v1/quartos/",
+        params={"paginacao": "cursor", "limit": 2},
+        headers=auth_headers,
+    )
+    while True:
+        assert response.status_code == 200
+        page = response.json()
+        numeros.extend(q["numero"] for q in page["items"])
+        if page["next_cursor"] is None:
+            break
+        response = test_client.get(
+            "/api/v1/quartos/",
+            params={"cursor": page["next_cursor"], "limit": 2},
+            headers=auth_headers,
+        )
+
+    offset = test_client.get("/api/v1/quartos/", params={"limit": 1000}, headers=auth_headers).json()
+    assert numeros == [q["numero"] for q in offset]
+
+
+@pytest.mark.parametrize("params", [
+    {"paginacao": "cursor", "limit": 0},
+    {"limit": -1},
+    {"limit": 1001},
+    {"skip": -1},
+])
+def test_list_quartos_rejeita_limit_fora_dos_limites(
+    test_client: TestClient, auth_headers: dict, params: dict
+):
+    """Testa que skip/limit fora dos limites respondem 422."""
+    test_client.post(
+        "/api/v1/quartos/",
+        json={"numero": "399", "tipo": "standard", "valor_diaria": 100.00},
+        headers=auth_headers,
+    )
+    response = test_client.get("/api/v1/quartos/", params=params, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_get_calendario(test_client: TestClient, auth_headers: dict):
+    """Testa o calendário de ocupação servido pelo endpoint."""
+    test_client.post(
+        "/api/v1/quartos/",
+        json={"numero": "501", "tipo": "standard", "valor_diaria": 100.00},
+        headers=auth_headers,
+    )
+    inicio = date.today() + timedelta(days=30)
+
+    response = test_client.get(
+        "/api/v1/quartos/calendario",
+        params={
+            "data_inicio": inicio.isoformat(),
+            "data_fim": (inicio + timedelta(days=6)).isoformat(),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    quarto = next(q for q in response.json() if q["numero"] == "501")
+    assert len(quarto["ocupacao"]) == 7
+    assert quarto["ocupacao"][0] == {
+        "data": inicio.isoformat(),
+        "status": "livre",
+        "reserva_id": None,
+        "reserva_status": None,
+        "cliente_id": None,
+    }
+
+    response = test_client.get(
+        "/api/v1/quartos/calendario",
+        params={
+            "data_inicio": inicio.isoformat(),
+            "data_fim": (inicio - timedelta(days=1)).isoformat(),
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_get_calendario_compacto(test_client: TestClient, auth_headers: dict):
+    """Testa o formato compacto (segmentos) do calendário."""
+    test_client.post(
+        "/api/v1/quartos/",
+        json={"numero": "502", "tipo": "standard", "valor_diaria": 100.00},
+        headers=auth_headers,
+    )
+    inicio = date.today() + timedelta(days=30)
+    fim = inicio + timedelta(days=6)
+
+    response = test_client.get(
+        "/api/v1/quartos/calendario",
+        params={
+            "data_inicio": inicio.isoformat(),
+            "data_fim": fim.isoformat(),
+            "formato": "compacto",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    quarto = next(q for q in response.json() if q["numero"] == "502")
+    assert "ocupacao" not in quarto
+    assert quarto["segmentos"] == [[inicio.isoformat(), fim.isoformat(), "livre", None]]
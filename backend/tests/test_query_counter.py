@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from core.query_counter import QueryCounterMiddleware, statement_shape, track
+
+
+def test_statement_shape_agrupa_listas_in():
+    a = statement_shape("SELECT * FROM quartos\n WHERE id IN (?, ?, ?)")
+    b = statement_shape("SELECT * FROM quartos WHERE id IN (?)")
+    assert a == b == "SELECT * FROM quartos WHERE id IN (?)"
+
+
+def test_track_conta_consultas_e_repeticoes():
+    engine = create_engine("sqlite://")
+    with track() as stats, engine.connect() as conn:
+        for i in range(3):
+            conn.execute(text("SELECT :i"), {"i": i})
+        conn.execute(text("SELECT 1"))
+    assert stats.count == 4
+    assert stats.repeated(2) == [("SELECT ?", 3)]
+    assert stats.server_timing().endswith('desc="4 queries"')
+
+    # Fora de um bloco track(), nada é contado
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert stats.count == 4
+
+
+def test_middleware_avisa_possivel_n_mais_1(caplog):
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryCounterMiddleware, repeat_threshold=2)
+
+    @app.get("/itens/{item_id}")
+    def item(item_id: int):
+        with engine.connect() as conn:
+            for i in range(item_id):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger="core.query_counter"):
+        resposta = TestClient(app).get("/itens/3")
+
+    assert 'desc="3 queries"' in resposta.headers["server-timing"]
+    assert "Possível N+1 em GET /itens/{item_id}: 3 execuções" in caplog.text
+
+
+@pytest.mark.query_budget(3)
+def test_rotas_informam_consultas_no_server_timing(test_client: TestClient):
+    resposta = test_client.get("/api/v1/quartos/")
+    assert resposta.status_code == 401
+    assert 'queries"' in resposta.headers["server-timing"]
@@ -0,0 +1,123 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from core.database import replica_router
+from core.replicas import Replica, ReplicaRouter, RoutingSession
+from models.base import Base
+from models.quarto import Quarto
+
+
+def _engine(caminho):
+    engine = create_engine(
+        f"sqlite:///{caminho}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def primario_e_replica(tmp_path):
+    primario = _engine(tmp_path / "primario.db")
+    replica = _engine(tmp_path / "replica.db")
+    with RoutingSession(primario=replica, replica=replica) as db:
+        db.add(Quarto(numero="R-901", tipo="suite", valor_diaria=500.0))
+        db.commit()
+    yield primario, replica
+    primario.dispose()
+    replica.dispose()
+
+
+def test_routing_session_le_da_replica_ate_escrever(primario_e_replica):
+    primario, replica = primario_e_replica
+
+    with RoutingSession(primario=primario, replica=replica) as db:
+        assert [q.numero for q in db.query(Quarto)] == ["R-901"]
+        assert not db.no_primario
+
+        db.add(Quarto(numero="P-101", tipo="standard", valor_diaria=100.0))
+        db.commit()
+        assert db.no_primario
+        # Depois da escrita a sessão lê o que escreveu
+        assert [q.numero for q in db.query(Quarto)] == ["P-101"]
+
+    with RoutingSession(primario=primario, replica=replica) as db:
+        assert [q.numero for q in db.query(Quarto)] == ["R-901"]
+
+
+def test_router_alterna_replicas_saudaveis_e_volta_ao_primario(tmp_path):
+    boa = Replica(nome="boa", engine=_engine(tmp_path / "boa.db"))
+    outra = Replica(nome="outra", engine=_engine(tmp_path / "outra.db"))
+    fora = Replica(
+        nome="fora", engine=create_engine(f"sqlite:///{tmp_path / 'nao' / 'existe.db'}")
+    )
+    router = ReplicaRouter([boa, outra, fora], sticky_seconds=60)
+
+    router.verificar()
+    assert [r.saudavel for r in router.replicas] == [True, True, False]
+    assert fora.erro
+
+    escolhidas = [router.escolher().nome for _ in range(4)]
+    assert escolhidas == ["boa", "outra", "boa", "outra"]
+
+    chave = router.chave("Bearer abc")
+    router.registrar_escrita(chave)
+    assert router.escolher(chave) is None
+    assert router.escolher(router.chave("Bearer xyz")) is not None
+
+    boa.saudavel = outra.saudavel = False
+    assert router.escolher() is None
+    stats = router.stats()
+    assert (stats["sticky_reads"], stats["primary_fallbacks"]) == (1, 1)
+
+
+def _headers(test_client: TestClient) -> dict:
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "replicauser",
+            "email": "replicauser@example.com",
+            "password": "ReplicaUser123!",
+        },
+    )
+    token = test_client.post(
+        "/api/v1/auth/token",
+        data={"username": "replicauser", "password": "ReplicaUser123!"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_calendario_le_da_replica_e_do_primario_apos_escrita(
+    test_client: TestClient, primario_e_replica, monkeypatch
+):
+    _, replica_engine = primario_e_replica
+    headers = _headers(test_client)
+    monkeypatch.setattr(
+        replica_router, "replicas", [Replica(nome="teste", engine=replica_engine)]
+    )
+    monkeypatch.setattr(replica_router, "_escritas", {})
+    params = {"data_inicio": "2030-01-01", "data_fim": "2030-01-03"}
+
+    calendario = test_client.get(
+        "/api/v1/quartos/calendario", params=params, headers=headers
+    ).json()
+    assert [q["numero"] for q in calendario] == ["R-901"]
+
+    criado = test_client.post(
+        "/api/v1/clients/",
+        json={
+            "name": "Cliente Replica",
+            "email": "cliente.replica@example.com",
+            "phone": "11999990000",
+            "document": "REPLICA-001",
+        },
+        headers=headers,
+    )
+    assert criado.status_code == 201
+
+    # Logo após a escrita, o mesmo usuário lê do primário
+    calendario = test_client.get(
+        "/api/v1/quartos/calendario", params=params, headers=headers
+    ).json()
+    assert "R-901" not in [q["numero"] for q in calendario]
+    assert replica_router.stats()["sticky_reads"] >= 1
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.client_model import Client
+from models.quarto import Quarto
+from models.reserva import Reserva
+from schemas.reserva import ReservaCreate
+from services import reserva_service
+
+TOTAL_REQUISICOES = 200
+
+
+@pytest.fixture(scope="function")
+def file_sessionmaker(tmp_path):
+    """Banco SQLite em arquivo, compartilhado por conexões de várias threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concorrencia.db'}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=20,
+        max_overflow=0,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with factory() as db:
+        quarto = Quarto(numero="301", tipo="standard", valor_diaria=100.0)
+        client = Client(
+            name="Cliente Concorrente",
+            email="concorrente@example.com",
+            phone="123",
+            document="111",
+        )
+        db.add_all([quarto, client])
+        db.commit()
+
+    try:
+        yield factory
+    finally:
+        engine.dispose()
+
+
+def _reservar(factory, checkin: date, noites: int) -> int:
+    with factory() as db:
+        try:
+            reserva_service.create_reserva(
+                db,
+                ReservaCreate(
+                    quarto_id=1,
+                    client_id=1,
+                    data_checkin=checkin,
+                    data_checkout=checkin + timedelta(days=noites),
+                ),
+            )
+            return 201
+        except HTTPException as exc:
+            return exc.status_code
+
+
+def test_parallel_bookings_same_period_only_one_wins(file_sessionmaker):
+    """Dispara reservas simultâneas do mesmo quarto e período."""
+    checkin = date(2031, 1, 10)
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        resultados = list(
+            pool.map(
+                lambda _: _reservar(file_sessionmaker, checkin, 3),
+                range(TOTAL_REQUISICOES),
+            )
+        )
+
+    assert resultados.count(201) == 1
+    assert resultados.count(409) == TOTAL_REQUISICOES - 1
+
+    with file_sessionmaker() as db:
+        assert db.query(Reserva).count() == 1
+
+
+def test_parallel_overlapping_bookings_never_double_book(file_sessionmaker):
+    """Dispara reservas simultâneas com períodos sobrepostos e verifica as noites."""
+    inicio = date(2031, 3, 1)
+    pedidos = [(inicio + timedelta(days=i % 40), 1 + i % 4) for i in range(TOTAL_REQUISICOES)]
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        resultados = list(
+            pool.map(lambda pedido: _reservar(file_sessionmaker, *pedido), pedidos)
+        )
+
+    assert set(resultados) <= {201, 409}
+    assert 201 in resultados
+
+    with file_sessionmaker() as db:
+        reservas = db.query(Reserva).order_by(Reserva.data_checkin).all()
+
+    assert len(reservas) == resultados.count(201)
+    for anterior, seguinte in zip(reservas, reservas[1:]):
+        assert anterior.data_checkout <= seguinte.data_checkin
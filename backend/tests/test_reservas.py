@@ -460,3 +460,209 @@ def test_list_reservas_by_quarto(
     quarto_id = test_quarto_data["id"]
     reservas_quarto = [r for r in reservas if r["quarto_id"] == quarto_id]
     assert len(reservas_quarto) > 0
+
+
+def test_list_reservas_cursor_pagination(
+    test_client: TestClient,
+    auth_headers: dict,
+    test_client_data: dict,
+    test_quarto_data: dict
+):
+    """Testa a paginação por cursor da listagem de reservas."""
+    inicio = date.today() + timedelta(days=100)
+    for semana in range(3):
+        checkin = inicio + timedelta(days=7 * semana)
+        test_client.post(
+            "/api/v1/reservas/",
+            json={
+                "client_id": test_client_data["id"],
+                "quarto_id": test_quarto_data["id"],
+                "data_checkin": str(checkin),
+                "data_checkout": str(checkin + timedelta(days=2)),
+            },
+            headers=auth_headers,
+        )
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"paginacao": "cursor", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = test_client.get("/api/v1/reservas/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        page = response.json()
+        ids.extend(r["id"] for r in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # A paginação por cursor segue a mesma ordenação da paginação por offset
+    offset = test_client.get("/api/v1/reservas/", params={"limit": 1000}, headers=auth_headers)
+    assert ids == [r["id"] for r in offset.json()]
+
+
+@pytest.mark.parametrize("params", [
+    {"paginacao": "cursor", "limit": 0},
+    {"limit": -1},
+    {"limit": 1001},
+    {"skip": -1},
+])
+def test_list_reservas_rejeita_limit_fora_dos_limites(
+    test_client: TestClient,
+    auth_headers: dict,
+    test_client_data: dict,
+    test_quarto_data: dict,
+    params: dict,
+):
+    """Testa que skip/limit fora dos limites respondem 422."""
+    checkin = date(2040, 1, 10)
+    test_client.post(
+        "/api/v1/reservas/",
+        json={
+            "client_id": test_client_data["id"],
+            "quarto_id": test_quarto_data["id"],
+            "data_checkin": str(checkin),
+            "data_checkout": str(checkin + timedelta(days=2)),
+        },
+        headers=auth_headers,
+    )
+    response = test_client.get("/api/v1/reservas/", params=params, headers=auth_headers)
+    assert response.status_code == 422
+
+
+def test_export_reservas(
+    test_client: TestClient,
+    auth_headers: dict,
+    test_client_data: dict,
+    test_quarto_data: dict
+):
+    """Testa a exportação de reservas em CSV e NDJSON."""
+    import csv
+    import io
+    import json
+
+    checkin = date.today() + timedelta(days=200)
+    response_create = test_client.post(
+        "/api/v1/reservas/",
+        json={
+            "client_id": test_client_data["id"],
+            "quarto_id": test_quarto_data["id"],
+            "data_checkin": str(checkin),
+            "data_checkout": str(checkin + timedelta(days=2)),
+        },
+        headers=auth_headers,
+    )
+    reserva_id = response_create.json()["id"]
+    periodo = {"desde": str(checkin), "ate": str(checkin)}
+
+    response_csv = test_client.get(
+        "/api/v1/reservas/export",
+        params={"formato": "csv", **periodo},
+        headers=auth_headers,
+    )
+    assert response_csv.status_code == 200
+    assert response_csv.headers["content-type"].startswith("text/csv")
+    linhas = list(csv.DictReader(io.StringIO(response_csv.text)))
+    assert [int(linha["id"]) for linha in linhas] == [reserva_id]
+    assert linhas[0]["quarto_numero"] == test_quarto_data["numero"]
+    assert linhas[0]["data_checkin"] == str(checkin)
+
+    response_ndjson = test_client.get(
+        "/api/v1/reservas/export",
+        params={"formato": "ndjson", **periodo},
+        headers=auth_headers,
+    )
+    assert response_ndjson.status_code == 200
+    registros = [json.loads(linha) for linha in response_ndjson.text.splitlines()]
+    assert [r["id"] for r in registros] == [reserva_id]
+    assert registros[0]["cliente_nome"] == test_client_data["name"]
+    assert registros[0]["valor_total"] == 400.0
+
+
+def _criar_quartos(test_client: TestClient, auth_headers: dict, prefixo: str, total: int):
+    quartos = []
+    for i in range(total):
+        response = test_client.post(
+            "/api/v1/quartos/",
+            json={
+                "numero": f"{prefixo}{i}",
+                "tipo": "standard",
+                "valor_diaria": 100.00,
+                "capacidade": 2,
+            },
+            headers=auth_headers,
+        )
+        quartos.append(response.json())
+    return quartos
+
+
+def test_create_reservas_lote(
+    test_client: TestClient,
+    auth_headers: dict,
+    test_client_data: dict
+):
+    """Testa a criação de reservas de grupo em lote."""
+    quartos = _criar_quartos(test_client, auth_headers, "L", 5)
+    checkin = date.today() + timedelta(days=300)
+    lote = {
+        "reservas": [
+            {
+                "client_id": test_client_data["id"],
+                "quarto_id": quarto["id"],
+                "data_checkin": str(checkin),
+                "data_checkout": str(checkin + timedelta(days=3)),
+            }
+            for quarto in quartos
+        ]
+    }
+
+    response = test_client.post("/api/v1/reservas/lote", json=lote, headers=auth_headers)
+    assert response.status_code == 201
+    resultado = response.json()
+    assert resultado["falhas"] == []
+    assert len(resultado["criadas"]) == 5
+    assert {r["quarto_id"] for r in resultado["criadas"]} == {q["id"] for q in quartos}
+    assert all(r["valor_total"] == 300.0 for r in resultado["criadas"])
+
+    # Mesmo bloco novamente: tudo ou nada, nenhuma reserva criada
+    response_conflito = test_client.post("/api/v1/reservas/lote", json=lote, headers=auth_headers)
+    assert response_conflito.status_code == 409
+    assert len(response_conflito.json()["detail"]["falhas"]) == 5
+
+
+def test_create_reservas_lote_parcial(
+    test_client: TestClient,
+    auth_headers: dict,
+    test_client_data: dict
+):
+    """Testa a criação parcial de um bloco com itens em conflito."""
+    quartos = _criar_quartos(test_client, auth_headers, "P", 2)
+    checkin = date.today() + timedelta(days=320)
+    item = {
+        "client_id": test_client_data["id"],
+        "data_checkin": str(checkin),
+        "data_checkout": str(checkin + timedelta(days=2)),
+    }
+    lote = {
+        "parcial": True,
+        "reservas": [
+            {**item, "quarto_id": quartos[0]["id"]},
+            # Sobrepõe o item anterior do mesmo bloco
+            {**item, "quarto_id": quartos[0]["id"]},
+            {**item, "quarto_id": quartos[1]["id"]},
+            {**item, "quarto_id": 999999},
+        ],
+    }
+
+    response = test_client.post("/api/v1/reservas/lote", json=lote, headers=auth_headers)
+    assert response.status_code == 201
+    resultado = response.json()
+    assert len(resultado["criadas"]) == 2
+    assert [(f["indice"], f["status_code"]) for f in resultado["falhas"]] == [(1, 409), (3, 404)]
+
+    # Parcial sem nenhum item criado não é 201
+    lote["reservas"] = lote["reservas"][:2]
+    response_vazio = test_client.post("/api/v1/reservas/lote", json=lote, headers=auth_headers)
+    assert response_vazio.status_code == 409
+    assert [f["indice"] for f in response_vazio.json()["detail"]["falhas"]] == [0, 1]
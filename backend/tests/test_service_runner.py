@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from core.database import get_db
+from main import app
+from models.user_model import User, UserRole
+from services import service_runner
+from services.loop_monitor import LoopLagMonitor
+from services.service_runner import ServiceExecutor, run_service
+
+requisicao = contextvars.ContextVar("requisicao", default=None)
+
+
+def test_run_service_executa_fora_do_loop_com_limite(isolated_session, monkeypatch):
+    executor = ServiceExecutor(workers=2)
+    monkeypatch.setattr(service_runner, "service_executor", executor)
+    lock = threading.Lock()
+    ativos, pico, threads = [0], [0], set()
+
+    def servico(db, valor):
+        with lock:
+            ativos[0] += 1
+            pico[0] = max(pico[0], ativos[0])
+        threads.add(threading.get_ident())
+        time.sleep(0.05)
+        with lock:
+            ativos[0] -= 1
+        return valor, requisicao.get()
+
+    async def cenario():
+        requisicao.set("req-1")
+        batimentos = []
+
+        async def contar():
+            while True:
+                batimentos.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        contador = asyncio.create_task(contar())
+        resultados = await asyncio.gather(
+            *(run_service(isolated_session, servico, i) for i in range(6))
+        )
+        contador.cancel()
+        return resultados, batimentos
+
+    try:
+        resultados, batimentos = asyncio.run(cenario())
+    finally:
+        executor.shutdown()
+
+    assert resultados == [(i, "req-1") for i in range(6)]
+    assert pico[0] == 2
+    assert threading.get_ident() not in threads
+    # O loop seguiu rodando enquanto os serviços dormiam
+    assert len(batimentos) >= 5
+    stats = executor.stats()
+    assert stats["completed"] == 6
+    assert stats["peak_in_flight"] == 6
+    assert stats["max_wait_ms"] > 0
+
+
+def _bloquear_loop():
+    time.sleep(0.3)
+
+
+def test_loop_monitor_registra_pilha_do_bloqueio(caplog):
+    monitor = LoopLagMonitor(threshold_ms=50)
+
+    async def cenario():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _bloquear_loop()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    with caplog.at_level(logging.WARNING, logger="services.loop_monitor"):
+        asyncio.run(cenario())
+
+    stats = monitor.stats()
+    assert stats["lag_events"] >= 1
+    assert stats["stacks_captured"] >= 1
+    assert stats["max_lag_ms"] >= 200
+    assert not stats["running"]
+    assert any("_bloquear_loop" in r.getMessage() for r in caplog.records)
+
+
+def test_metrics_event_loop_exige_admin(test_client: TestClient):
+    test_client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "loopadmin",
+            "email": "loopadmin@example.com",
+            "password": "LoopAdmin123!",
+        },
+    )
+
+    def headers():
+        token = test_client.post(
+            "/api/v1/auth/token",
+            data={"username": "loopadmin", "password": "LoopAdmin123!"},
+        ).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    assert test_client.get(
+        "/api/v1/metrics/event-loop", headers=headers()
+    ).status_code == 403
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        user = db.query(User).filter(User.username == "loopadmin").one()
+        user.role = UserRole.ADMIN
+        db.commit()
+    finally:
+        db.close()
+
+    resposta = test_client.get("/api/v1/metrics/event-loop", headers=headers())
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert corpo["loop"]["running"] is True
+    assert corpo["service_executor"]["workers"] >= 1
@@ -0,0 +1,88 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from services.auth_service import create_access_token
+from services.token_decoder import (
+    CachedTokenDecoder,
+    InvalidTokenError,
+    JoseDecoder,
+    load_decoder,
+)
+
+
+class ContadorDecoder:
+    """Decodificador que conta as verificações feitas."""
+
+    def __init__(self, decoder=None):
+        self.decoder = decoder or JoseDecoder()
+        self.chamadas = 0
+
+    def decode(self, token):
+        self.chamadas += 1
+        return self.decoder.decode(token)
+
+
+def test_cache_dispensa_verificacao_de_token_repetido():
+    contador = ContadorDecoder()
+    decoder = CachedTokenDecoder(contador, max_size=10)
+    token = create_access_token({"sub": "ana", "ver": 0})
+
+    for _ in range(5):
+        assert decoder.decode(token)["sub"] == "ana"
+
+    assert contador.chamadas == 1
+    stats = decoder.stats()
+    assert (stats["hits"], stats["misses"]) == (4, 1)
+    assert stats["saved_ms"] > 0
+
+
+def test_token_adulterado_nao_usa_cache():
+    decoder = CachedTokenDecoder(JoseDecoder(), max_size=10)
+    token = create_access_token({"sub": "ana"})
+    decoder.decode(token)
+
+    cabecalho, payload, assinatura = token.split(".")
+    adulterado = ".".join((cabecalho, payload, assinatura[::-1]))
+    with pytest.raises(InvalidTokenError):
+        decoder.decode(adulterado)
+
+
+def test_expiracao_conferida_no_cache():
+    class Curto:
+        def decode(self, token):
+            return {"sub": "ana", "exp": time.time() + 0.05}
+
+    decoder = CachedTokenDecoder(Curto(), max_size=10)
+    decoder.decode("token")
+    time.sleep(0.1)
+
+    with pytest.raises(InvalidTokenError):
+        decoder.decode("token")
+    assert decoder.stats()["expired"] == 1
+
+
+def test_token_expirado_recusado_pelo_decodificador():
+    decoder = CachedTokenDecoder(JoseDecoder(), max_size=10)
+    token = create_access_token({"sub": "ana"}, expires_delta=timedelta(seconds=-1))
+
+    with pytest.raises(InvalidTokenError):
+        decoder.decode(token)
+    assert decoder.stats()["entries"] == 0
+
+
+def test_lru_limita_entradas():
+    decoder = CachedTokenDecoder(JoseDecoder(), max_size=2)
+    for nome in ("a", "b", "c"):
+        decoder.decode(create_access_token({"sub": nome}))
+    assert decoder.stats()["entries"] == 2
+
+
+def test_decodificador_plugavel():
+    assert isinstance(load_decoder("jose"), JoseDecoder)
+    assert isinstance(
+        load_decoder("services.token_decoder:JoseDecoder"), JoseDecoder
+    )
+    with pytest.raises(ValueError):
+        load_decoder("inexistente")
@@ -22,6 +22,8 @@ def update_user_password(username: str, new_password: str):
         
         # Atualizar senha
         user.hashed_password = get_password_hash(new_password)
+        # Revogar tokens emitidos com a senha anterior
+        user.token_version = (user.token_version or 0) + 1
         db.commit()
         
         print(f"✅ Senha do usuário '{username}' atualizada com sucesso!")
@@ -0,0 +1,91 @@
+"""
+Utilitários para paginação por cursor (keyset)
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+# Maior página aceita pelas listagens (``limit``)
+MAX_LIMIT = 1000
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Gera um cursor opaco a partir dos valores da chave de ordenação.
+
+    Args:
+        values: Valores da chave do último item da página (ex: data, id)
+
+    Returns:
+        str: Cursor em base64 url-safe
+    """
+    payload = [
+        value.isoformat() if isinstance(value, date) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    Args:
+        cursor: Cursor recebido do cliente
+        types: Tipos esperados de cada valor da chave (ex: (date, int),
+            (datetime, int))
+
+    Returns:
+        list: Valores da chave de ordenação convertidos para os tipos
+
+    Raises:
+        HTTPException: 400 se o cursor for inválido
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cursor de paginação inválido.",
+    )
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as exc:
+        raise invalid from exc
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise invalid
+
+    decoded = []
+    for value, expected in zip(values, types):
+        if expected in (date, datetime) and isinstance(value, str):
+            try:
+                value = expected.fromisoformat(value)
+            except ValueError as exc:
+                raise invalid from exc
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise invalid
+        decoded.append(value)
+    return decoded
+
+
+def next_cursor(items: list, limit: int, key) -> Optional[str]:
+    """
+    Retorna o cursor da próxima página a partir de uma consulta com limit + 1.
+
+    Remove de ``items`` o item excedente, se houver.
+
+    Args:
+        items: Resultados obtidos com limit + 1
+        limit: Tamanho da página solicitado
+        key: Função que extrai a chave de ordenação de um item
+
+    Returns:
+        Optional[str]: Cursor da próxima página, ou None na última página
+    """
+    if len(items) <= limit:
+        return None
+    del items[limit:]
+    return encode_cursor(key(items[-1]))